@@ -1,8 +1,10 @@
-from langchain_openai import ChatOpenAI
+from app_cache import get_llm
+from langchain_core.prompts import ChatPromptTemplate
 from models import UserProfile, Opportunity
+from prompt_budget import STRATEGIST_TOKENS, opportunity_fields
+from tracing import traced
 from pydantic import BaseModel
 from typing import List, Dict
-import os
 from datetime import datetime
 
 class ApplicationPriority(BaseModel):
@@ -27,6 +29,7 @@ class ApplicationStrategyResult(BaseModel):
     effort_estimate_total_hours: int
     recommended_focus: List[str]
 
+@traced(category="agent")
 def create_application_strategy(
     profile: UserProfile,
     opportunities: List[Dict]  # List of {opportunity: Opportunity, score: float}
@@ -57,7 +60,7 @@ Title: {opp.title}
 Type: {opp.opp_type}
 Match Score: {score:.0%}
 Deadline: {opp.deadline or 'Rolling'}
-Requirements: {opp.requirements[:200]}...
+Requirements: {opportunity_fields(opp, STRATEGIST_TOKENS, fields=("requirements",))["requirements"]}
 """)
 
     human_prompt = """Create an optimal application strategy for this profile and opportunities:
@@ -102,11 +105,7 @@ Consider:
         ("human", human_prompt)
     ])
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3,
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    llm = get_llm(temperature=0.3, call_site="agent.application_strategist")
 
     chain = prompt | llm.with_structured_output(ApplicationStrategyResult, method="function_calling")
 
@@ -1,8 +1,10 @@
-from langchain_openai import ChatOpenAI
+from app_cache import get_llm
+from langchain_core.prompts import ChatPromptTemplate
 from models import UserProfile, Opportunity
+from prompt_budget import SCOUT_TOKENS, opportunity_fields
+from tracing import traced
 from pydantic import BaseModel
 from typing import List
-import os
 
 class SearchQuery(BaseModel):
     query: str
@@ -21,6 +23,7 @@ class OpportunityScoutResult(BaseModel):
     hidden_opportunities: List[str]
     recommendation: str
 
+@traced(category="agent")
 def generate_search_strategies(profile: UserProfile, top_matches: List[Opportunity] = None) -> OpportunityScoutResult:
     """
     Generates intelligent search strategies based on profile and existing matches
@@ -39,7 +42,10 @@ Generate smart, specific search queries and suggest similar opportunities."""
 
     top_matches_str = ""
     if top_matches:
-        top_matches_str = "\n".join([f"- {opp.title} ({opp.opp_type}): {opp.description[:200]}" for opp in top_matches[:3]])
+        top_matches_str = "\n".join([
+            f"- {opp.title} ({opp.opp_type}): {opportunity_fields(opp, SCOUT_TOKENS, fields=('description',))['description']}"
+            for opp in top_matches[:3]
+        ])
 
     human_prompt = """Based on this profile, generate intelligent opportunity search strategies:
 
@@ -79,11 +85,7 @@ Be specific with program names, organizations, and search terms."""
         ("human", human_prompt)
     ])
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.5,
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    llm = get_llm(temperature=0.5, call_site="agent.opportunity_scout")
 
     chain = prompt | llm.with_structured_output(OpportunityScoutResult, method="function_calling")
 
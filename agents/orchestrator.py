@@ -3,6 +3,7 @@ from typing import List, Dict
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel
+from tracing import in_current_context, traced
 
 class UnifiedActionPlan(BaseModel):
     profile_optimization: Dict = {}
@@ -20,6 +21,7 @@ def run_agent_sync(agent_func, *args):
     except Exception as e:
         return None
 
+@traced(category="agent")
 async def orchestrate_ai_analysis(
     profile: UserProfile,
     opportunities: List[Dict] = None
@@ -38,16 +40,16 @@ async def orchestrate_ai_analysis(
     executor = ThreadPoolExecutor(max_workers=3)
 
     # Start all agents concurrently
-    profile_task = loop.run_in_executor(executor, run_agent_sync, analyze_profile, profile)
+    profile_task = loop.run_in_executor(executor, in_current_context(run_agent_sync), analyze_profile, profile)
 
     scout_task = None
     if opportunities:
         top_opps = [item['opportunity'] for item in opportunities[:3]]
-        scout_task = loop.run_in_executor(executor, run_agent_sync, generate_search_strategies, profile, top_opps)
+        scout_task = loop.run_in_executor(executor, in_current_context(run_agent_sync), generate_search_strategies, profile, top_opps)
 
     strategy_task = None
     if opportunities:
-        strategy_task = loop.run_in_executor(executor, run_agent_sync, create_application_strategy, profile, opportunities)
+        strategy_task = loop.run_in_executor(executor, in_current_context(run_agent_sync), create_application_strategy, profile, opportunities)
 
     # Wait for all to complete
     profile_result = await profile_task
@@ -1,8 +1,9 @@
-from langchain_openai import ChatOpenAI
+from app_cache import get_llm
+from langchain_core.prompts import ChatPromptTemplate
 from models import UserProfile
+from tracing import traced
 from pydantic import BaseModel, Field
 from typing import List, Dict
-import os
 
 class GapAnalysis(BaseModel):
     category: str
@@ -42,6 +43,7 @@ class ProfileOptimizationResult(BaseModel):
     action_plan_90_days: DayPlan
     overall_recommendation: str
 
+@traced(category="agent")
 def analyze_profile(profile: UserProfile) -> ProfileOptimizationResult:
     """
     Analyzes user profile and provides comprehensive optimization recommendations
@@ -116,11 +118,7 @@ Be specific with numbers, timelines, and actionable steps. This analysis will gu
         ("human", human_prompt)
     ])
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3,
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    llm = get_llm(temperature=0.3, call_site="agent.profile_optimizer")
 
     chain = prompt | llm.with_structured_output(ProfileOptimizationResult, method="function_calling")
 
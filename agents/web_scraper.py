@@ -1,9 +1,11 @@
-from langchain_openai import ChatOpenAI
+from app_cache import get_llm
+from app_metrics import SCRAPE_REQUESTS
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 from typing import Optional
-import os
 import requests
-from bs4 import BeautifulSoup
+from content_extractor import extract_main_content_streaming
+from tracing import traced
 
 class ScrapedOpportunity(BaseModel):
     title: str
@@ -18,33 +20,17 @@ class ScrapedOpportunity(BaseModel):
     eligibility: Optional[str] = None
     benefits: Optional[str] = None
 
-def scrape_opportunity_from_url(url: str) -> ScrapedOpportunity:
+# Token budget for the page text sent to the LLM
+MAX_CONTENT_TOKENS = 2000
+
+@traced(category="extract")
+def extract_opportunity_from_text(url: str, text: str) -> ScrapedOpportunity:
     """
-    Scrapes a scholarship/opportunity URL and extracts structured information using AI
+    Uses AI to turn already extracted page text into a structured opportunity
+    (shared by the URL scraper and the crawl frontier). Raises on failure.
     """
 
-    try:
-        # Fetch webpage content
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract text content (remove scripts and styles)
-        for script in soup(["script", "style"]):
-            script.decompose()
-
-        text = soup.get_text(separator='\n', strip=True)
-
-        # Limit text length for AI processing (first 8000 chars usually contain key info)
-        text = text[:8000]
-
-        # Use AI to extract structured information
-        system_prompt = """You are an expert at extracting scholarship and opportunity information from web pages.
+    system_prompt = """You are an expert at extracting scholarship and opportunity information from web pages.
 Your task is to analyze the text content and extract key structured information.
 
 Focus on:
@@ -60,7 +46,7 @@ Focus on:
 
 Be thorough but concise. Extract exact information from the text."""
 
-        human_prompt = """Extract structured information from this webpage content:
+    human_prompt = """Extract structured information from this webpage content:
 
 URL: {url}
 
@@ -69,30 +55,52 @@ CONTENT:
 
 Return structured data with all available fields. If information is not found, use "Not specified" or null."""
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", human_prompt)
-        ])
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", human_prompt)
+    ])
 
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-            api_key=os.environ.get("OPENAI_API_KEY")
-        )
+    llm = get_llm(temperature=0, call_site="agent.web_scraper")
 
-        chain = prompt | llm.with_structured_output(ScrapedOpportunity, method="function_calling")
+    chain = prompt | llm.with_structured_output(ScrapedOpportunity, method="function_calling")
 
-        result = chain.invoke({
-            "url": url,
-            "content": text
-        })
+    result = chain.invoke({
+        "url": url,
+        "content": text
+    })
+
+    # Ensure link is set
+    result.link = url
+
+    return result
+
+@traced(category="scrape")
+def scrape_opportunity_from_url(url: str) -> ScrapedOpportunity:
+    """
+    Scrapes a scholarship/opportunity URL and extracts structured information using AI
+    """
+
+    try:
+        # Fetch webpage content
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        response = requests.get(url, headers=headers, timeout=10, stream=True)
+        response.raise_for_status()
 
-        # Ensure link is set
-        result.link = url
+        # Stream the page through the parser and stop downloading once enough
+        # main content (no nav, footer, cookie banners) has been collected
+        with response:
+            text = extract_main_content_streaming(
+                response.iter_content(chunk_size=16384, decode_unicode=True),
+                max_tokens=MAX_CONTENT_TOKENS
+            )
 
-        return result
+        SCRAPE_REQUESTS.labels("scraper", "ok").inc()
+        return extract_opportunity_from_text(url, text)
 
     except requests.RequestException as e:
+        SCRAPE_REQUESTS.labels("scraper", "fetch_error").inc()
         # Return error result
         return ScrapedOpportunity(
             title="Error: Could not fetch URL",
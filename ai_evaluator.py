@@ -1,7 +1,9 @@
-from langchain_openai import ChatOpenAI
+from app_cache import get_llm
 from models import UserProfile, Opportunity, MatchResult  # Only import what you need
-import os
+from prompt_budget import EVALUATION_TOKENS, opportunity_fields
+from tracing import traced
 
+@traced(category="evaluate")
 def evaluate_match(profile: UserProfile, opportunity: Opportunity) -> MatchResult:
     """
     Uses AI to evaluate how well a profile matches an opportunity
@@ -48,15 +50,14 @@ Please evaluate this match and provide:
 Be specific and actionable in your feedback."""
 
     # Initialize the LLM
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",  # Cheaper and faster
-        temperature=0.3,  # Lower = more consistent
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    llm = get_llm(temperature=0.3, call_site="evaluate_match")
 
     # Create chain with structured output - ONLY MatchResult
     chain = llm.with_structured_output(MatchResult)
 
+    # Long descriptions are swapped for the opportunity's digest to stay within budget
+    opp_text = opportunity_fields(opportunity, EVALUATION_TOKENS)
+
     # Prepare the data
     input_data = {
         "name": profile.name,
@@ -70,8 +71,8 @@ Be specific and actionable in your feedback."""
         "goals": profile.goals,
         "opp_title": opportunity.title,
         "opp_type": opportunity.opp_type,
-        "opp_description": opportunity.description,
-        "opp_requirements": opportunity.requirements
+        "opp_description": opp_text["description"],
+        "opp_requirements": opp_text["requirements"]
     }
 
     # Format the messages
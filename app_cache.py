@@ -0,0 +1,137 @@
+"""
+Shared resources and derived data cached across Streamlit reruns
+
+Resources (LLM clients) are process-wide singletons via st.cache_resource:
+every session and worker thread reuses the same client and its HTTP
+connection pool. Derived data (PDF exports, history summaries) goes
+through st.cache_data, keyed by the inputs it is derived from, so a write
+produces a new key instead of a stale hit. The opportunity catalog and
+search results are cached the same way inside opportunities_storage.
+
+Outside `streamlit run` (CLI tools, benchmarks) the decorators fall back to
+an in-memory cache, so these helpers work everywhere.
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from models import MatchResult, Opportunity, UserProfile
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+@st.cache_resource(show_spinner=False)
+def _llm(model: str, temperature: float, api_key: Optional[str], call_site: str):
+    from langchain_openai import ChatOpenAI
+    from llm_callbacks import TelemetryCallbackHandler
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=api_key,
+        callbacks=[TelemetryCallbackHandler(call_site)]
+    )
+
+
+def get_llm(temperature: float = 0.0, model: str = DEFAULT_MODEL, call_site: str = "other"):
+    """
+    Shared ChatOpenAI client for a model, temperature and call site
+
+    Every request through it is recorded in llm_telemetry under `call_site`.
+    Clients for different call sites still share one HTTP connection pool
+    (langchain_openai caches its httpx clients). The API key is part of the
+    cache key, so changing it (e.g. via Streamlit secrets) yields a fresh
+    client rather than a stale one.
+    """
+    return _llm(model, float(temperature), os.environ.get("OPENAI_API_KEY"), call_site)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _evaluation_pdf(profile_json: str, opportunity_json: str, result_json: str) -> bytes:
+    from pdf_generator import generate_evaluation_pdf
+    return generate_evaluation_pdf(
+        UserProfile.model_validate_json(profile_json),
+        Opportunity.model_validate_json(opportunity_json),
+        MatchResult.model_validate_json(result_json)
+    ).getvalue()
+
+
+def evaluation_pdf(profile: UserProfile, opportunity: Opportunity, result: MatchResult) -> bytes:
+    """Evaluation report PDF, built once per distinct (profile, opportunity, result)"""
+    return _evaluation_pdf(profile.model_dump_json(), opportunity.model_dump_json(), result.model_dump_json())
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _profile_pdf(profile_json: str) -> bytes:
+    from pdf_generator import generate_profile_summary_pdf
+    return generate_profile_summary_pdf(UserProfile.model_validate_json(profile_json)).getvalue()
+
+
+def profile_pdf(profile: UserProfile) -> bytes:
+    """Profile summary PDF, rebuilt only when the profile changes"""
+    return _profile_pdf(profile.model_dump_json())
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _portfolio_report_pdf(profile_json: str, evaluations_json: Tuple[Tuple[str, str], ...]) -> bytes:
+    from pdf_generator import generate_portfolio_pdf
+    return generate_portfolio_pdf(
+        UserProfile.model_validate_json(profile_json),
+        [
+            (Opportunity.model_validate_json(opportunity_json), MatchResult.model_validate_json(result_json))
+            for opportunity_json, result_json in evaluations_json
+        ]
+    ).getvalue()
+
+
+def portfolio_report_pdf(profile: UserProfile, evaluations: List[Tuple[Opportunity, MatchResult]]) -> bytes:
+    """
+    Combined report for a batch of evaluations, rendered once per distinct batch
+
+    Meant for st.download_button's callable data, so the report is only
+    built when it is downloaded, off the script thread.
+    """
+    return _portfolio_report_pdf(
+        profile.model_dump_json(),
+        tuple((opportunity.model_dump_json(), result.model_dump_json()) for opportunity, result in evaluations)
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _evaluation_summary(user_id: str, version: int) -> Dict:
+    from user_store import evaluation_summary
+    return evaluation_summary(user_id)
+
+
+def cached_evaluation_summary(user_id: str) -> Dict:
+    """History totals, cached until this user's history is next written"""
+    from user_store import history_version
+    return _evaluation_summary(user_id, history_version(user_id))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _evaluation_rows(user_id: str, version: int) -> List[Dict]:
+    from user_store import evaluation_rows
+    return evaluation_rows(user_id)
+
+
+def cached_evaluation_rows(user_id: str) -> List[Dict]:
+    """
+    Lightweight rows of the user's history (id, title, type, score...),
+    cached until it changes; load full records with load_evaluations_by_id
+    """
+    from user_store import history_version
+    return _evaluation_rows(user_id, history_version(user_id))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _portfolio(user_id: str, version: int):
+    from intelligence.portfolio import PortfolioArrays
+    from user_store import evaluation_rows
+    return PortfolioArrays.from_rows(evaluation_rows(user_id))
+
+
+def cached_portfolio(user_id: str):
+    """Column arrays over the user's history, rebuilt only after it changes"""
+    from user_store import history_version
+    return _portfolio(user_id, history_version(user_id))
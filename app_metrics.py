@@ -0,0 +1,393 @@
+"""
+Prometheus metrics for production deployments
+
+Set METRICS_PORT (and optionally METRICS_HOST, default 127.0.0.1) to
+enable: main.py then starts a sidecar HTTP thread serving every metric
+below at /metrics in the Prometheus text format. The registry is built
+in, so nothing extra is installed and it works offline.
+
+Without METRICS_PORT each metric is a shared no-op stub: instrumented
+code still calls `.labels(...).inc()`, but nothing is stored or locked.
+
+Feeds: reruns and sessions (main.py), per-stage latency and errors from
+every @traced function (storage, scrape, parse, extract, evaluate,
+agent, materials, report), LLM calls from llm_telemetry, image cache
+lookups, batch queue depth (materials, posters, document chunks, batch
+match) and scraper/crawler fetches.
+"""
+import abc
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_PORT = os.environ.get("METRICS_PORT")
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+ENABLED = bool(METRICS_PORT)
+
+PREFIX = "opportunity_matcher_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+ACTIVE_SESSION_SECONDS = 300  # A session counts as active this long after its last rerun
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Timer:
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the value when scraped instead of storing it"""
+        self._function = function
+
+    def current(self) -> float:
+        return float(self._function()) if self._function else self.value
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """A fresh child holding the value(s) of one label combination"""
+
+    def labels(self, *values, **named):
+        key = tuple(str(value) for value in values) or tuple(str(named[name]) for name in self.labelnames)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        return self.labels()
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        """(sample name, labels, value) for every child"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield self.name, list(zip(self.labelnames, key)), child.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabelled().dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._unlabelled().set_function(function)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield self.name, list(zip(self.labelnames, key)), child.current()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def time(self) -> _Timer:
+        return self._unlabelled().time()
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            labels = list(zip(self.labelnames, key))
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class _NoopMetric:
+    """Stands in for every metric when metrics are disabled"""
+
+    def labels(self, *values, **named):
+        return self
+
+    def inc(self, amount: float = 1.0):
+        pass
+
+    def dec(self, amount: float = 1.0):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def set_function(self, function):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+    def time(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopMetric()
+_registry: List[_Metric] = []
+
+
+def _register(metric: _Metric):
+    if not ENABLED:
+        return _NOOP
+    _registry.append(metric)
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    return _register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render_text() -> str:
+    """Every registered metric in the Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+RERUNS = counter("reruns_total", "Script reruns, by page", ["page"])
+RERUN_SECONDS = histogram("rerun_seconds", "Wall time of a script rerun, by page", ["page"])
+ACTIVE_SESSIONS = gauge("active_sessions", f"Sessions with a rerun in the last {ACTIVE_SESSION_SECONDS} seconds")
+
+STAGE_SECONDS = histogram("stage_seconds", "Latency of instrumented operations, by pipeline stage", ["stage"])
+STAGE_ERRORS = counter("stage_errors_total", "Instrumented operations that raised, by pipeline stage", ["stage"])
+
+LLM_CALLS = counter("llm_calls_total", "Model calls, by call site and outcome (ok, error, cache_hit)", ["call_site", "outcome"])
+LLM_SECONDS = histogram("llm_call_seconds", "Model call latency, by call site", ["call_site"])
+LLM_TOKENS = counter("llm_tokens_total", "Tokens used, by call site and kind (input, output, cached)", ["call_site", "kind"])
+LLM_COST = counter("llm_cost_dollars_total", "Estimated model cost in USD, by call site", ["call_site"])
+LLM_RETRIES = counter("llm_retries_total", "Client retries of model calls, by call site", ["call_site"])
+
+CACHE_LOOKUPS = counter("cache_lookups_total", "Cache lookups, by cache and result (hit or miss)", ["cache", "result"])
+
+BATCH_PENDING = gauge("batch_pending_items", "Items queued or in flight in batch jobs, by batch", ["batch"])
+BATCH_ITEMS = counter("batch_items_total", "Batch items finished, by batch and outcome (ok, error, or ineligible when skipped before evaluation)", ["batch", "outcome"])
+
+SCRAPE_REQUESTS = counter("scrape_requests_total", "Page fetches, by source (scraper, crawler) and outcome", ["source", "outcome"])
+CRAWL_FRONTIER_SIZE = gauge("crawl_frontier_urls", "URLs waiting in the crawl frontier")
+
+
+def observe_stage(stage: str, name: str, seconds: float, failed: bool):
+    """tracing observer: every @traced call, labelled by its category"""
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    if failed:
+        STAGE_ERRORS.labels(stage).inc()
+
+
+def observe_llm_call(call):
+    """Called by llm_telemetry for every recorded LLMCall"""
+    if not ENABLED:
+        return
+    LLM_CALLS.labels(call.call_site, call.outcome).inc()
+    if call.outcome == "cache_hit":
+        return
+    LLM_SECONDS.labels(call.call_site).observe(call.latency)
+    LLM_TOKENS.labels(call.call_site, "input").inc(call.input_tokens)
+    LLM_TOKENS.labels(call.call_site, "output").inc(call.output_tokens)
+    LLM_TOKENS.labels(call.call_site, "cached").inc(call.cached_tokens)
+    LLM_COST.labels(call.call_site).inc(call.cost)
+    if call.retries:
+        LLM_RETRIES.labels(call.call_site).inc(call.retries)
+
+
+def batch_item_done(batch: str, ok: bool):
+    BATCH_PENDING.labels(batch).dec()
+    BATCH_ITEMS.labels(batch, "ok" if ok else "error").inc()
+
+
+_sessions: Dict[str, float] = {}  # session id -> time of its last rerun
+
+
+def _active_session_count() -> int:
+    cutoff = time.time() - ACTIVE_SESSION_SECONDS
+    for session_id, last_seen in list(_sessions.items()):
+        if last_seen < cutoff:
+            _sessions.pop(session_id, None)
+    return len(_sessions)
+
+
+def session_seen():
+    """Mark the session running this rerun as active"""
+    if not ENABLED:
+        return
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        return
+    if ctx is not None:
+        _sessions[ctx.session_id] = time.time()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = METRICS_HOST) -> bool:
+    """
+    Serve /metrics from a daemon thread (once per process); returns False
+    when metrics are disabled or the port is taken
+    """
+    global _server
+    if not ENABLED:
+        return False
+    with _server_lock:
+        if _server is not None:
+            return True
+        try:
+            _server = ThreadingHTTPServer((host, int(port or METRICS_PORT)), _MetricsHandler)
+        except (OSError, ValueError):
+            return False
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+
+        ACTIVE_SESSIONS.set_function(_active_session_count)
+        from tracing import set_observer
+        set_observer(observe_stage)
+    return True
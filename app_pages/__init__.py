@@ -0,0 +1,26 @@
+"""
+Pages of the app, one module per page, each exposing render()
+
+A page module is imported the first time its page is opened, so each
+rerun executes (and loads the dependencies of) the selected page only.
+"""
+import importlib
+
+from tracing import span
+
+PAGES = {
+    "📝 Your Profile": "profile",
+    "🔍 Check Match": "match",
+    "📊 History": "history",
+    "✍️ Generate Materials": "materials",
+    "📄 Upload Documents": "documents",
+    "🗄️ Opportunity Database": "database",
+    "🤖 AI Strategy": "strategy"
+}
+
+
+def render_page(label: str):
+    with span(f"import {PAGES[label]}", "import"):
+        page = importlib.import_module(f"{__name__}.{PAGES[label]}")
+    with span(f"render {PAGES[label]}", "streamlit"):
+        page.render()
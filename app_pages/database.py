@@ -0,0 +1,440 @@
+"""Opportunity Database: add, browse and search saved opportunities"""
+
+from datetime import date
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card
+from tracing import span
+
+
+def _deadline_text(opp) -> str:
+    """The deadline with days left, from the date normalized at ingest"""
+    deadline_date = (opp.get('features') or {}).get('deadline_date')
+    if not deadline_date:
+        return str(opp['deadline'])
+    days = (date.fromisoformat(deadline_date) - date.today()).days
+    if days < 0:
+        return f"{deadline_date} (closed)"
+    return f"{deadline_date} ({'today' if days == 0 else f'in {days} days'})"
+
+
+def render():
+    st.header("🗄️ Opportunity Database")
+    st.markdown("Save and manage opportunities for quick access later.")
+    
+    # Create sub-tabs for better organization
+    db_tab1, db_tab2, db_tab3 = st.tabs(["📥 Add Opportunity", "📚 Browse Database", "🔍 Search"])
+    
+    # SUB-TAB 1: Add Opportunity
+    with db_tab1, span("tab Add Opportunity", "tab"):
+        st.subheader("Add New Opportunity to Database")
+
+        # Add URL extraction option
+        st.markdown("**Option 1: Extract from URL**")
+        col_url1, col_url2 = st.columns([3, 1])
+        with col_url1:
+            extract_url = st.text_input("Paste URL to extract opportunity details:", placeholder="https://...")
+        with col_url2:
+            st.write("")
+            st.write("")
+            extract_btn = st.button("🔍 Extract", use_container_width=True)
+
+        if extract_btn and extract_url:
+            with st.spinner("Extracting opportunity details from URL..."):
+                try:
+                    from app_cache import get_llm
+                    import requests
+                    from content_extractor import extract_main_content
+
+                    # Fetch webpage
+                    headers = {'User-Agent': 'Mozilla/5.0'}
+                    response = requests.get(extract_url, headers=headers, timeout=10)
+
+                    # Extract main content only (no nav/footer boilerplate), within a token budget
+                    text = extract_main_content(response.content, max_tokens=2500)
+
+                    # Use AI to extract structured data
+                    llm = get_llm(temperature=0, call_site="database.extract_opportunity")
+                    prompt = f"""Extract opportunity details from this webpage text and return ONLY a valid JSON object (no markdown, no code blocks):
+
+{text}
+
+Return JSON with these fields:
+- title: opportunity name
+- type: one of (Scholarship/Job/Academic Program/Fellowship/Internship/Other)
+- description: brief summary
+- requirements: eligibility criteria
+- deadline: if mentioned, format YYYY-MM-DD
+- provider: organization name
+- funding: amount if mentioned
+
+Return ONLY the JSON object, nothing else."""
+
+                    result = llm.invoke(prompt)
+
+                    # Clean the response
+                    import json
+                    import re
+
+                    content = result.content.strip()
+                    # Remove markdown code blocks if present
+                    content = re.sub(r'^```json\s*', '', content)
+                    content = re.sub(r'^```\s*', '', content)
+                    content = re.sub(r'\s*```$', '', content)
+                    content = content.strip()
+
+                    # Parse JSON
+                    extracted_data = json.loads(content)
+
+                    st.success("✅ Extracted! Review below:")
+                    st.session_state.extracted_from_url = extracted_data
+
+                    # Display in a nice format
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**Title:** {extracted_data.get('title', 'N/A')}")
+                        st.write(f"**Type:** {extracted_data.get('type', 'N/A')}")
+                        st.write(f"**Provider:** {extracted_data.get('provider', 'N/A')}")
+                    with col2:
+                        st.write(f"**Deadline:** {extracted_data.get('deadline', 'N/A')}")
+                        st.write(f"**Funding:** {extracted_data.get('funding', 'N/A')}")
+
+                    st.write(f"**Description:** {extracted_data.get('description', 'N/A')}")
+                    st.write(f"**Requirements:** {extracted_data.get('requirements', 'N/A')}")
+
+                    # Button to save directly
+                    if st.button("💾 Save This to Database", use_container_width=True):
+                        from opportunities_storage import save_opportunity
+                        opp_data = {
+                            "title": extracted_data.get('title'),
+                            "type": extracted_data.get('type'),
+                            "description": extracted_data.get('description'),
+                            "requirements": extracted_data.get('requirements'),
+                            "deadline": extracted_data.get('deadline'),
+                            "provider": extracted_data.get('provider'),
+                            "funding": extracted_data.get('funding'),
+                            "link": extract_url
+                        }
+                        if save_opportunity(opp_data):
+                            st.success("✅ Saved to database!")
+                            st.balloons()
+                        else:
+                            st.error("Failed to save")
+                except Exception as e:
+                    st.error(f"Failed to extract: {str(e)}")
+
+                    # Debug info
+                    with st.expander("🔍 Debug Information"):
+                        import sys
+                        st.write(f"**Error type:** {type(e).__name__}")
+                        st.write(f"**Python:** {sys.executable}")
+
+                        # Check if modules are available
+                        try:
+                            import bs4
+                            st.success(f"✅ BeautifulSoup4 installed at: {bs4.__file__}")
+                        except ImportError:
+                            st.error("❌ BeautifulSoup4 NOT installed")
+                            st.code("pip install beautifulsoup4")
+
+                        try:
+                            import requests
+                            st.success(f"✅ Requests installed at: {requests.__file__}")
+                        except ImportError:
+                            st.error("❌ Requests NOT installed")
+                            st.code("pip install requests")
+
+        st.divider()
+        st.markdown("**Option 2: Import from Poster Images**")
+
+        poster_files = st.file_uploader(
+            "Upload one or more opportunity posters/flyers/screenshots",
+            type=['png', 'jpg', 'jpeg'],
+            accept_multiple_files=True,
+            key="poster_batch_uploader",
+            help="Images are processed in parallel; a failed image does not stop the others"
+        )
+
+        if poster_files and st.button(f"🔍 Extract {len(poster_files)} Poster(s)", key="extract_posters_btn"):
+            with st.spinner(f"Extracting {len(poster_files)} poster(s) in parallel..."):
+                try:
+                    from opportunity_image_extractor import extract_many
+                    from user_store import current_user_id
+
+                    st.session_state.poster_extractions = extract_many(
+                        [(f.name, f.getvalue()) for f in poster_files],
+                        user_id=current_user_id()
+                    )
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+
+        poster_extractions = st.session_state.get("poster_extractions") or []
+        if poster_extractions:
+            extracted_ok = [r for r in poster_extractions if r.ok]
+            st.write(f"Extracted {len(extracted_ok)} of {len(poster_extractions)} image(s)")
+
+            for result in poster_extractions:
+                if result.ok:
+                    with st.expander(f"✅ {result.name}: {result.data['title']}"):
+                        st.json(result.data)
+                else:
+                    st.warning(f"⚠️ {result.name}: {result.error}")
+
+            if extracted_ok and st.button(f"💾 Save {len(extracted_ok)} to Database", key="save_posters_btn"):
+                from opportunities_storage import save_opportunity
+
+                records = [dict(r.data) for r in extracted_ok]
+                saved = [record for record in records if save_opportunity(record)]
+                merged = sum(1 for record in saved if 'duplicate_of' in record)
+                st.success(
+                    f"✅ Saved {len(saved) - merged} new opportunities to database"
+                    + (f", merged {merged} into existing ones!" if merged else "!")
+                )
+                st.session_state.poster_extractions = []
+
+        st.divider()
+        st.markdown("**Option 3: Manual Entry**")
+
+        with st.form("add_to_database_form"):
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                db_title = st.text_input("Opportunity Title*", key="db_title")
+
+            with col2:
+                db_type = st.selectbox(
+                    "Type*",
+                    ["Scholarship", "Job", "Academic Program", "Fellowship", "Internship", "Other"],
+                    key="db_type"
+                )
+
+            db_description = st.text_area(
+                "Description*",
+                height=100,
+                key="db_description",
+                placeholder="Enter the opportunity description..."
+            )
+
+            db_requirements = st.text_area(
+                "Requirements*",
+                height=100,
+                key="db_requirements",
+                placeholder="Enter eligibility criteria and requirements..."
+            )
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                db_deadline = st.text_input("Deadline (optional)", key="db_deadline", placeholder="YYYY-MM-DD")
+            with col2:
+                db_provider = st.text_input("Provider (optional)", key="db_provider", placeholder="Organization name")
+            with col3:
+                db_funding = st.text_input("Funding Amount (optional)", key="db_funding", placeholder="e.g., $10,000")
+
+            db_link = st.text_input("Application Link/Contact (optional)", key="db_link", placeholder="https://...")
+
+            submit_to_db = st.form_submit_button("💾 Save to Database", use_container_width=True)
+            
+            if submit_to_db:
+                if not db_title or not db_description or not db_requirements:
+                    st.error("Please fill all required fields marked with *")
+                else:
+                    from opportunities_storage import save_opportunity
+                    
+                    opp_data = {
+                        "title": db_title,
+                        "type": db_type,
+                        "description": db_description,
+                        "requirements": db_requirements,
+                        "deadline": db_deadline if db_deadline else None,
+                        "provider": db_provider if db_provider else None,
+                        "funding": db_funding if db_funding else None,
+                        "link": db_link if db_link else None
+                    }
+                    
+                    if save_opportunity(opp_data):
+                        st.success(f"✅ '{db_title}' saved to database!")
+                        st.balloons()
+                        st.info("👉 Go to 'Browse Database' tab to see all saved opportunities")
+                    else:
+                        st.error("Failed to save opportunity")
+    
+    # SUB-TAB 2: Browse Database
+    with db_tab2, span("tab Browse Database", "tab"):
+        st.subheader("Browse All Opportunities")
+
+        from opportunities_storage import opportunity_counts, query_opportunities, delete_opportunity
+        from enhanced_ui import paginate
+
+        counts = opportunity_counts()
+
+        if not counts["total"]:
+            st.info("📭 No opportunities in database yet. Add some in the 'Add Opportunity' tab!")
+        else:
+            st.write(f"**{counts['total']} opportunities in database:**")
+
+            # Summary stats
+            scholarships, jobs, programs = counts["Scholarship"], counts["Job"], counts["Academic Program"]
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                create_metric_card("Scholarships", scholarships)
+            with col2:
+                create_metric_card("Jobs", jobs)
+            with col3:
+                create_metric_card("Programs", programs)
+            with col4:
+                create_metric_card("Others", counts["Other"])
+
+            st.divider()
+
+            # Create tabs for different opportunity types
+            browse_tab1, browse_tab2, browse_tab3, browse_tab4 = st.tabs([
+                f"🎓 Scholarships ({scholarships})",
+                f"💼 Jobs ({jobs})",
+                f"🏫 Programs ({programs})",
+                f"📌 All ({counts['total']})"
+            ])
+
+            # Helper function to display opportunities
+            def display_opportunity_card(opp, key_prefix=""):
+                with st.expander(f"🎯 {opp.get('title')}", expanded=False):
+                    col1, col2 = st.columns([3, 1])
+
+                    with col1:
+                        st.write(f"**Type:** {opp.get('type')}")
+                        st.write(f"**Description:** {opp.get('description', 'N/A')}")
+                        st.write(f"**Requirements:** {opp.get('requirements', 'N/A')}")
+
+                        if opp.get('deadline'):
+                            st.write(f"**Deadline:** {_deadline_text(opp)}")
+                        if opp.get('provider'):
+                            st.write(f"**Provider:** {opp['provider']}")
+                        if opp.get('funding'):
+                            st.write(f"**Funding:** {opp['funding']}")
+                        if opp.get('link'):
+                            st.write(f"**Link:** {opp['link']}")
+
+                        st.caption(f"Added: {opp.get('saved_at', 'Unknown')}")
+
+                    with col2:
+                        # Use this opportunity button
+                        if st.button("✅ Use for Matching", key=f"{key_prefix}_use_{opp.get('id')}", use_container_width=True):
+                            # Pre-fill the extracted data for Tab 2
+                            st.session_state.extracted_opportunity_data = {
+                                'title': opp.get('title'),
+                                'type': opp.get('type'),
+                                'description': opp.get('description'),
+                                'requirements': opp.get('requirements'),
+                                'deadline': opp.get('deadline'),
+                                'provider': opp.get('provider'),
+                                'funding': opp.get('funding'),
+                                'link': opp.get('link')
+                            }
+                            st.success("✅ Opportunity loaded!")
+                            st.info("👉 Go to 'Check Match' tab to evaluate")
+                            st.rerun()
+
+                        # Delete button
+                        if st.button("🗑️ Delete", key=f"{key_prefix}_delete_{opp.get('id')}", type="secondary", use_container_width=True):
+                            if delete_opportunity(opp.get('id')):
+                                st.success("Deleted!")
+                                st.rerun()
+                            else:
+                                st.error("Failed to delete")
+
+            # Only the current page of each tab is rendered
+            browse_views = [
+                (browse_tab1, "Scholarship", "scholar", "scholarships", "📭 No scholarships found. Add some in the 'Add Opportunity' tab!"),
+                (browse_tab2, "Job", "job", "jobs", "📭 No jobs found. Add some in the 'Add Opportunity' tab!"),
+                (browse_tab3, "Academic Program", "program", "programs", "📭 No academic programs found. Add some in the 'Add Opportunity' tab!")
+            ]
+            for browse_tab, opp_type, key_prefix, label, empty_message in browse_views:
+                with browse_tab, span(f"tab Browse {label}", "tab"):
+                    if counts[opp_type]:
+                        st.write(f"**{counts[opp_type]} {label} available**")
+                        offset, limit = paginate(counts[opp_type], key=f"browse_{key_prefix}")
+                        for opp in query_opportunities(opp_type, limit=limit, offset=offset):
+                            display_opportunity_card(opp, key_prefix=key_prefix)
+                    else:
+                        st.info(empty_message)
+
+            # All Tab
+            with browse_tab4, span("tab Browse all", "tab"):
+                st.write(f"**Showing all {counts['total']} opportunities (newest first)**")
+                offset, limit = paginate(counts["total"], key="browse_all")
+                for opp in query_opportunities(None, limit=limit, offset=offset):
+                    display_opportunity_card(opp, key_prefix="all")
+    
+    # SUB-TAB 3: Search
+    with db_tab3, span("tab Search", "tab"):
+        st.subheader("Search Opportunities")
+        
+        from opportunities_storage import search_opportunities
+        
+        search_query = st.text_input(
+            "Search by title or type", 
+            placeholder="e.g., Fulbright, Scholarship, Job",
+            help="Search for opportunities by keywords in title or type"
+        )
+        
+        if search_query:
+            results = search_opportunities(search_query)
+            
+            if results:
+                st.success(f"Found {len(results)} matching opportunities")
+                
+                for opp in results:
+                    with st.expander(f"🎯 {opp.get('title')}", expanded=True):
+                        col1, col2 = st.columns([3, 1])
+                        
+                        with col1:
+                            st.write(f"**Type:** {opp.get('type')}")
+                            
+                            # Show the digest (stored at ingest) instead of the full description
+                            description = (opp.get('digest') or {}).get('description') or opp.get('description', 'N/A')
+                            if len(description) > 400:
+                                st.write(f"**Description:** {description[:400]}...")
+                            else:
+                                st.write(f"**Description:** {description}")
+                            
+                            # Show key info
+                            if opp.get('deadline'):
+                                st.write(f"**Deadline:** {_deadline_text(opp)}")
+                            if opp.get('provider'):
+                                st.write(f"**Provider:** {opp['provider']}")
+                            if opp.get('funding'):
+                                st.write(f"**Funding:** {opp['funding']}")
+                        
+                        with col2:
+                            if st.button("✅ Use This", key=f"search_use_{opp.get('id')}", use_container_width=True):
+                                st.session_state.extracted_opportunity_data = {
+                                    'title': opp.get('title'),
+                                    'type': opp.get('type'),
+                                    'description': opp.get('description'),
+                                    'requirements': opp.get('requirements'),
+                                    'deadline': opp.get('deadline'),
+                                    'provider': opp.get('provider'),
+                                    'funding': opp.get('funding'),
+                                    'link': opp.get('link')
+                                }
+                                st.success("✅ Loaded!")
+                                st.info("👉 Go to 'Check Match'")
+                                st.rerun()  # FIXED: Added rerun to refresh the form
+                            
+                            # View full details button
+                            if st.button("📄 Full Details", key=f"search_details_{opp.get('id')}", use_container_width=True):
+                                st.write("**Full Requirements:**")
+                                st.write(opp.get('requirements', 'N/A'))
+                                if opp.get('link'):
+                                    st.write(f"**Link:** {opp['link']}")
+            else:
+                st.warning("No opportunities found matching your search")
+                st.info("Try different keywords like: scholarship, job, fellowship, internship")
+        else:
+            st.info("💡 Enter a search term to find opportunities in the database")
+            st.markdown("""
+            **Search tips:**
+            - Search by opportunity name (e.g., "Fulbright")
+            - Search by type (e.g., "Scholarship", "Job")
+            - Search by keywords in the title
+            """)
@@ -0,0 +1,359 @@
+"""Upload Documents: analyze CVs, transcripts and certificates"""
+
+import os
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card
+from models import UserProfile
+
+
+def render():
+    st.header("Upload and Analyze Documents")
+    st.markdown("Upload your CV (PDF or image) to automatically create your profile and match against scholarships.")
+
+    # Instructions
+    st.markdown("""
+    <div class="info-card">
+        <h4>📋 How it works:</h4>
+        <ol>
+            <li>Upload your CV as PDF or image (PNG/JPG)</li>
+            <li>AI extracts text and analyzes your profile</li>
+            <li>Click "Auto-fill Profile" to create your profile</li>
+            <li>Go to "Check Match" tab to batch match all scholarships</li>
+        </ol>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # File uploader
+    uploaded_file = st.file_uploader(
+        "Choose a document (image or PDF)",
+        type=['png', 'jpg', 'jpeg', 'pdf'],
+        help="Upload clear, high-quality images or PDF files for best results"
+    )
+    
+    if uploaded_file is not None:
+        # Check if PDF or image
+        is_pdf = uploaded_file.name.lower().endswith('.pdf')
+
+        # Display the uploaded document
+        col1, col2 = st.columns([1, 1])
+
+        with col1:
+            st.subheader("📄 Uploaded Document")
+            if not is_pdf:
+                st.image(uploaded_file, caption="Uploaded Document", use_container_width=True)
+            else:
+                st.info(f"📄 PDF uploaded: {uploaded_file.name}")
+
+            # Document type hint
+            doc_type_hint = st.selectbox(
+                "Document Type (optional hint)",
+                ["Auto-detect", "CV/Resume", "Academic Transcript", "Certificate", "Cover Letter", "Other"]
+            )
+
+            # Analyze button
+            if st.button("🔍 Analyze Document", type="primary"):
+
+                if not os.environ.get('OPENAI_API_KEY'):
+                    st.error("OpenAI API key not found. Please check your configuration.")
+                else:
+                    with st.spinner("🤖 Analyzing document... This may take 15-20 seconds."):
+                        try:
+                            # Handle PDF differently
+                            if is_pdf:
+                                from pdf_extractor import extract_pdf_for_analysis
+
+                                doc_hint = None if doc_type_hint == "Auto-detect" else doc_type_hint
+
+                                # Extract text page by page (in worker processes for large PDFs)
+                                pdf_bytes = uploaded_file.getvalue()
+                                pdf_progress = st.progress(0.0, text="Reading PDF pages...")
+
+                                def show_pdf_progress(page, total):
+                                    pdf_progress.progress(page.number / max(total, 1), text=f"Reading page {page.number} of {total}")
+
+                                pdf = extract_pdf_for_analysis(pdf_bytes, on_page=show_pdf_progress)
+                                pdf_progress.empty()
+                                extracted_text = pdf.full_text
+
+                                if not pdf.text_pages:
+                                    st.warning("No selectable text found in this PDF. If it is a scan, upload the pages as images instead.")
+
+                                pdf_note = f"{pdf.text_pages} of {pdf.page_count} pages with text"
+                                if pdf.image_only_pages:
+                                    pdf_note += f" · {len(pdf.image_only_pages)} scanned/image-only pages skipped"
+                                st.caption(pdf_note)
+
+                                # Map-reduce analysis: every section is read, in parallel chunks
+                                from document_analyzer import analyze_document_text
+
+                                analysis = analyze_document_text(extracted_text, doc_hint)
+
+                            else:
+                                # Handle image
+                                from image_analyzer import analyze_document_image, extract_profile_info_from_text
+
+                                from image_preprocessing import preprocess_image
+                                from image_cache import get_image_cache
+                                from models import DocumentAnalysis
+                                import time
+
+                                image_bytes = uploaded_file.getvalue()
+                                doc_hint = None if doc_type_hint == "Auto-detect" else doc_type_hint
+
+                                # Same image analyzed before: no API call needed
+                                lookup_start = time.perf_counter()
+                                cached, match = get_image_cache().lookup("document", image_bytes, doc_hint)
+
+                                if cached is not None:
+                                    analysis = DocumentAnalysis(**cached)
+                                    st.caption(
+                                        f"Loaded from image cache ({match} match) in "
+                                        f"{(time.perf_counter() - lookup_start) * 1000:.0f} ms"
+                                    )
+                                else:
+                                    # Shrink the image to what the model can use, then analyze it
+                                    prepared = preprocess_image(image_bytes, target="openai", document=True)
+                                    analysis_start = time.perf_counter()
+                                    analysis = analyze_document_image(prepared, doc_hint, use_cache=True)
+                                    analysis_seconds = time.perf_counter() - analysis_start
+
+                                    st.caption(
+                                        f"Image payload: {prepared.original_size / 1024:.0f} KB → {prepared.size / 1024:.0f} KB "
+                                        f"({prepared.mime_type}, {prepared.width}×{prepared.height}) · "
+                                        f"preprocessing {prepared.elapsed_ms:.0f} ms · analysis {analysis_seconds:.1f} s"
+                                    )
+                            
+                            # Store analysis in session state for later use
+                            st.session_state.document_analysis = analysis
+                            
+                            # Display results in second column
+                            with col2:
+                                st.subheader("📊 Analysis Results")
+                                
+                                # Document type and confidence
+                                col_a, col_b = st.columns(2)
+                                with col_a:
+                                    create_metric_card("Document Type", analysis.document_type)
+                                with col_b:
+                                    create_metric_card("Confidence", f"{analysis.confidence_score:.1%}")
+                                
+                                if analysis.key_information:
+                                    with st.expander("🔑 Key Information", expanded=True):
+                                        for info_key, info_value in analysis.key_information.items():
+                                            st.write(f"**{info_key.replace('_', ' ').title()}:** {info_value}")
+
+                                # Extracted text
+                                with st.expander("📄 Extracted Text", expanded=not analysis.key_information):
+                                    st.text_area(
+                                        "Full Text",
+                                        value=analysis.extracted_text,
+                                        height=200,
+                                        help="All text extracted from the document"
+                                    )
+                                
+                                # Suggestions
+                                st.markdown("""
+                                <div class="info-card">
+                                    <h4>💡 Suggestions</h4>
+                                </div>
+                                """, unsafe_allow_html=True)
+                                st.write(analysis.suggestions)
+                            
+                            # Auto-fill profile button (for CV/Resume only)
+                            if "CV" in analysis.document_type or "Resume" in analysis.document_type:
+                                st.divider()
+                                st.subheader("🔄 Auto-fill Profile from CV")
+                                
+                                col1, col2 = st.columns([2, 1])
+                                with col1:
+                                    st.info("This appears to be a CV/Resume. You can automatically create a profile from this document.")
+                                
+                                with col2:
+                                    if st.button("⚡ Auto-fill Profile", type="primary", use_container_width=True):
+                                        with st.spinner("Extracting profile information..."):
+                                            try:
+                                                from app_cache import get_llm
+                                                from document_analyzer import document_digest
+                                                
+                                                llm = get_llm(temperature=0, call_site="documents.autofill_profile")
+                                                
+                                                # Long CVs go in as the key information merged by the analysis above; no extra model call
+                                                prompt = f"""Extract profile information from this CV/Resume text and return ONLY a valid JSON object.
+
+CV Text:
+{document_digest(analysis.extracted_text, analysis.key_information)}
+
+Return this exact JSON structure (no extra text, no markdown):
+{{
+    "name": "extracted full name",
+    "education_level": "Bachelor's" or "Master's" or "PhD" or "High School",
+    "field_of_study": "major/field extracted from education section",
+    "gpa": 3.5 or null if not mentioned,
+    "skills": "comma separated list of all technical and soft skills",
+    "experience_years": total years of work experience as integer,
+    "languages": "comma separated languages spoken",
+    "achievements": "key achievements, awards, publications, certifications",
+    "goals": "inferred career goals based on CV content and trajectory"
+}}
+
+Rules:
+- Use exact values from CV where possible
+- If information is missing, use null or reasonable default
+- Keep it concise and accurate
+- Return ONLY the JSON, no other text"""
+                                                
+                                                response = llm.invoke(prompt)
+                                                
+                                                # Parse JSON
+                                                import json
+                                                content = response.content.strip()
+                                                
+                                                # Clean up if it has markdown code blocks
+                                                if content.startswith("```json"):
+                                                    content = content[7:]
+                                                elif content.startswith("```"):
+                                                    content = content[3:]
+                                                if content.endswith("```"):
+                                                    content = content[:-3]
+                                                content = content.strip()
+                                                
+                                                profile_data = json.loads(content)
+                                                
+                                                # Create profile
+                                                st.session_state.profile = UserProfile(
+                                                    name=profile_data.get('name', 'Unknown'),
+                                                    education_level=profile_data.get('education_level', 'Bachelor\'s'),
+                                                    field_of_study=profile_data.get('field_of_study', 'Not specified'),
+                                                    gpa=profile_data.get('gpa'),
+                                                    skills=profile_data.get('skills', ''),
+                                                    experience_years=profile_data.get('experience_years', 0),
+                                                    languages=profile_data.get('languages', 'English'),
+                                                    achievements=profile_data.get('achievements', ''),
+                                                    goals=profile_data.get('goals', '')
+                                                )
+                                                
+                                                st.success("✅ Profile auto-filled from CV!")
+                                                st.balloons()
+
+                                                col_action1, col_action2 = st.columns(2)
+                                                with col_action1:
+                                                    if st.button("📝 Review Profile", use_container_width=True):
+                                                        st.info("👉 Go to 'Your Profile' tab")
+                                                with col_action2:
+                                                    if st.button("🚀 Start Batch Match", type="primary", use_container_width=True):
+                                                        st.info("👉 Go to 'Check Match' tab")
+
+                                                st.rerun() 
+                                                
+                                            except json.JSONDecodeError as e:
+                                                st.error(f"Failed to parse AI response: {str(e)}")
+                                                st.write("AI Response:", response.content[:500])
+                                            except Exception as e:
+                                                st.error(f"Failed to extract profile: {str(e)}")
+                            
+                            # Extract profile information if we have a profile (enhancement suggestions)
+                            if st.session_state.profile:
+                                st.divider()
+                                st.subheader("🔄 Profile Enhancement Suggestions")
+                                
+                                with st.spinner("Analyzing how to enhance your profile..."):
+                                    try:
+                                        profile_suggestions = extract_profile_info_from_text(
+                                            analysis.extracted_text,
+                                            st.session_state.profile,
+                                            analysis.key_information
+                                        )
+                                        
+                                        st.markdown("""
+                                        <div class="success-card">
+                                            <h4>📈 Profile Enhancement Ideas</h4>
+                                        </div>
+                                        """, unsafe_allow_html=True)
+                                        st.write(profile_suggestions)
+                                        
+                                        # Option to update profile
+                                        if st.button("📝 Go to Profile to Update"):
+                                            st.info("Switch to the 'Your Profile' tab to update your information")
+                                    except:
+                                        pass
+                            
+                            # Download analysis
+                            st.divider()
+                            analysis_text = f"""
+DOCUMENT ANALYSIS REPORT
+========================
+
+Document Type: {analysis.document_type}
+Confidence Score: {analysis.confidence_score:.1%}
+
+EXTRACTED TEXT:
+{analysis.extracted_text}
+
+SUGGESTIONS:
+{analysis.suggestions}
+
+Generated by Opportunity Matching Assistant
+"""
+                            
+                            st.download_button(
+                                label="📥 Download Analysis Report",
+                                data=analysis_text,
+                                file_name=f"document_analysis_{uploaded_file.name}.txt",
+                                mime="text/plain"
+                            )
+                            
+                        except Exception as e:
+                            st.error(f"❌ Error analyzing document: {str(e)}")
+                            st.markdown("""
+                            <div class="warning-card">
+                                <strong>This could be due to:</strong><br>
+                                • Image quality too low<br>
+                                • API key issues<br>
+                                • Unsupported image format<br>
+                                • Network connectivity problems
+                            </div>
+                            """, unsafe_allow_html=True)
+                            
+                            with st.expander("Debug Info"):
+                                st.write(f"Error type: {type(e).__name__}")
+                                st.write(f"Error details: {str(e)}")
+    
+    else:
+        # Instructions when no file uploaded
+        st.markdown("""
+        <div class="info-card">
+            <strong>👆 Upload a document image to get started</strong><br>
+            Supported formats: PNG, JPG, JPEG
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📋 Supported Documents")
+            st.write("**✅ What works well:**")
+            st.write("• CV/Resume (can auto-fill profile)")
+            st.write("• Academic transcripts")
+            st.write("• Certificates and awards")
+            st.write("• Recommendation letters")
+            st.write("• Cover letters")
+        
+        with col2:
+            st.subheader("💡 Tips for Best Results")
+            st.write("**📸 Image Quality:**")
+            st.write("• Use high-quality, clear images")
+            st.write("• Ensure good lighting")
+            st.write("• Avoid shadows or glare")
+            st.write("• Keep text straight and readable")
+            st.write("• Use formats: PNG, JPG, JPEG")
+        
+        st.subheader("🎯 What This Feature Does")
+        st.write("• Extracts all text from your document images")
+        st.write("• Identifies document types automatically")
+        st.write("• Auto-fills profile from CV/Resume")
+        st.write("• Suggests profile enhancements")
+        st.write("• Saves time on manual data entry")
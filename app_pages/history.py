@@ -0,0 +1,193 @@
+"""History: paginated evaluation history with filters"""
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card
+from score_aggregates import STRONG_MATCH
+from app_cache import cached_evaluation_summary
+from user_store import current_user_id
+
+
+def _history_report(profile, user_id, min_score, max_score, opp_type) -> bytes:
+    from app_cache import portfolio_report_pdf
+    from user_store import load_evaluations
+    records = load_evaluations(user_id, order="score_desc", min_score=min_score, max_score=max_score, opp_type=opp_type)
+    return portfolio_report_pdf(profile, [(record['opportunity'], record['result']) for record in records])
+
+
+def render():
+    st.header("Evaluation History")
+    
+    from user_store import load_evaluations, count_evaluations, GOOD_MATCH
+    from enhanced_ui import paginate
+
+    # Running totals stored with the history; nothing is recounted here
+    history_summary = cached_evaluation_summary(current_user_id())
+
+    if not history_summary["total"]:
+        st.markdown("""
+        <div class="info-card">
+            <strong>📊 No Evaluations Yet</strong><br>
+            Go to 'Check Match' to evaluate your first opportunity!
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        # Summary metrics
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            create_metric_card("Total Evaluations", history_summary["total"])
+        
+        with col2:
+            create_metric_card("Average Score", f"{history_summary['avg_score']:.1%}")
+        
+        with col3:
+            create_metric_card("Strong Matches", history_summary["strong"])
+        
+        st.divider()
+
+        # Filters run as indexed queries; only the current page is loaded and rendered
+        fcol1, fcol2, fcol3 = st.columns(3)
+        with fcol1:
+            history_sort = st.selectbox("Sort by", ["Newest first", "Oldest first", "Highest score", "Lowest score"], key="history_sort")
+        with fcol2:
+            history_strength = st.selectbox("Match", ["All", "Strong (70%+)", "Good (50-70%)", "Weak (<50%)"], key="history_strength")
+        with fcol3:
+            history_type = st.selectbox("Type", ["All"] + sorted(history_summary["by_type"]), key="history_type")
+
+        history_order = {
+            "Newest first": "date_desc",
+            "Oldest first": "date",
+            "Highest score": "score_desc",
+            "Lowest score": "score"
+        }[history_sort]
+        min_score, max_score, strength_count = {
+            "All": (None, None, history_summary["total"]),
+            "Strong (70%+)": (STRONG_MATCH, None, history_summary["strong"]),
+            "Good (50-70%)": (GOOD_MATCH, STRONG_MATCH, history_summary["good"]),
+            "Weak (<50%)": (None, GOOD_MATCH, history_summary["weak"])
+        }[history_strength]
+        type_filter = None if history_type == "All" else history_type
+
+        if type_filter is None:
+            filtered_total = strength_count
+        elif history_strength == "All":
+            filtered_total = history_summary["by_type"].get(type_filter, 0)
+        else:
+            filtered_total = count_evaluations(current_user_id(), min_score, max_score, type_filter)
+
+        hcol1, hcol2 = st.columns([3, 1])
+        with hcol1:
+            st.write(f"**{filtered_total} opportunities evaluated:**")
+        with hcol2:
+            # Every record matching the filters, best first; loaded and rendered only when downloaded
+            from functools import partial
+            st.download_button(
+                label="📄 Export Report (PDF)",
+                data=partial(
+                    _history_report,
+                    st.session_state.profile,
+                    current_user_id(),
+                    min_score,
+                    max_score,
+                    type_filter
+                ),
+                file_name="evaluation_history_report.pdf",
+                mime="application/pdf",
+                disabled=not filtered_total or st.session_state.profile is None,
+                use_container_width=True
+            )
+        offset, limit = paginate(filtered_total, key="history")
+        page_records = load_evaluations(
+            current_user_id(),
+            order=history_order,
+            limit=limit,
+            offset=offset,
+            min_score=min_score,
+            max_score=max_score,
+            opp_type=type_filter
+        )
+
+        for record in page_records:
+            i = record['id']
+            score = record['result'].compatibility_score
+
+            # Color-coded header
+            if score >= 0.7:
+                emoji = "🟢"
+                label = "Strong Match"
+                color = "#28a745"
+            elif score >= 0.5:
+                emoji = "🟡"
+                label = "Good Match"
+                color = "#ffc107"
+            else:
+                emoji = "🔴"
+                label = "Weak Match"
+                color = "#dc3545"
+
+            with st.expander(f"{emoji} {record['opportunity'].title} - {score:.1%} ({label})", expanded=False):
+                # Score badge
+                st.markdown(f"""
+                <div style="background: linear-gradient(135deg, {color}22 0%, {color}11 100%);
+                     padding: 15px; border-radius: 10px; border-left: 4px solid {color}; margin-bottom: 15px;">
+                    <h3 style="margin: 0; color: {color};">Match Score: {score:.1%}</h3>
+                    <p style="margin: 5px 0 0 0; opacity: 0.8;">{label}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    st.markdown("**📋 Opportunity Details**")
+                    st.write(f"**Type:** {record['opportunity'].opp_type}")
+                    if record['opportunity'].deadline:
+                        st.write(f"**Deadline:** {record['opportunity'].deadline}")
+                    st.write(f"**Evaluated:** {record['timestamp']}")
+
+                    st.markdown("**💪 Your Strengths:**")
+                    st.write(record['result'].strengths)
+
+                    st.markdown("**⚠️ Gaps to Address:**")
+                    st.write(record['result'].gaps)
+
+                    st.markdown("**💡 Recommendation:**")
+                    st.write(record['result'].recommendation)
+
+                with col2:
+                    st.markdown("**Actions**")
+
+                    # Generate Materials button
+                    if st.button("✍️ Generate Materials", key=f"gen_mat_hist_{i}", use_container_width=True):
+                        st.session_state.selected_opportunity_for_materials = record['opportunity']
+                        if 'opportunity_data' in record:
+                            st.session_state.selected_opportunity_data = record['opportunity_data']
+                        st.success("✅ Go to 'Generate Materials' tab")
+                        st.rerun()
+
+                    # PDF Export
+                    try:
+                        from app_cache import evaluation_pdf
+                        pdf_bytes = evaluation_pdf(
+                            st.session_state.profile,
+                            record['opportunity'],
+                            record['result']
+                        )
+
+                        st.download_button(
+                            label="📄 Export PDF",
+                            data=pdf_bytes,
+                            file_name=f"report_{record['opportunity'].title.replace(' ', '_')}.pdf",
+                            mime="application/pdf",
+                            key=f"pdf_{i}",
+                            use_container_width=True
+                        )
+                    except:
+                        pass
+        
+        # Clear history button
+        st.divider()
+        if st.button("🗑️ Clear All History", type="secondary"):
+            from user_store import clear_evaluations
+            clear_evaluations(current_user_id())
+            st.rerun()
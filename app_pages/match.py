@@ -0,0 +1,898 @@
+"""Check Match: evaluate the profile against one opportunity or the whole database"""
+
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card, create_status_indicator
+from app_metrics import BATCH_ITEMS, BATCH_PENDING, batch_item_done
+from models import Opportunity
+from score_aggregates import ScoreAggregate, STRONG_MATCH, MODERATE_MATCH
+from user_store import current_user_id
+
+
+def render():
+    st.header("Evaluate an Opportunity")
+    
+    if not st.session_state.profile:
+        st.markdown("""
+        <div class="warning-card">
+            <strong>⚠️ Profile Required</strong><br>
+            Please create your profile first in the 'Your Profile' tab to start evaluating opportunities.
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="success-card">
+            <strong>✅ Profile Loaded</strong><br>
+            Ready to evaluate opportunities for: <strong>{st.session_state.profile.name}</strong>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # IMAGE UPLOAD SECTION
+        st.subheader("📸 Upload Opportunity Image (Optional)")
+        st.markdown("Have a photo of a scholarship poster or job announcement? Upload it and we'll extract the details automatically!")
+        
+        uploaded_opportunity_image = st.file_uploader(
+            "Upload opportunity flyer/poster/screenshot",
+            type=['png', 'jpg', 'jpeg'],
+            key="opportunity_image_uploader",
+            help="Upload a clear photo of the opportunity announcement"
+        )
+        
+        if uploaded_opportunity_image is not None:
+            col1, col2 = st.columns([1, 1])
+            
+            with col1:
+                st.image(uploaded_opportunity_image, caption="Uploaded Opportunity Image", use_container_width=True)
+            
+            with col2:
+                if st.button("🔍 Extract Opportunity Details", type="primary", key="extract_opp_btn"):
+                    # Check for Gemini API key
+                    gemini_key = os.getenv("GEMINI_API_KEY")
+                    if not gemini_key and hasattr(st, 'secrets'):
+                        gemini_key = st.secrets.get("GEMINI_API_KEY")
+                    
+                    if not gemini_key:
+                        st.error("⚠️ Gemini API key not found")
+                        st.markdown("""
+                        <div class="warning-card">
+                            <strong>Setup Required:</strong><br>
+                            • Get API key from: https://aistudio.google.com/apikey<br>
+                            • Add GEMINI_API_KEY to your .env file<br>
+                            • Or add to Streamlit secrets for deployment
+                        </div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        with st.spinner("🤖 Analyzing image with AI... This may take 10-15 seconds"):
+                            try:
+                                from opportunity_image_extractor import extract_opportunity_from_image
+                                
+                                image_bytes = uploaded_opportunity_image.getvalue()
+                                extracted = extract_opportunity_from_image(image_bytes, user_id=current_user_id())
+                                
+                                if extracted:
+                                    st.success("✅ Successfully extracted opportunity details!")
+                                    
+                                    # Store in session state
+                                    st.session_state.extracted_opportunity_data = extracted
+                                    
+                                    # Show what was extracted
+                                    with st.expander("📋 Extracted Information", expanded=True):
+                                        st.json(extracted)
+                                    
+                                    st.info("👇 The form below has been pre-filled with extracted data. Review and edit before evaluating.")
+                                    st.rerun()
+                                else:
+                                    st.error("❌ Could not extract opportunity details from this image")
+                                    st.warning("Please ensure the image is clear and contains opportunity information (scholarship, job, program announcement)")
+                                    
+                            except Exception as e:
+                                st.error(f"❌ Error: {str(e)}")
+                                with st.expander("Debug Info"):
+                                    st.write(f"Error type: {type(e).__name__}")
+                                    st.write(f"Error details: {str(e)}")
+        
+        st.divider()
+        
+        # Get pre-fill data from extracted image
+        prefill = st.session_state.extracted_opportunity_data
+        
+        if prefill:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.success("📸 Form pre-filled from image extraction. Review and edit as needed below.")
+            with col2:
+                if st.button("🗑️ Clear Pre-fill", key="clear_prefill_top"):
+                    st.session_state.extracted_opportunity_data = {}
+                    st.rerun()
+        
+        # OPPORTUNITY FORM (with prefill support)
+        with st.form("opportunity_form"):
+            # Opportunity Details
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                opp_title = st.text_input(
+                    "Opportunity Title*",
+                    value=prefill.get('title', ''),
+                    placeholder="e.g., Fulbright Scholarship, Data Analyst Position, Master's Program"
+                )
+            
+            with col2:
+                # Get type index for selectbox
+                type_options = ["Scholarship", "Job", "Academic Program", "Fellowship", "Internship", "Other"]
+                default_type = prefill.get('type', 'Scholarship')
+                type_index = type_options.index(default_type) if default_type in type_options else 0
+                
+                opp_type = st.selectbox(
+                    "Type*",
+                    type_options,
+                    index=type_index
+                )
+            
+            opp_description = st.text_area(
+                "Description*",
+                value=prefill.get('description', ''),
+                height=150,
+                placeholder="Paste the full opportunity description here...",
+                help="Copy and paste the complete description from the opportunity posting"
+            )
+            
+            opp_requirements = st.text_area(
+                "Requirements*",
+                value=prefill.get('requirements', ''),
+                height=150,
+                placeholder="Paste eligibility criteria and requirements here...",
+                help="Copy and paste the requirements, qualifications, and eligibility criteria"
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                opp_deadline = st.text_input(
+                    "Deadline (optional)",
+                    value=prefill.get('deadline', '') if prefill.get('deadline') and prefill.get('deadline') != 'null' else '',
+                    placeholder="e.g., 2024-12-31 or March 15, 2024"
+                )
+            
+            with col2:
+                # Show additional extracted info if available (read-only display)
+                if prefill.get('provider'):
+                    st.text_input("Provider (extracted)", value=prefill['provider'], disabled=True, help="Organization offering this opportunity")
+            
+            # Show funding and location if extracted
+            if prefill.get('funding') or prefill.get('location'):
+                col1, col2 = st.columns(2)
+                if prefill.get('funding') and prefill.get('funding') != 'null':
+                    with col1:
+                        st.text_input("Funding/Salary (extracted)", value=prefill['funding'], disabled=True)
+                if prefill.get('location') and prefill.get('location') != 'null':
+                    with col2:
+                        st.text_input("Location (extracted)", value=prefill['location'], disabled=True)
+            
+            if prefill.get('link') and prefill.get('link') != 'null':
+                st.text_input("Application Link (extracted)", value=prefill['link'], disabled=True)
+            
+            # Submit button - ONLY this button in the form
+            evaluate = st.form_submit_button("🔍 Evaluate Match", use_container_width=True)
+        
+        # Handle form submission - OUTSIDE the form
+        if evaluate:
+            if not opp_title or not opp_description or not opp_requirements:
+                st.error("Please fill all required fields marked with *")
+            else:
+                # Create opportunity object
+                opportunity = Opportunity(
+                    title=opp_title,
+                    opp_type=opp_type,
+                    description=opp_description,
+                    requirements=opp_requirements,
+                    deadline=opp_deadline if opp_deadline else None
+                )
+                
+                # Check if API key is available
+                api_key = os.environ.get('OPENAI_API_KEY')
+                if not api_key:
+                    st.error("OpenAI API key not found. Please check your configuration.")
+                    st.markdown("""
+                    <div class="warning-card">
+                        <strong>Setup Required:</strong><br>
+                        • Make sure you have set up your OPENAI_API_KEY in your .env file<br>
+                        • For Streamlit Cloud: Add the key to your app secrets<br>
+                        • Verify your OpenAI account has credits
+                    </div>
+                    """, unsafe_allow_html=True)
+                elif not api_key.startswith(('sk-', 'sk-proj-')):
+                    st.error("Invalid API key format. Please check your OpenAI API key.")
+                else:
+                    # AI Evaluation
+                    with st.spinner("🤖 Analyzing match with AI... This may take a few seconds."):
+                        try:
+                            from ai_evaluator import evaluate_match
+                            result = evaluate_match(st.session_state.profile, opportunity)
+                            
+                            # Check if we got a valid result
+                            if result.compatibility_score == 0.0 and "Error" in result.strengths:
+                                st.error("❌ Evaluation failed - API key issue detected")
+                                st.markdown("""
+                                <div class="warning-card">
+                                    <strong>API Key Problem:</strong><br>
+                                    • Go to https://platform.openai.com/api-keys<br>
+                                    • Create a new API key<br>
+                                    • Make sure your account has credits<br>
+                                    • Update your .env file or Streamlit secrets
+                                </div>
+                                """, unsafe_allow_html=True)
+                            else:
+                                # OPTIMIZED ANALYTICS-STYLE RESULTS DISPLAY (Same as Check Match tab)
+                                st.balloons()
+
+                                # Header with opportunity title
+                                st.markdown(f"""
+                                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                                            padding: 25px; border-radius: 15px; margin-bottom: 20px;">
+                                    <h2 style="color: white; margin: 0; text-align: center;">
+                                        📊 Match Analysis Complete
+                                    </h2>
+                                    <p style="color: rgba(255,255,255,0.9); text-align: center; margin: 10px 0 0 0; font-size: 18px;">
+                                        {opportunity.title}
+                                    </p>
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                                # KEY METRICS ROW with enhanced design
+                                col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+
+                                with col_m1:
+                                    score_color = "#4CAF50" if result.compatibility_score >= 0.7 else "#FF9800" if result.compatibility_score >= 0.4 else "#F44336"
+                                    st.markdown(f"""
+                                    <div style="background: white; padding: 20px; border-radius: 12px;
+                                                border-left: 5px solid {score_color}; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                        <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Match Score</p>
+                                        <h2 style="color: {score_color}; margin: 5px 0; font-size: 36px; font-weight: bold;">{result.compatibility_score:.0%}</h2>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+
+                                with col_m2:
+                                    match_label = "Strong" if result.compatibility_score >= 0.7 else "Moderate" if result.compatibility_score >= 0.4 else "Weak"
+                                    match_emoji = "🟢" if result.compatibility_score >= 0.7 else "🟡" if result.compatibility_score >= 0.4 else "🔴"
+                                    st.markdown(f"""
+                                    <div style="background: white; padding: 20px; border-radius: 12px;
+                                                box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                        <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Match Level</p>
+                                        <h3 style="color: #333; margin: 5px 0; font-size: 24px;">{match_emoji} {match_label}</h3>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+
+                                with col_m3:
+                                    st.markdown(f"""
+                                    <div style="background: white; padding: 20px; border-radius: 12px;
+                                                box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                        <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Type</p>
+                                        <h3 style="color: #333; margin: 5px 0; font-size: 20px;">🎓 {opportunity.opp_type}</h3>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+
+                                with col_m4:
+                                    provider_name = prefill.get('provider', 'N/A') if prefill and prefill.get('provider') != 'null' else 'N/A'
+                                    st.markdown(f"""
+                                    <div style="background: white; padding: 20px; border-radius: 12px;
+                                                box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                        <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Provider</p>
+                                        <h3 style="color: #333; margin: 5px 0; font-size: 18px;">🏛️ {provider_name[:20]}</h3>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+
+                                st.markdown("<br>", unsafe_allow_html=True)
+
+                                # DETAILED ANALYSIS SECTION with tabs
+                                analysis_tab1, analysis_tab2, analysis_tab3 = st.tabs(["💪 Strengths", "⚠️ Gaps", "💡 Recommendation"])
+
+                                with analysis_tab1:
+                                    st.markdown("""
+                                    <div style="background: linear-gradient(135deg, #667eea22 0%, #764ba222 100%);
+                                                padding: 25px; border-radius: 12px; margin: 15px 0;">
+                                    """, unsafe_allow_html=True)
+                                    st.markdown("#### What Makes You a Great Candidate")
+                                    st.write(result.strengths)
+                                    st.markdown("</div>", unsafe_allow_html=True)
+
+                                with analysis_tab2:
+                                    st.markdown("""
+                                    <div style="background: #fff3cd; padding: 25px; border-radius: 12px;
+                                                border-left: 4px solid #ffc107; margin: 15px 0;">
+                                    """, unsafe_allow_html=True)
+                                    st.markdown("#### Areas for Improvement")
+                                    st.write(result.gaps)
+                                    st.markdown("</div>", unsafe_allow_html=True)
+
+                                with analysis_tab3:
+                                    st.markdown("""
+                                    <div style="background: #d1ecf1; padding: 25px; border-radius: 12px;
+                                                border-left: 4px solid #0dcaf0; margin: 15px 0;">
+                                    """, unsafe_allow_html=True)
+                                    st.markdown("#### Expert Recommendation")
+                                    st.write(result.recommendation)
+
+                                    st.markdown("#### 📝 Action Steps")
+                                    if result.compatibility_score >= 0.6:
+                                        st.markdown("""
+                                        - ✅ **High Priority**: Start preparing your application materials
+                                        - 📚 **Research**: Deep dive into the organization/program
+                                        - 🔧 **Optimize**: Address the gaps mentioned above
+                                        - ⏰ **Timeline**: Begin application process immediately
+                                        """)
+                                    else:
+                                        st.markdown("""
+                                        - 📚 **Skill Development**: Strengthen your profile in identified areas
+                                        - 🔍 **Alternative Search**: Look for opportunities that better match your profile
+                                        - 💪 **Profile Enhancement**: Focus on closing critical gaps
+                                        - ⏳ **Future Consideration**: Revisit this opportunity after improvements
+                                        """)
+                                    st.markdown("</div>", unsafe_allow_html=True)
+
+                                # AUTOMATICALLY SAVE TO HISTORY
+                                evaluation_record = {
+                                    "timestamp": datetime.now().isoformat(),
+                                    "opportunity": opportunity,
+                                    "opportunity_title": opportunity.title,
+                                    "opportunity_type": opportunity.opp_type,
+                                    "opportunity_data": {
+                                        "title": opportunity.title,
+                                        "type": opportunity.opp_type,
+                                        "description": opportunity.description,
+                                        "requirements": opportunity.requirements,
+                                        "deadline": opportunity.deadline,
+                                        "provider": prefill.get('provider') if prefill and prefill.get('provider') != 'null' else None,
+                                        "funding": prefill.get('funding') if prefill and prefill.get('funding') != 'null' else None,
+                                        "link": prefill.get('link') if prefill and prefill.get('link') != 'null' else None
+                                    },
+                                    "score": result.compatibility_score,
+                                    "result": result
+                                }
+
+                                # Append to the user's history (one row; duplicates by title are ignored)
+                                from user_store import add_evaluation
+                                add_evaluation(current_user_id(), evaluation_record)
+
+                                # ACTION BUTTONS with enhanced design
+                                st.markdown("<br>", unsafe_allow_html=True)
+                                st.markdown("### 🚀 Next Actions")
+
+                                col_act1, col_act2 = st.columns(2)
+
+                                with col_act1:
+                                    if prefill and prefill.get('link') and prefill.get('link') != 'null':
+                                        st.markdown(f"""
+                                        <a href="{prefill.get('link')}" target="_blank" style="text-decoration: none;">
+                                            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                                                        color: white; padding: 15px; border-radius: 10px;
+                                                        text-align: center; cursor: pointer; box-shadow: 0 4px 12px rgba(102,126,234,0.4);">
+                                                🔗 <strong>Apply Now</strong>
+                                            </div>
+                                        </a>
+                                        """, unsafe_allow_html=True)
+                                    else:
+                                        st.info("No application link available")
+
+                                with col_act2:
+                                    if st.button("✍️ Generate Application Materials", use_container_width=True, type="primary", key="gen_mat_image_extracted"):
+                                        st.session_state.selected_opportunity_for_materials = opportunity
+                                        st.session_state.selected_opportunity_data = evaluation_record["opportunity_data"]
+                                        st.success("✅ Materials ready! Go to 'Generate Materials' tab")
+                                        st.info("👉 Click on 'Generate Materials' tab above")
+
+                                # Additional action buttons
+                                col_act3, col_act4 = st.columns(2)
+
+                                with col_act3:
+                                    # Save opportunity to database
+                                    if st.button("🗄️ Save to Database", key="save_db_btn_image", use_container_width=True, help="Save this opportunity for future use"):
+                                        try:
+                                            from opportunities_storage import save_opportunity
+
+                                            opp_data = {
+                                                "title": opportunity.title,
+                                                "type": opportunity.opp_type,
+                                                "description": opportunity.description,
+                                                "requirements": opportunity.requirements,
+                                                "deadline": opportunity.deadline,
+                                                "provider": prefill.get('provider') if prefill and prefill.get('provider') != 'null' else None,
+                                                "funding": prefill.get('funding') if prefill and prefill.get('funding') != 'null' else None,
+                                                "link": prefill.get('link') if prefill and prefill.get('link') != 'null' else None
+                                            }
+
+                                            if save_opportunity(opp_data):
+                                                st.success("✅ Saved to database!")
+                                                st.info("👉 View in 'Opportunity Database' tab")
+                                            else:
+                                                st.error("Failed to save to database")
+                                        except Exception as e:
+                                            st.error(f"Error saving: {str(e)}")
+
+                                with col_act4:
+                                    # Download PDF option
+                                    try:
+                                        from app_cache import evaluation_pdf
+                                        pdf_bytes = evaluation_pdf(st.session_state.profile, opportunity, result)
+
+                                        st.download_button(
+                                            label="📄 Download PDF Report",
+                                            data=pdf_bytes,
+                                            file_name=f"evaluation_{opportunity.title.replace(' ', '_')}.pdf",
+                                            mime="application/pdf",
+                                            help="Download a professional PDF report",
+                                            use_container_width=True
+                                        )
+                                    except Exception as e:
+                                        st.button(
+                                            "📄 Download PDF Report",
+                                            disabled=True,
+                                            help="PDF export requires reportlab library",
+                                            use_container_width=True
+                                        )
+
+                        except Exception as e:
+                            st.error(f"❌ Error during evaluation: {str(e)}")
+                            
+                            # Detailed error information
+                            if "401" in str(e) or "invalid_api_key" in str(e):
+                                st.markdown("""
+                                <div class="warning-card">
+                                    <strong>🔑 API Key Issue:</strong><br>
+                                    • Your OpenAI API key is invalid or expired<br>
+                                    • Go to https://platform.openai.com/api-keys<br>
+                                    • Generate a new key and update your configuration<br>
+                                    • Make sure your account has billing set up
+                                </div>
+                                """, unsafe_allow_html=True)
+                            elif "insufficient_quota" in str(e):
+                                st.markdown("""
+                                <div class="warning-card">
+                                    <strong>💳 Billing Issue:</strong><br>
+                                    • Your OpenAI account is out of credits<br>
+                                    • Go to https://platform.openai.com/account/billing<br>
+                                    • Add credits to your account<br>
+                                    • Wait a few minutes for the credits to activate
+                                </div>
+                                """, unsafe_allow_html=True)
+                            else:
+                                st.markdown("""
+                                <div class="warning-card">
+                                    <strong>🔧 Technical Issue:</strong><br>
+                                    • Network connectivity problems<br>
+                                    • API service temporarily unavailable<br>
+                                    • Rate limits exceeded (wait a minute and try again)<br>
+                                    • Invalid request format
+                                </div>
+                                """, unsafe_allow_html=True)
+                            
+                            # Debug information
+                            with st.expander("🐛 Debug Information", expanded=False):
+                                st.write(f"Error type: {type(e).__name__}")
+                                st.write(f"Error message: {str(e)}")
+                                st.write(f"API key status: {'Set' if api_key else 'Not set'}")
+                                st.write(f"API key format: {'Valid' if api_key and api_key.startswith(('sk-', 'sk-proj-')) else 'Invalid'}")
+        
+        # Quick API test section (for debugging)
+        if st.session_state.profile:
+            with st.expander("🔧 API Connection Test", expanded=False):
+                st.write("Use this to test if your OpenAI API key is working:")
+                
+                if st.button("Test API Connection", key="test_api_btn"):
+                    api_key = os.environ.get('OPENAI_API_KEY')
+                    if not api_key:
+                        st.error("No API key found")
+                    else:
+                        try:
+                            from app_cache import get_llm
+                            llm = get_llm(temperature=0, call_site="match.api_test")
+                            response = llm.invoke("Respond with exactly: 'API test successful'")
+                            st.success(f"✅ API Working: {response.content}")
+                        except Exception as e:
+                            st.error(f"❌ API Test Failed: {str(e)}")
+
+        # SPECIFIC SCHOLARSHIP MATCHING
+        st.divider()
+        st.header("🎯 Match with Specific Scholarship")
+        st.markdown("Select a specific scholarship from the database to evaluate your match.")
+
+        # Load all opportunities for selection
+        from opportunities_storage import list_opportunities
+        all_opps_for_selection = list_opportunities()
+
+        if all_opps_for_selection:
+            # Create a selectbox with scholarship titles
+            scholarship_titles = [f"{opp.get('title', 'Untitled')} - {opp.get('provider', 'N/A')}" for opp in all_opps_for_selection]
+
+            selected_scholarship_idx = st.selectbox(
+                "Choose a scholarship to evaluate:",
+                range(len(scholarship_titles)),
+                format_func=lambda i: scholarship_titles[i],
+                help="Select a scholarship from the database"
+            )
+
+            col_spec1, col_spec2 = st.columns([2, 1])
+            with col_spec1:
+                selected_opp_data = all_opps_for_selection[selected_scholarship_idx]
+                st.markdown(f"""
+                **Type:** {selected_opp_data.get('type', 'Scholarship')}
+                **Provider:** {selected_opp_data.get('provider', 'N/A')}
+                **Deadline:** {selected_opp_data.get('deadline', 'N/A')}
+                **Funding:** {selected_opp_data.get('funding', 'N/A')}
+                """)
+
+                from eligibility import check_eligibility, record_constraints
+                ineligible_reasons = check_eligibility(st.session_state.profile, record_constraints(selected_opp_data))
+                if ineligible_reasons:
+                    st.warning("🚫 You may not be eligible: " + "; ".join(ineligible_reasons))
+
+                with st.expander("📄 View Full Details"):
+                    st.write(f"**Description:** {selected_opp_data.get('description', 'N/A')}")
+                    st.write(f"**Requirements:** {selected_opp_data.get('requirements', 'N/A')}")
+                    if selected_opp_data.get('link'):
+                        st.markdown(f"[🔗 Application Link]({selected_opp_data.get('link')})")
+
+            with col_spec2:
+                if st.button("🔍 Evaluate This Scholarship", type="primary", use_container_width=True, key="eval_specific"):
+                    with st.spinner("Evaluating match..."):
+                        try:
+                            # Create Opportunity object
+                            opportunity = Opportunity(
+                                title=selected_opp_data.get('title', ''),
+                                opp_type=selected_opp_data.get('type', 'Scholarship'),
+                                description=selected_opp_data.get('description', ''),
+                                requirements=selected_opp_data.get('requirements', ''),
+                                deadline=selected_opp_data.get('deadline'),
+                                digest=selected_opp_data.get('digest')
+                            )
+
+                            # Evaluate match
+                            from ai_evaluator import evaluate_match
+                            result = evaluate_match(st.session_state.profile, opportunity)
+
+                            # OPTIMIZED ANALYTICS-STYLE RESULTS DISPLAY
+                            st.balloons()
+
+                            # Header with scholarship title
+                            st.markdown(f"""
+                            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                                        padding: 25px; border-radius: 15px; margin-bottom: 20px;">
+                                <h2 style="color: white; margin: 0; text-align: center;">
+                                    📊 Match Analysis Complete
+                                </h2>
+                                <p style="color: rgba(255,255,255,0.9); text-align: center; margin: 10px 0 0 0; font-size: 18px;">
+                                    {selected_opp_data.get('title', 'Scholarship')}
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                            # KEY METRICS ROW with enhanced design
+                            col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+
+                            with col_m1:
+                                score_color = "#4CAF50" if result.compatibility_score >= 0.7 else "#FF9800" if result.compatibility_score >= 0.4 else "#F44336"
+                                st.markdown(f"""
+                                <div style="background: white; padding: 20px; border-radius: 12px;
+                                            border-left: 5px solid {score_color}; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                    <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Match Score</p>
+                                    <h2 style="color: {score_color}; margin: 5px 0; font-size: 36px; font-weight: bold;">{result.compatibility_score:.0%}</h2>
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                            with col_m2:
+                                match_label = "Strong" if result.compatibility_score >= 0.7 else "Moderate" if result.compatibility_score >= 0.4 else "Weak"
+                                match_emoji = "🟢" if result.compatibility_score >= 0.7 else "🟡" if result.compatibility_score >= 0.4 else "🔴"
+                                st.markdown(f"""
+                                <div style="background: white; padding: 20px; border-radius: 12px;
+                                            box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                    <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Match Level</p>
+                                    <h3 style="color: #333; margin: 5px 0; font-size: 24px;">{match_emoji} {match_label}</h3>
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                            with col_m3:
+                                st.markdown(f"""
+                                <div style="background: white; padding: 20px; border-radius: 12px;
+                                            box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                    <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Type</p>
+                                    <h3 style="color: #333; margin: 5px 0; font-size: 20px;">🎓 {selected_opp_data.get('type', 'N/A')}</h3>
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                            with col_m4:
+                                st.markdown(f"""
+                                <div style="background: white; padding: 20px; border-radius: 12px;
+                                            box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                                    <p style="color: #666; margin: 0; font-size: 12px; text-transform: uppercase; letter-spacing: 1px;">Provider</p>
+                                    <h3 style="color: #333; margin: 5px 0; font-size: 18px;">🏛️ {selected_opp_data.get('provider', 'N/A')[:20]}</h3>
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                            st.markdown("<br>", unsafe_allow_html=True)
+
+                            # DETAILED ANALYSIS SECTION with tabs
+                            analysis_tab1, analysis_tab2, analysis_tab3 = st.tabs(["💪 Strengths", "⚠️ Gaps", "💡 Recommendation"])
+
+                            with analysis_tab1:
+                                st.markdown("""
+                                <div style="background: linear-gradient(135deg, #667eea22 0%, #764ba222 100%);
+                                            padding: 25px; border-radius: 12px; margin: 15px 0;">
+                                """, unsafe_allow_html=True)
+                                st.markdown("#### What Makes You a Great Candidate")
+                                st.write(result.strengths)
+                                st.markdown("</div>", unsafe_allow_html=True)
+
+                            with analysis_tab2:
+                                st.markdown("""
+                                <div style="background: #fff3cd; padding: 25px; border-radius: 12px;
+                                            border-left: 4px solid #ffc107; margin: 15px 0;">
+                                """, unsafe_allow_html=True)
+                                st.markdown("#### Areas for Improvement")
+                                st.write(result.gaps)
+                                st.markdown("</div>", unsafe_allow_html=True)
+
+                            with analysis_tab3:
+                                st.markdown("""
+                                <div style="background: #d1ecf1; padding: 25px; border-radius: 12px;
+                                            border-left: 4px solid #0dcaf0; margin: 15px 0;">
+                                """, unsafe_allow_html=True)
+                                st.markdown("#### Expert Recommendation")
+                                st.write(result.recommendation)
+
+                                st.markdown("#### 📝 Action Steps")
+                                if result.compatibility_score >= 0.6:
+                                    st.markdown("""
+                                    - ✅ **High Priority**: Start preparing your application materials
+                                    - 📚 **Research**: Deep dive into the organization/program
+                                    - 🔧 **Optimize**: Address the gaps mentioned above
+                                    - ⏰ **Timeline**: Begin application process immediately
+                                    """)
+                                else:
+                                    st.markdown("""
+                                    - 📚 **Skill Development**: Strengthen your profile in identified areas
+                                    - 🔍 **Alternative Search**: Look for opportunities that better match your profile
+                                    - 💪 **Profile Enhancement**: Focus on closing critical gaps
+                                    - ⏳ **Future Consideration**: Revisit this opportunity after improvements
+                                    """)
+                                st.markdown("</div>", unsafe_allow_html=True)
+
+                            # AUTOMATICALLY SAVE TO HISTORY
+                            evaluation_record = {
+                                "timestamp": datetime.now().isoformat(),
+                                "opportunity": opportunity,
+                                "opportunity_title": opportunity.title,
+                                "opportunity_type": opportunity.opp_type,
+                                "opportunity_data": selected_opp_data,
+                                "score": result.compatibility_score,
+                                "result": result
+                            }
+
+                            # Append to the user's history (one row; duplicates by title are ignored)
+                            from user_store import add_evaluation
+                            add_evaluation(current_user_id(), evaluation_record)
+
+                            # ACTION BUTTONS with enhanced design
+                            st.markdown("<br>", unsafe_allow_html=True)
+                            st.markdown("### 🚀 Next Actions")
+
+                            col_act1, col_act2 = st.columns(2)
+
+                            with col_act1:
+                                if selected_opp_data.get('link'):
+                                    st.markdown(f"""
+                                    <a href="{selected_opp_data.get('link')}" target="_blank" style="text-decoration: none;">
+                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                                                    color: white; padding: 15px; border-radius: 10px;
+                                                    text-align: center; cursor: pointer; box-shadow: 0 4px 12px rgba(102,126,234,0.4);">
+                                            🔗 <strong>Apply Now</strong>
+                                        </div>
+                                    </a>
+                                    """, unsafe_allow_html=True)
+                                else:
+                                    st.info("No application link available")
+
+                            with col_act2:
+                                if st.button("✍️ Generate Application Materials", use_container_width=True, type="primary", key="gen_mat_specific"):
+                                    st.session_state.selected_opportunity_for_materials = opportunity
+                                    st.session_state.selected_opportunity_data = selected_opp_data
+                                    st.success("✅ Materials ready! Go to 'Generate Materials' tab")
+                                    st.info("👉 Click on 'Generate Materials' tab above")
+
+                        except Exception as e:
+                            st.error(f"Error evaluating scholarship: {str(e)}")
+        else:
+            st.warning("⚠️ No scholarships found in database. Add scholarships first in the 'Opportunity Database' tab.")
+
+        # BATCH MATCHING SECTION - Match against all scholarships in database
+        st.divider()
+        st.divider()
+        st.header("🎯 Batch Match - Evaluate All Scholarships")
+        st.markdown("Automatically evaluate your profile against **all scholarships** in the database and find your best matches!")
+
+        col_batch1, col_batch2 = st.columns([2, 1])
+        with col_batch1:
+            st.info("💡 This will run AI evaluation for each scholarship in the database and show results sorted by compatibility score.")
+
+        with col_batch2:
+            if st.button("🚀 Match Against All Scholarships", type="primary", use_container_width=True):
+                # Load all opportunities from database
+                from opportunities_storage import ineligible_opportunities, list_opportunities
+                all_opportunities = list_opportunities()
+
+                # Hard requirements the profile clearly fails are settled without a model call
+                ineligible = ineligible_opportunities(st.session_state.profile)
+                skipped_opportunities = [opp for opp in all_opportunities if opp.get('id') in ineligible]
+                all_opportunities = [opp for opp in all_opportunities if opp.get('id') not in ineligible]
+                BATCH_ITEMS.labels("batch_match", "ineligible").inc(len(skipped_opportunities))
+
+                if skipped_opportunities:
+                    with st.expander(f"🚫 Skipped {len(skipped_opportunities)} scholarships you're not eligible for"):
+                        for opp_data in skipped_opportunities:
+                            st.markdown(f"**{opp_data.get('title', 'Untitled')}**: {'; '.join(ineligible[opp_data.get('id')])}")
+
+                if not all_opportunities:
+                    if skipped_opportunities:
+                        st.warning("⚠️ None of the scholarships in the database match your eligibility. Check the skipped list above.")
+                    else:
+                        st.warning("⚠️ No scholarships found in database. Add some scholarships first!")
+                else:
+                    skipped_note = f" ({len(skipped_opportunities)} skipped as ineligible)" if skipped_opportunities else ""
+                    st.markdown(f"""
+                    <div class="info-card">
+                        <strong>📊 Batch Evaluation Started</strong><br>
+                        Evaluating against {len(all_opportunities)} scholarships{skipped_note}...
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    # Progress bar
+                    progress_bar = st.progress(0)
+                    status_text = st.empty()
+
+                    batch_results = []
+                    batch_totals = ScoreAggregate()
+
+                    # Evaluate each opportunity
+                    BATCH_PENDING.labels("batch_match").inc(len(all_opportunities))
+                    for idx, opp_data in enumerate(all_opportunities):
+                        status_text.text(f"Evaluating: {opp_data.get('title', 'Unknown')} ({idx + 1}/{len(all_opportunities)})")
+
+                        try:
+                            # Create Opportunity object
+                            opportunity = Opportunity(
+                                title=opp_data.get('title', ''),
+                                opp_type=opp_data.get('type', 'Scholarship'),
+                                description=opp_data.get('description', ''),
+                                requirements=opp_data.get('requirements', ''),
+                                deadline=opp_data.get('deadline'),
+                                digest=opp_data.get('digest')
+                            )
+
+                            # Evaluate match
+                            from ai_evaluator import evaluate_match
+                            result = evaluate_match(st.session_state.profile, opportunity)
+
+                            # Store result
+                            batch_results.append({
+                                'opportunity': opportunity,
+                                'result': result,
+                                'opp_data': opp_data,
+                                'score': result.compatibility_score
+                            })
+                            batch_totals.add(result.compatibility_score, opportunity.opp_type)
+                            batch_item_done("batch_match", True)
+
+                        except Exception as e:
+                            batch_item_done("batch_match", False)
+                            st.warning(f"⚠️ Skipped {opp_data.get('title')}: {str(e)}")
+
+                        # Update progress
+                        progress_bar.progress((idx + 1) / len(all_opportunities))
+
+                    status_text.empty()
+                    progress_bar.empty()
+
+                    # Sort by compatibility score (highest first)
+                    batch_results.sort(key=lambda x: x['score'], reverse=True)
+
+                    # Display results
+                    st.success(f"✅ Batch evaluation complete! Evaluated {len(batch_results)} scholarships.")
+
+                    st.markdown("---")
+                    st.subheader("📊 Results - Best Matches First")
+
+                    # Summary metrics
+                    if batch_results:
+                        col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+
+                        # Totals were accumulated as each result arrived
+                        high_matches = batch_totals.count_at_least(STRONG_MATCH)
+                        medium_matches = batch_totals.count_between(MODERATE_MATCH, STRONG_MATCH)
+                        avg_score = batch_totals.avg_score
+
+                        with col_m1:
+                            create_metric_card("Total Evaluated", str(len(batch_results)))
+                        with col_m2:
+                            create_metric_card("Strong Matches", f"{high_matches} (≥70%)", help_text="Compatibility ≥ 70%")
+                        with col_m3:
+                            create_metric_card("Moderate Matches", f"{medium_matches} (40-69%)", help_text="Compatibility 40-69%")
+                        with col_m4:
+                            create_metric_card("Average Score", f"{avg_score:.1%}")
+
+                        # Built only if downloaded, on a separate thread, so the results show immediately
+                        from functools import partial
+                        from app_cache import portfolio_report_pdf
+                        st.download_button(
+                            label="📄 Download Full Report (PDF)",
+                            data=partial(
+                                portfolio_report_pdf,
+                                st.session_state.profile,
+                                [(item['opportunity'], item['result']) for item in batch_results]
+                            ),
+                            file_name=f"batch_match_report_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
+
+                    st.markdown("---")
+
+                    # Display each result
+                    for idx, item in enumerate(batch_results, 1):
+                        opportunity = item['opportunity']
+                        result = item['result']
+                        opp_data = item['opp_data']
+                        score = item['score']
+
+                        # Color-coded expander based on score
+                        if score >= 0.7:
+                            emoji = "🟢"
+                            label = "Strong Match"
+                        elif score >= 0.4:
+                            emoji = "🟡"
+                            label = "Moderate Match"
+                        else:
+                            emoji = "🔴"
+                            label = "Weak Match"
+
+                        with st.expander(f"{emoji} #{idx} - {opportunity.title} - **{score:.1%}** ({label})", expanded=(idx <= 3)):
+                            col_r1, col_r2 = st.columns([2, 1])
+
+                            with col_r1:
+                                st.markdown(f"**Type:** {opportunity.opp_type}")
+                                st.markdown(f"**Provider:** {opp_data.get('provider', 'N/A')}")
+                                st.markdown(f"**Deadline:** {opp_data.get('deadline', 'N/A')}")
+                                st.markdown(f"**Funding:** {opp_data.get('funding', 'N/A')}")
+
+                                with st.expander("📄 Full Description"):
+                                    st.write(opportunity.description)
+
+                                with st.expander("📋 Requirements"):
+                                    st.write(opportunity.requirements)
+
+                            with col_r2:
+                                st.markdown(f"### {score:.1%}")
+                                st.markdown(create_status_indicator(score), unsafe_allow_html=True)
+
+                            # Evaluation details
+                            st.markdown("**💪 Your Strengths:**")
+                            st.write(result.strengths)
+
+                            st.markdown("**⚠️ Gaps to Address:**")
+                            st.write(result.gaps)
+
+                            st.markdown("**💡 Recommendation:**")
+                            st.write(result.recommendation)
+
+                            # Action buttons
+                            col_a1, col_a2 = st.columns(2)
+                            with col_a1:
+                                if opp_data.get('link'):
+                                    st.markdown(f"[🔗 Apply Here]({opp_data.get('link')})")
+
+                            with col_a2:
+                                if st.button(f"✍️ Generate Materials", key=f"gen_mat_{idx}"):
+                                    st.session_state.selected_opportunity_for_materials = opportunity
+                                    st.session_state.selected_opportunity_data = opp_data
+                                    st.success("✅ Opportunity loaded! Go to 'Generate Materials' tab")
+                                    st.rerun()
@@ -0,0 +1,321 @@
+"""Generate Materials: cover letters, statements and emails for an opportunity"""
+
+import streamlit as st
+
+from app_cache import cached_evaluation_rows
+from enhanced_ui import create_metric_card
+from user_store import current_user_id, load_evaluations_by_id
+
+
+def _load_record(row):
+    """Full evaluation record for a row of cached_evaluation_rows"""
+    records = load_evaluations_by_id(current_user_id(), [row["id"]])
+    return records[0] if records else None
+
+
+def render():
+    st.header("Generate Application Materials")
+    
+    if not st.session_state.profile:
+        st.markdown("""
+        <div class="warning-card">
+            <strong>⚠️ Profile Required</strong><br>
+            Please create your profile first in the 'Your Profile' tab.
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="info-card">
+            <strong>✍️ Material Generator Ready</strong><br>
+            Generating personalized materials for: <strong>{st.session_state.profile.name}</strong>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Lightweight history rows; full records are loaded only for what gets selected
+        history = cached_evaluation_rows(current_user_id())
+
+        # Debug info
+        st.write("**Debug Info:**")
+        st.write(f"- Selected opportunity: {st.session_state.selected_opportunity_for_materials is not None}")
+        st.write(f"- History count: {len(history)}")
+
+        # Check if opportunity was selected from batch match
+        has_selected_opp = st.session_state.selected_opportunity_for_materials is not None
+        has_selected_opp_data = 'selected_opportunity_data' in st.session_state and st.session_state.selected_opportunity_data
+
+        if has_selected_opp:
+            st.markdown(f"""
+            <div class="success-card">
+                <strong>✅ Auto-filled from selected opportunity</strong><br>
+                {st.session_state.selected_opportunity_for_materials.title}
+            </div>
+            """, unsafe_allow_html=True)
+
+            # Show additional details if available
+            if has_selected_opp_data:
+                col_info1, col_info2, col_info3 = st.columns(3)
+                with col_info1:
+                    if st.session_state.selected_opportunity_data.get('deadline'):
+                        st.info(f"⏰ Deadline: {st.session_state.selected_opportunity_data.get('deadline')}")
+                with col_info2:
+                    if st.session_state.selected_opportunity_data.get('provider'):
+                        st.info(f"🏢 Provider: {st.session_state.selected_opportunity_data.get('provider')}")
+                with col_info3:
+                    if st.session_state.selected_opportunity_data.get('funding'):
+                        st.info(f"💰 Funding: {st.session_state.selected_opportunity_data.get('funding')}")
+
+        with st.form("material_generation_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                material_type = st.selectbox(
+                    "Material Type",
+                    ["cover_letter", "personal_statement", "motivation_letter"],
+                    format_func=lambda x: x.replace('_', ' ').title()
+                )
+
+                target_words = st.slider(
+                    "Target Word Count",
+                    min_value=200,
+                    max_value=1000,
+                    value=500,
+                    step=50
+                )
+
+            with col2:
+                # Opportunity selection mode
+                available_options = []
+                default_index = 0
+
+                if st.session_state.selected_opportunity_for_materials:
+                    available_options.append("Selected Match")
+                if history:
+                    if not available_options:
+                        default_index = 0
+                    available_options.append("History")
+
+                if not available_options:
+                    st.warning("⚠️ No opportunities available. Please match an opportunity first!")
+                    use_selected = False
+                    use_previous = False
+                    selected_opp = None
+                else:
+                    opp_selection_mode = st.radio(
+                        "Select Opportunity From:",
+                        available_options,
+                        index=default_index,
+                        help="Choose where to get opportunity details"
+                    )
+
+                    use_selected = False
+                    use_previous = False
+                    selected_opp = None
+
+                    if opp_selection_mode == "Selected Match":
+                        use_selected = True
+                    elif opp_selection_mode == "History":
+                        use_previous = True
+                        selected_opp = st.selectbox(
+                            "Choose from evaluated opportunities:",
+                            range(len(history)),
+                            format_func=lambda x: f"{history[x]['title']} ({history[x]['score']:.0%})"
+                        )
+
+            # Opportunity details
+            st.divider()
+
+            if use_selected and st.session_state.selected_opportunity_for_materials:
+                st.subheader("✅ Selected Opportunity")
+                col_det1, col_det2 = st.columns(2)
+                with col_det1:
+                    st.write(f"**Title:** {st.session_state.selected_opportunity_for_materials.title}")
+                    st.write(f"**Type:** {st.session_state.selected_opportunity_for_materials.opp_type}")
+                with col_det2:
+                    if has_selected_opp_data:
+                        if st.session_state.selected_opportunity_data.get('deadline'):
+                            st.write(f"**Deadline:** {st.session_state.selected_opportunity_data.get('deadline')}")
+                        if st.session_state.selected_opportunity_data.get('funding'):
+                            st.write(f"**Funding:** {st.session_state.selected_opportunity_data.get('funding')}")
+
+            elif use_previous and history:
+                st.subheader("✅ Selected Opportunity")
+                selected_row = history[selected_opp]
+                st.write(f"**Title:** {selected_row['title']}")
+                st.write(f"**Type:** {selected_row['type']}")
+                st.write(f"**Match Score:** {selected_row['score']:.0%}")
+
+            else:
+                st.warning("⚠️ Please select an opportunity from 'Selected Match' or 'History' to generate materials.")
+            
+            generate_material = st.form_submit_button("✍️ Generate Material", use_container_width=True)
+
+        # Process outside the form
+        if generate_material:
+            # Get opportunity data
+            opportunity = None
+            if use_selected and st.session_state.selected_opportunity_for_materials:
+                opportunity = st.session_state.selected_opportunity_for_materials
+            elif use_previous and history:
+                selected_record = _load_record(history[selected_opp])
+                opportunity = selected_record['opportunity'] if selected_record else None
+            if opportunity is None:
+                st.error("Please select an opportunity from 'Selected Match' or 'History' to generate materials.")
+                st.stop()
+
+            # Stream the text as it is written; key points and suggestions follow in a second step
+            try:
+                from material_generator import (
+                    stream_application_material, review_application_material, complete_streamed_material
+                )
+
+                status = st.empty()
+                status.info(f"🤖 Writing your {material_type.replace('_', ' ')}...")
+
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    st.subheader("Generated Material")
+                    material_area = st.empty()
+                    with material_area.container():
+                        content = st.write_stream(stream_application_material(
+                            st.session_state.profile,
+                            opportunity,
+                            material_type,
+                            target_words
+                        ))
+                    # Swap the streamed text for an editable copy
+                    material_area.text_area(
+                        "Content",
+                        value=content,
+                        height=400,
+                        help="Copy this content and customize as needed"
+                    )
+
+                with st.spinner("🔎 Reviewing key points..."):
+                    review = review_application_material(content, opportunity, material_type)
+                result = complete_streamed_material(content, review, material_type)
+
+                status.success(f"✅ {material_type.replace('_', ' ').title()} Generated Successfully!")
+
+                with col2:
+                    create_metric_card("Word Count", result.word_count)
+                    create_metric_card("Target", target_words)
+
+                    if abs(result.word_count - target_words) <= 50:
+                        st.success("🎯 Length on target!")
+                    elif result.word_count < target_words * 0.8:
+                        st.warning("📏 Consider expanding")
+                    elif result.word_count > target_words * 1.2:
+                        st.warning("✂️ Consider shortening")
+
+                # Key points and suggestions
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("""
+                    <div class="success-card">
+                        <h4>🎯 Key Points Highlighted</h4>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    for point in result.key_points_highlighted:
+                        st.write(f"• {point}")
+
+                with col2:
+                    st.markdown("""
+                    <div class="info-card">
+                        <h4>💡 Suggestions for Improvement</h4>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    st.write(result.suggestions_for_improvement)
+
+                # Download option (OUTSIDE FORM)
+                st.divider()
+                st.download_button(
+                    label=f"📄 Download {material_type.replace('_', ' ').title()} (TXT)",
+                    data=result.content,
+                    file_name=f"{material_type}_{opportunity.title.replace(' ', '_')}.txt",
+                    mime="text/plain"
+                )
+
+            except Exception as e:
+                st.error(f"❌ Error generating material: {str(e)}")
+
+        # Batch mode: one material for each of several evaluated opportunities
+        st.divider()
+        st.subheader("📦 Batch Generate")
+
+        if not history:
+            st.info("Evaluate a few opportunities first (e.g. with Batch Match) to write materials for several at once.")
+        else:
+            ranked = sorted(range(len(history)), key=lambda i: history[i].get('score', 0), reverse=True)
+
+            with st.form("batch_materials_form"):
+                batch_selection = st.multiselect(
+                    "Opportunities",
+                    ranked,
+                    default=ranked[:5],
+                    format_func=lambda i: f"{history[i]['title']} ({history[i].get('score', 0):.0%})",
+                    help="Your best matches are pre-selected"
+                )
+                col_b1, col_b2 = st.columns(2)
+                with col_b1:
+                    batch_type = st.selectbox(
+                        "Material Type",
+                        ["cover_letter", "personal_statement", "motivation_letter"],
+                        format_func=lambda x: x.replace('_', ' ').title(),
+                        key="batch_material_type"
+                    )
+                with col_b2:
+                    batch_words = st.slider("Target Word Count", 200, 1000, 500, 50, key="batch_target_words")
+                run_batch = st.form_submit_button("📦 Generate for All Selected", use_container_width=True)
+
+            if run_batch and batch_selection:
+                from material_generator import generate_materials_batch, materials_zip
+
+                # One material per evaluation; drafts and widgets are keyed by evaluation id, since titles repeat
+                batch_records = load_evaluations_by_id(current_user_id(), [history[i]['id'] for i in dict.fromkeys(batch_selection)])
+
+                # Drafts from earlier batches (same profile and material type) can be edited instead of rewritten
+                drafts_key = (batch_type, st.session_state.profile.model_dump_json())
+                saved_drafts = st.session_state.setdefault('material_drafts', {}).setdefault(drafts_key, {})
+
+                with st.spinner(f"🤖 Writing {len(batch_records)} {batch_type.replace('_', ' ')}s in parallel..."):
+                    drafts = generate_materials_batch(
+                        st.session_state.profile,
+                        [record['opportunity'] for record in batch_records],
+                        batch_type,
+                        batch_words,
+                        existing_drafts=list(saved_drafts.values())
+                    )
+
+                for record, draft in zip(batch_records, drafts):
+                    if draft.ok:
+                        saved_drafts[record['id']] = draft
+
+                col_s1, col_s2, col_s3 = st.columns(3)
+                with col_s1:
+                    create_metric_card("Generated", f"{sum(d.ok for d in drafts)}/{len(drafts)}")
+                with col_s2:
+                    create_metric_card("Adapted From Drafts", sum(1 for d in drafts if d.based_on))
+                with col_s3:
+                    create_metric_card("Tokens Used", f"{sum(d.input_tokens + d.output_tokens for d in drafts):,}")
+
+                for record, draft in zip(batch_records, drafts):
+                    with st.expander(f"{'✅' if draft.ok else '❌'} {draft.opportunity.title}"):
+                        if not draft.ok:
+                            st.error(draft.error)
+                            continue
+                        if draft.based_on:
+                            st.caption(f"Adapted from the draft for '{draft.based_on}' • {draft.word_count} words")
+                        else:
+                            st.caption(f"Written from scratch • {draft.word_count} words")
+                        st.text_area("Content", value=draft.content, height=300, key=f"batch_draft_{record['id']}")
+
+                if any(d.ok for d in drafts):
+                    st.download_button(
+                        label="📦 Download All (ZIP)",
+                        data=materials_zip(drafts, batch_type),
+                        file_name=f"{batch_type}s.zip",
+                        mime="application/zip",
+                        use_container_width=True
+                    )
@@ -0,0 +1,362 @@
+"""Your Profile: create, auto-fill and edit the user profile"""
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card
+from models import UserProfile
+from app_cache import cached_evaluation_summary
+from user_store import current_user_id
+
+
+def render():
+    st.header("Create Your Profile")
+    st.markdown("Fill out your information once, then use it to evaluate multiple opportunities.")
+
+    # Quick action buttons
+    # Check if CV data is available in session state
+    has_cv_data = 'document_analysis' in st.session_state and st.session_state.document_analysis
+
+    if has_cv_data and not st.session_state.profile:
+        # Show auto-create button when CV is uploaded but no profile exists
+        col_btn1, col_btn2 = st.columns(2)
+        with col_btn1:
+            if st.button("⚡ Auto-Create Profile from CV", use_container_width=True, type="primary", help="Automatically create your profile from uploaded CV"):
+                cv_data = st.session_state.document_analysis
+                with st.spinner("Creating profile from CV..."):
+                    try:
+                        from app_cache import get_llm
+                        import json
+
+                        llm = get_llm(temperature=0, call_site="profile.from_cv")
+
+                        prompt = f"""Extract profile information from this CV/Resume text and return ONLY a valid JSON object.
+
+CV Text:
+{cv_data.extracted_text}
+
+Return this exact JSON structure (no extra text, no markdown):
+{{
+    "name": "extracted full name",
+    "education_level": "Bachelor's" or "Master's" or "PhD" or "High School",
+    "field_of_study": "major/field extracted from education section",
+    "gpa": 3.5 or null if not mentioned,
+    "skills": "comma separated list of all technical and soft skills",
+    "experience_years": total years of work experience as integer,
+    "languages": "comma separated languages spoken",
+    "achievements": "key achievements, awards, publications, certifications",
+    "goals": "inferred career goals based on CV content and trajectory"
+}}
+
+Rules:
+- Use exact values from CV where possible
+- If information is missing, use null or reasonable default
+- Keep it concise and accurate
+- Return ONLY the JSON, no other text"""
+
+                        response = llm.invoke(prompt)
+                        content = response.content.strip()
+
+                        # Clean up if it has markdown code blocks
+                        if content.startswith("```json"):
+                            content = content[7:]
+                        elif content.startswith("```"):
+                            content = content[3:]
+                        if content.endswith("```"):
+                            content = content[:-3]
+                        content = content.strip()
+
+                        profile_data = json.loads(content)
+
+                        # Create profile directly
+                        st.session_state.profile = UserProfile(
+                            name=profile_data.get('name') or 'From CV',
+                            education_level=profile_data.get('education_level') or 'Bachelor\'s',
+                            field_of_study=profile_data.get('field_of_study') or 'Not specified',
+                            gpa=profile_data.get('gpa'),
+                            skills=profile_data.get('skills') or 'Not specified',
+                            experience_years=profile_data.get('experience_years') or 0,
+                            languages=profile_data.get('languages') or 'English',
+                            achievements=profile_data.get('achievements') or 'See CV for details',
+                            goals=profile_data.get('goals') or 'See CV for details'
+                        )
+                        st.success("✅ Profile created from CV!")
+                        st.balloons()
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error creating profile: {str(e)}")
+        with col_btn2:
+            if st.button("📝 Create Manually Instead", use_container_width=True, type="secondary"):
+                st.info("Scroll down to fill the form manually")
+    else:
+        # Original buttons layout
+        col_btn1, col_btn2, col_btn3 = st.columns(3)
+        with col_btn1:
+            if st.button("📄 Upload CV to Auto-fill", use_container_width=True, type="secondary"):
+                st.session_state.active_tab = "tab5"
+                st.info("👉 Go to 'Upload Documents' tab to upload your CV")
+        with col_btn2:
+            if st.button("🚀 Load Demo Profile", use_container_width=True, help="Quick load a sample profile for testing"):
+                demo_profile = UserProfile(
+                    name="Omar Ahmed",
+                    education_level="Master's",
+                    field_of_study="Computer Science",
+                    gpa=3.8,
+                    skills="Python, Machine Learning, Data Analysis, Natural Language Processing, Research, Technical Writing, Problem Solving",
+                    experience_years=3,
+                    languages="English, Arabic, French",
+                    achievements="Published 2 research papers on AI ethics, Won university hackathon 2023, Teaching Assistant for 2 years, Google Summer of Code participant, Dean's List all semesters",
+                    goals="Seeking PhD opportunities in AI research, particularly interested in ethical AI and NLP applications. Looking to contribute to cutting-edge research while developing teaching experience."
+                )
+                st.session_state.profile = demo_profile
+                st.success("✅ Demo profile loaded! Scroll down to see details.")
+                st.rerun()
+        with col_btn3:
+            if st.session_state.profile and st.button("🎯 Go to Batch Match", use_container_width=True, type="primary"):
+                st.info("👉 Go to 'Check Match' tab and scroll to Batch Match section")
+
+    st.markdown("---")
+
+    # Show manual form in expander if profile already exists, otherwise show it normally
+    if not st.session_state.profile:
+        # Show form normally when no profile exists
+        with st.form("profile_form"):
+            # Basic Information
+            st.subheader("Basic Information")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                name = st.text_input("Full Name*", help="Your full name")
+                education = st.selectbox(
+                    "Education Level*",
+                    ["High School", "Bachelor's", "Master's", "PhD", "Other"],
+                    help="Your highest completed or current education level"
+                )
+                field = st.text_input(
+                    "Field of Study*",
+                    help="Your major, specialization, or field of expertise"
+                )
+
+            with col2:
+                gpa = st.number_input(
+                    "GPA (optional)",
+                    min_value=0.0,
+                    max_value=4.0,
+                    step=0.1,
+                    help="Your GPA on a 4.0 scale (leave 0 if not applicable)"
+                )
+                experience = st.number_input(
+                    "Years of Experience*",
+                    min_value=0,
+                    max_value=50,
+                    value=0,
+                    help="Years of relevant work or research experience"
+                )
+                languages = st.text_input(
+                    "Languages*",
+                    placeholder="English, Arabic, Spanish",
+                    help="Languages you speak (comma separated)"
+                )
+
+            # Skills and Experience
+            st.subheader("Skills & Experience")
+            skills = st.text_area(
+                "Skills*",
+                placeholder="Python, Data Analysis, Research, Project Management, etc.",
+                help="Your technical and soft skills (comma separated)"
+            )
+
+            achievements = st.text_area(
+                "Key Achievements*",
+                placeholder="Awards, publications, certifications, notable projects, leadership roles...",
+                help="Your most significant accomplishments"
+            )
+
+            goals = st.text_area(
+                "Your Goals*",
+                placeholder="What are you looking for? Career change? Further education? Research opportunities?",
+                help="Describe what you're hoping to achieve"
+            )
+
+            # Submit button
+            submitted = st.form_submit_button("💾 Save Profile", use_container_width=True)
+
+            if submitted:
+                # Validation
+                required_fields = [name, field, skills, languages, achievements, goals]
+                if not all(required_fields):
+                    st.error("Please fill all required fields marked with *")
+                else:
+                    # Create and save profile
+                    st.session_state.profile = UserProfile(
+                        name=name,
+                        education_level=education,
+                        field_of_study=field,
+                        gpa=gpa if gpa > 0 else None,
+                        skills=skills,
+                        experience_years=experience,
+                        languages=languages,
+                        achievements=achievements,
+                        goals=goals
+                    )
+
+                    # Save to the user store
+                    from user_store import save_profile
+                    save_profile(current_user_id(), st.session_state.profile)
+
+                    st.success(f"✅ Profile saved successfully for {name}!")
+                    st.rerun()
+    else:
+        # Hide form when profile exists, show in collapsed expander
+        with st.expander("📝 Edit Profile Manually (Optional)", expanded=False):
+            with st.form("profile_form_edit"):
+                # Basic Information
+                st.subheader("Basic Information")
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    name = st.text_input("Full Name*", value=st.session_state.profile.name, help="Your full name")
+                    education = st.selectbox(
+                        "Education Level*",
+                        ["High School", "Bachelor's", "Master's", "PhD", "Other"],
+                        index=["High School", "Bachelor's", "Master's", "PhD", "Other"].index(st.session_state.profile.education_level) if st.session_state.profile.education_level in ["High School", "Bachelor's", "Master's", "PhD", "Other"] else 1,
+                        help="Your highest completed or current education level"
+                    )
+                    field = st.text_input(
+                        "Field of Study*",
+                        value=st.session_state.profile.field_of_study,
+                        help="Your major, specialization, or field of expertise"
+                    )
+
+                with col2:
+                    gpa = st.number_input(
+                        "GPA (optional)",
+                        min_value=0.0,
+                        max_value=4.0,
+                        step=0.1,
+                        value=float(st.session_state.profile.gpa or 0),
+                        help="Your GPA on a 4.0 scale (leave 0 if not applicable)"
+                    )
+                    experience = st.number_input(
+                        "Years of Experience*",
+                        min_value=0,
+                        max_value=50,
+                        value=st.session_state.profile.experience_years,
+                        help="Years of relevant work or research experience"
+                    )
+                    languages = st.text_input(
+                        "Languages*",
+                        value=st.session_state.profile.languages,
+                        placeholder="English, Arabic, Spanish",
+                        help="Languages you speak (comma separated)"
+                    )
+
+                # Skills and Experience
+                st.subheader("Skills & Experience")
+                skills = st.text_area(
+                    "Skills*",
+                    value=st.session_state.profile.skills,
+                    placeholder="Python, Data Analysis, Research, Project Management, etc.",
+                    help="Your technical and soft skills (comma separated)"
+                )
+
+                achievements = st.text_area(
+                    "Key Achievements*",
+                    value=st.session_state.profile.achievements,
+                    placeholder="Awards, publications, certifications, notable projects, leadership roles...",
+                    help="Your most significant accomplishments"
+                )
+
+                goals = st.text_area(
+                    "Your Goals*",
+                    value=st.session_state.profile.goals,
+                    placeholder="What are you looking for? Career change? Further education? Research opportunities?",
+                    help="Describe what you're hoping to achieve"
+                )
+
+                # Submit button
+                submitted = st.form_submit_button("💾 Update Profile", use_container_width=True)
+
+                if submitted:
+                    # Validation
+                    required_fields = [name, field, skills, languages, achievements, goals]
+                    if not all(required_fields):
+                        st.error("Please fill all required fields marked with *")
+                    else:
+                        # Update profile
+                        st.session_state.profile = UserProfile(
+                            name=name,
+                            education_level=education,
+                            field_of_study=field,
+                            gpa=gpa if gpa > 0 else None,
+                            skills=skills,
+                            experience_years=experience,
+                            languages=languages,
+                            achievements=achievements,
+                            goals=goals
+                        )
+
+                        # Save to the user store
+                        from user_store import save_profile
+                        save_profile(current_user_id(), st.session_state.profile)
+
+                        st.success(f"✅ Profile updated successfully!")
+                        st.rerun()
+
+    # Display saved profile with enhanced styling
+    if st.session_state.profile:
+        st.divider()
+        st.subheader("Your Saved Profile")
+
+        # Next step button
+        st.markdown("""
+        <div class="success-card">
+            <strong>✅ Profile Ready!</strong><br>
+            You can now match against all scholarships in the database.
+        </div>
+        """, unsafe_allow_html=True)
+
+        if st.button("🚀 Match Against All Scholarships", type="primary", use_container_width=True, key="goto_batch_match"):
+            st.info("👉 Go to 'Check Match' tab and scroll down to 'Batch Match' section")
+
+        st.markdown("---")
+
+        # Profile summary cards
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            create_metric_card("Education", st.session_state.profile.education_level)
+        with col2:
+            create_metric_card("Experience", f"{st.session_state.profile.experience_years} years")
+        with col3:
+            create_metric_card("Applications", cached_evaluation_summary(current_user_id())["total"])
+        
+        with st.expander("View Full Profile Details", expanded=False):
+            profile = st.session_state.profile
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Name:** {profile.name}")
+                st.write(f"**Education:** {profile.education_level}")
+                st.write(f"**Field:** {profile.field_of_study}")
+                st.write(f"**GPA:** {profile.gpa or 'Not provided'}")
+            
+            with col2:
+                st.write(f"**Experience:** {profile.experience_years} years")
+                st.write(f"**Languages:** {profile.languages}")
+                st.write(f"**Skills:** {profile.skills}")
+            
+            st.write(f"**Achievements:** {profile.achievements}")
+            st.write(f"**Goals:** {profile.goals}")
+            
+            # Generate Profile PDF
+            try:
+                from app_cache import profile_pdf
+                profile_pdf_bytes = profile_pdf(st.session_state.profile)
+                
+                st.download_button(
+                    label="📄 Download Profile Summary (PDF)",
+                    data=profile_pdf_bytes,
+                    file_name=f"profile_summary_{st.session_state.profile.name.replace(' ', '_')}.pdf",
+                    mime="application/pdf"
+                )
+            except Exception as e:
+                st.info("PDF export feature requires all dependencies to be installed.")
@@ -0,0 +1,950 @@
+"""AI Strategy: progress dashboard, roadmaps and multi-agent analysis"""
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card
+from app_cache import cached_evaluation_summary
+from tracing import span
+from user_store import current_user_id
+
+
+def render():
+    st.header("🤖 AI Career Strategy Assistant")
+    st.markdown("Your personal AI advisor for roadmaps, timelines, tips, and strategic planning.")
+
+    if not st.session_state.profile:
+        st.markdown("""
+        <div class="warning-card">
+            <strong>⚠️ Profile Required</strong><br>
+            Please create your profile first in the 'Your Profile' tab to access AI Strategy features.
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="success-card">
+            <strong>✅ AI Assistant Ready</strong><br>
+            Personalized guidance for: <strong>{st.session_state.profile.name}</strong>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Progress Dashboard
+        st.markdown("---")
+        st.subheader("📊 Your Progress Dashboard")
+
+        history_totals = cached_evaluation_summary(current_user_id())
+        col_dash1, col_dash2, col_dash3, col_dash4 = st.columns(4)
+
+        with col_dash1:
+            create_metric_card("Profile Score", f"{len(st.session_state.profile.skills.split(',')) * 10}%")
+
+        with col_dash2:
+            create_metric_card("Opportunities Matched", history_totals["total"])
+
+        with col_dash3:
+            create_metric_card("Avg Match Score", f"{history_totals['avg_score']:.0%}")
+
+        with col_dash4:
+            create_metric_card("Strong Matches", history_totals["strong"])
+
+        if history_totals["total"]:
+            with st.expander("📈 Portfolio Analytics", expanded=False):
+                from app_cache import cached_portfolio
+                from intelligence.portfolio import portfolio_metrics, top_by_value_per_hour
+
+                # Column arrays over the whole history (cached); every metric is one vectorized pass
+                portfolio = cached_portfolio(current_user_id())
+                portfolio_stats = portfolio_metrics(portfolio)
+
+                # Amounts are never summed across currencies; headline the most common one
+                by_currency = portfolio_stats["by_currency"]
+                main_currency = next(iter(by_currency), None)
+                main_stats = by_currency.get(main_currency, {})
+                currency_label = f" ({main_currency or 'currency unknown'})" if main_currency is not None else ""
+
+                col_pf1, col_pf2, col_pf3, col_pf4 = st.columns(4)
+                with col_pf1:
+                    create_metric_card(f"Expected Value{currency_label}", f"{main_stats.get('expected_value', 0):,.0f}")
+                with col_pf2:
+                    create_metric_card(f"Value / Hour{currency_label}", f"{main_stats.get('expected_value_per_hour', 0):,.0f}")
+                with col_pf3:
+                    create_metric_card("Deadlines ≤30 days", portfolio_stats["urgent_deadlines"])
+                with col_pf4:
+                    create_metric_card("Time Saved", f"{portfolio_stats['time_saved_hours']} h")
+
+                st.bar_chart({
+                    f"{i * 10}-{i * 10 + 10}%": [count]
+                    for i, count in enumerate(portfolio_stats["score_histogram"])
+                })
+
+                other_currencies = [
+                    f"{stats['expected_value']:,.0f} {currency or '(currency unknown)'}"
+                    for currency, stats in list(by_currency.items())[1:]
+                ]
+                if other_currencies:
+                    st.caption("Expected value in other currencies: " + ", ".join(other_currencies))
+
+                best_roi = top_by_value_per_hour(portfolio, currency=main_currency)
+                if best_roi:
+                    st.markdown(f"**Best expected value per hour of effort{currency_label}:**")
+                    for item in best_roi:
+                        st.write(f"- {item['title']} — {item['value_per_hour']:,.0f}/hour ({item['score']:.0%} match)")
+                st.caption("Expected value = parsed funding × match score; effort is estimated per opportunity type.")
+
+        # Quick actions
+        st.markdown("### 🚀 Quick Actions")
+        col_act1, col_act2, col_act3 = st.columns(3)
+
+        with col_act1:
+            if st.button("📝 Update Profile", use_container_width=True):
+                st.info("👉 Go to 'Your Profile' tab to update your information")
+
+        with col_act2:
+            if st.button("🔍 Find Opportunities", use_container_width=True):
+                st.info("👉 Go to 'Opportunity Database' to browse and add opportunities")
+
+        with col_act3:
+            if st.button("📊 View History", use_container_width=True):
+                st.info("👉 Go to 'History' tab to see all evaluations")
+
+        st.markdown("---")
+
+        # Create sub-tabs for different AI features
+        ai_tab1, ai_tab2, ai_tab3, ai_tab4, ai_tab5, ai_tab6 = st.tabs([
+            "🗺️ Roadmap",
+            "📅 Timeline",
+            "💡 Tips & Advice",
+            "🎯 Profile Analysis",
+            "📊 Success Strategy",
+            "🤖 Ask AI"
+        ])
+
+        # TAB 1: Career Roadmap
+        with ai_tab1, span("tab Roadmap", "tab"):
+            st.subheader("🗺️ Personalized Career Roadmap")
+            st.markdown("Get a step-by-step roadmap tailored to your goals and background.")
+
+            if st.button("🚀 Generate My Roadmap", use_container_width=True, type="primary"):
+                with st.spinner("Creating your personalized roadmap..."):
+                    try:
+                        from app_cache import get_llm
+                        llm = get_llm(temperature=0.7, call_site="strategy.roadmap")
+
+                        prompt = f"""Create a detailed career roadmap for this person:
+
+Name: {st.session_state.profile.name}
+Education: {st.session_state.profile.education_level} in {st.session_state.profile.field_of_study}
+Experience: {st.session_state.profile.experience_years} years
+Skills: {st.session_state.profile.skills}
+Goals: {st.session_state.profile.goals}
+
+Provide:
+1. Short-term goals (3-6 months)
+2. Medium-term goals (6-12 months)
+3. Long-term goals (1-3 years)
+4. Key milestones to track progress
+5. Skills to develop at each stage
+6. Potential obstacles and solutions
+
+Format as clear, actionable roadmap."""
+
+                        result = llm.invoke(prompt)
+
+                        st.markdown("### 🎯 Your Personalized Roadmap")
+                        st.write(result.content)
+
+                        # Get YouTube video recommendations with real searches
+                        st.markdown("---")
+                        st.markdown("### 📺 Recommended YouTube Videos")
+
+                        video_prompt = f"""Based on this career roadmap for {st.session_state.profile.field_of_study}, suggest 5 relevant YouTube search queries. Format EXACTLY as:
+1. Topic title | search terms
+2. Topic title | search terms
+
+Keep search terms simple and effective."""
+
+                        video_result = llm.invoke(video_prompt)
+
+                        # Parse and create clickable YouTube links
+                        import re
+                        lines = video_result.content.strip().split('\n')
+
+                        for line in lines:
+                            if '|' in line:
+                                parts = line.split('|', 1)
+                                if len(parts) == 2:
+                                    topic = parts[0].strip()
+                                    search_query = parts[1].strip()
+                                    # Create YouTube search URL
+                                    import urllib.parse
+                                    encoded_query = urllib.parse.quote(search_query)
+                                    youtube_url = f"https://www.youtube.com/results?search_query={encoded_query}"
+
+                                    st.markdown(f"**{topic}**")
+                                    st.markdown(f"🔗 [Watch on YouTube]({youtube_url})")
+                                    st.divider()
+
+                        # Download option
+                        full_content = f"{result.content}\n\n---\nRECOMMENDED VIDEOS:\n{video_result.content}"
+                        st.download_button(
+                            label="📥 Download Roadmap + Videos",
+                            data=full_content,
+                            file_name="career_roadmap_with_resources.txt",
+                            mime="text/plain"
+                        )
+
+                    except Exception as e:
+                        st.error(f"Error generating roadmap: {str(e)}")
+
+        # TAB 2: Application Timeline
+        with ai_tab2, span("tab Timeline", "tab"):
+            st.subheader("📅 Application Timeline Planner")
+            st.markdown("Create a timeline for your applications with deadlines and preparation tasks.")
+
+            # Get matched opportunities
+            if history_totals["total"]:
+                st.info(f"📊 Found {history_totals['total']} matched opportunities to plan for.")
+
+                if st.button("📅 Create Timeline", use_container_width=True, type="primary"):
+                    with st.spinner("Building your timeline..."):
+                        try:
+                            from app_cache import get_llm
+                            llm = get_llm(temperature=0.5, call_site="strategy.timeline")
+
+                            # Prepare opportunity list (the first ten evaluated)
+                            from user_store import load_evaluations
+                            opp_list = ""
+                            for idx, record in enumerate(load_evaluations(current_user_id(), limit=10), 1):
+                                opp = record.get('opportunity')
+                                if opp:
+                                    deadline = getattr(opp, 'deadline', 'No deadline')
+                                    opp_list += f"{idx}. {opp.title} - Deadline: {deadline}\n"
+
+                            prompt = f"""Create a detailed application timeline for:
+
+Profile: {st.session_state.profile.name}
+Field: {st.session_state.profile.field_of_study}
+
+Opportunities to apply for:
+{opp_list}
+
+Create a week-by-week timeline including:
+1. When to start preparing each application
+2. Document preparation deadlines
+3. Review and revision time
+4. Submission dates
+5. Follow-up actions
+
+Consider typical preparation time for each application type.
+Format as clear weekly timeline."""
+
+                            result = llm.invoke(prompt)
+
+                            st.markdown("### 📅 Your Application Timeline")
+                            st.write(result.content)
+
+                            # Add YouTube resources with links
+                            st.markdown("---")
+                            st.markdown("### 📺 Time Management & Organization Videos")
+
+                            video_prompt = """Suggest 5 YouTube videos about application time management. Format EXACTLY as:
+1. Topic | search query
+2. Topic | search query
+Keep it focused on productivity and deadlines."""
+
+                            video_result = llm.invoke(video_prompt)
+
+                            # Create clickable links
+                            import urllib.parse
+                            lines = video_result.content.strip().split('\n')
+                            for line in lines:
+                                if '|' in line:
+                                    parts = line.split('|', 1)
+                                    if len(parts) == 2:
+                                        topic = parts[0].strip()
+                                        query = parts[1].strip()
+                                        url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
+                                        st.markdown(f"**{topic}**")
+                                        st.markdown(f"🔗 [Watch on YouTube]({url})")
+                                        st.divider()
+
+                            # Add visual timeline
+                            st.markdown("---")
+                            st.markdown("### 📊 Timeline Visualization Tips")
+                            st.info("""
+💡 **Pro Tips:**
+- Use Google Calendar to set reminders for each deadline
+- Create a Notion or Trello board to track application stages
+- Set up weekly review sessions to check progress
+- Build in 2-week buffers before deadlines
+                            """)
+
+                            full_content = f"{result.content}\n\n---\nRESOURCES:\n{video_result.content}"
+                            st.download_button(
+                                label="📥 Download Timeline + Resources",
+                                data=full_content,
+                                file_name="application_timeline_with_tips.txt",
+                                mime="text/plain"
+                            )
+
+                        except Exception as e:
+                            st.error(f"Error creating timeline: {str(e)}")
+            else:
+                st.warning("⚠️ No matched opportunities yet. Go to 'Check Match' to evaluate opportunities first!")
+
+        # TAB 3: Tips & Advice
+        with ai_tab3, span("tab Tips & Advice", "tab"):
+            st.subheader("💡 Personalized Tips & Advice")
+            st.markdown("Get expert tips tailored to your profile and goals.")
+
+            advice_type = st.selectbox(
+                "What advice do you need?",
+                [
+                    "General Application Tips",
+                    "Profile Improvement",
+                    "Interview Preparation",
+                    "Networking Strategies",
+                    "Statement Writing",
+                    "CV/Resume Enhancement",
+                    "Time Management",
+                    "Skill Development"
+                ]
+            )
+
+            if st.button("💡 Get Advice", use_container_width=True, type="primary"):
+                with st.spinner("Generating personalized advice..."):
+                    try:
+                        from app_cache import get_llm
+                        llm = get_llm(temperature=0.7, call_site="strategy.tips")
+
+                        prompt = f"""Provide expert advice on: {advice_type}
+
+For this profile:
+- Name: {st.session_state.profile.name}
+- Education: {st.session_state.profile.education_level} in {st.session_state.profile.field_of_study}
+- Experience: {st.session_state.profile.experience_years} years
+- Skills: {st.session_state.profile.skills}
+- Goals: {st.session_state.profile.goals}
+
+Provide:
+1. 5-7 specific, actionable tips
+2. Real-world examples
+3. Common mistakes to avoid
+4. Resources to explore
+5. Quick wins (easy improvements with high impact)
+
+Make it practical and immediately actionable."""
+
+                        result = llm.invoke(prompt)
+
+                        st.markdown(f"### 💡 {advice_type}")
+                        st.write(result.content)
+
+                        # YouTube recommendations with links
+                        st.markdown("---")
+                        st.markdown("### 📺 Learn More on YouTube")
+
+                        video_prompt = f"""Suggest 5 YouTube videos about {advice_type}. Format EXACTLY as:
+1. Topic | search query
+Focus on expert content."""
+
+                        video_result = llm.invoke(video_prompt)
+
+                        # Create clickable links
+                        import urllib.parse
+                        lines = video_result.content.strip().split('\n')
+                        for line in lines:
+                            if '|' in line:
+                                parts = line.split('|', 1)
+                                if len(parts) == 2:
+                                    topic = parts[0].strip()
+                                    query = parts[1].strip()
+                                    url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
+                                    st.markdown(f"**{topic}**")
+                                    st.markdown(f"🔗 [Watch on YouTube]({url})")
+                                    st.divider()
+
+                        # Additional resources
+                        st.markdown("---")
+                        st.markdown("### 📚 Additional Resources")
+
+                        resource_prompt = f"""Suggest 3 free online resources (blogs, articles, tools) for {advice_type}. Format:
+1. Resource name - Brief description"""
+
+                        resource_result = llm.invoke(resource_prompt)
+                        st.write(resource_result.content)
+
+                        full_content = f"{result.content}\n\n---\nVIDEOS:\n{video_result.content}\n\n---\nRESOURCES:\n{resource_result.content}"
+                        st.download_button(
+                            label="📥 Download Complete Guide",
+                            data=full_content,
+                            file_name=f"{advice_type.lower().replace(' ', '_')}_complete_guide.txt",
+                            mime="text/plain"
+                        )
+
+                    except Exception as e:
+                        st.error(f"Error generating advice: {str(e)}")
+
+        # TAB 4: Profile Analysis
+        with ai_tab4, span("tab Profile Analysis", "tab"):
+            st.subheader("🎯 Deep Profile Analysis")
+            st.markdown("Get comprehensive analysis of your strengths, weaknesses, and opportunities.")
+
+            if st.button("🔍 Analyze My Profile", use_container_width=True, type="primary"):
+                with st.spinner("Analyzing your profile..."):
+                    try:
+                        from app_cache import get_llm
+                        llm = get_llm(temperature=0.5, call_site="strategy.profile_analysis")
+
+                        prompt = f"""Perform deep SWOT analysis for:
+
+Name: {st.session_state.profile.name}
+Education: {st.session_state.profile.education_level} in {st.session_state.profile.field_of_study}
+GPA: {st.session_state.profile.gpa or 'Not provided'}
+Experience: {st.session_state.profile.experience_years} years
+Languages: {st.session_state.profile.languages}
+Skills: {st.session_state.profile.skills}
+Achievements: {st.session_state.profile.achievements}
+Goals: {st.session_state.profile.goals}
+
+Provide detailed analysis:
+
+**STRENGTHS:**
+- Top 5 strongest points
+- How to leverage them
+
+**WEAKNESSES:**
+- Areas needing improvement
+- Action plan for each
+
+**OPPORTUNITIES:**
+- Career paths that fit well
+- Emerging opportunities in their field
+
+**THREATS:**
+- Potential challenges
+- How to mitigate them
+
+**COMPETITIVE EDGE:**
+- What makes them unique
+- How to stand out
+
+Be specific and actionable."""
+
+                        result = llm.invoke(prompt)
+
+                        st.markdown("### 🎯 Your Profile Analysis")
+                        st.write(result.content)
+
+                        # Skill development videos with links
+                        st.markdown("---")
+                        st.markdown("### 📺 Skill Development Videos")
+
+                        video_prompt = f"""For {st.session_state.profile.field_of_study}, suggest 5 skill development videos. Format EXACTLY as:
+1. Topic | search query"""
+
+                        video_result = llm.invoke(video_prompt)
+
+                        # Create clickable links
+                        import urllib.parse
+                        lines = video_result.content.strip().split('\n')
+                        for line in lines:
+                            if '|' in line:
+                                parts = line.split('|', 1)
+                                if len(parts) == 2:
+                                    topic = parts[0].strip()
+                                    query = parts[1].strip()
+                                    url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
+                                    st.markdown(f"**{topic}**")
+                                    st.markdown(f"🔗 [Watch on YouTube]({url})")
+                                    st.divider()
+
+                        # Action plan template
+                        st.markdown("---")
+                        st.markdown("### 📋 30-Day Action Plan Template")
+                        st.info("""
+**Week 1:** Address one critical weakness
+**Week 2:** Build on existing strengths
+**Week 3:** Explore one new opportunity
+**Week 4:** Review progress and adjust
+
+Set specific, measurable goals for each week!
+                        """)
+
+                        full_content = f"{result.content}\n\n---\nSKILL VIDEOS:\n{video_result.content}"
+                        st.download_button(
+                            label="📥 Download Analysis + Action Plan",
+                            data=full_content,
+                            file_name="profile_analysis_with_plan.txt",
+                            mime="text/plain"
+                        )
+
+                    except Exception as e:
+                        st.error(f"Error analyzing profile: {str(e)}")
+
+        # TAB 5: Success Strategy
+        with ai_tab5, span("tab Success Strategy", "tab"):
+            st.subheader("📊 Application Success Strategy")
+            st.markdown("Data-driven strategy to maximize your acceptance rate.")
+
+            if st.button("📊 Generate Strategy", use_container_width=True, type="primary"):
+                with st.spinner("Creating your success strategy..."):
+                    try:
+                        from app_cache import get_llm
+                        llm = get_llm(temperature=0.5, call_site="strategy.success_strategy")
+
+                        # Include match history if available
+                        match_context = ""
+                        history_totals = cached_evaluation_summary(current_user_id())
+                        if history_totals["total"]:
+                            match_context = f"\n\nMatched Opportunities: {history_totals['total']}"
+                            match_context += f"\nAverage Match Score: {history_totals['avg_score']:.0%}"
+
+                        prompt = f"""Create comprehensive application success strategy:
+
+Profile: {st.session_state.profile.name}
+Field: {st.session_state.profile.field_of_study}
+Experience: {st.session_state.profile.experience_years} years{match_context}
+
+Provide:
+
+**APPLICATION STRATEGY:**
+1. Ideal number of applications to target
+2. Mix of reach/target/safety opportunities
+3. Application pacing (how many per week)
+
+**PRIORITIZATION FRAMEWORK:**
+- How to decide which to apply to first
+- Time investment per application
+- ROI analysis framework
+
+**DIFFERENTIATION STRATEGY:**
+- How to stand out from other applicants
+- Unique angle to emphasize
+- Story to tell
+
+**RISK MITIGATION:**
+- Backup plans
+- Diversification strategy
+- Timeline buffers
+
+**SUCCESS METRICS:**
+- KPIs to track
+- When to adjust strategy
+
+Make it data-driven and actionable."""
+
+                        result = llm.invoke(prompt)
+
+                        st.markdown("### 📊 Your Success Strategy")
+                        st.write(result.content)
+
+                        # Success story videos with links
+                        st.markdown("---")
+                        st.markdown("### 📺 Success Stories & Case Studies")
+
+                        video_prompt = f"""Suggest 5 success story videos for {st.session_state.profile.field_of_study}. Format EXACTLY as:
+1. Topic | search query
+Focus on scholarships/jobs."""
+
+                        video_result = llm.invoke(video_prompt)
+
+                        # Create clickable links
+                        import urllib.parse
+                        lines = video_result.content.strip().split('\n')
+                        for line in lines:
+                            if '|' in line:
+                                parts = line.split('|', 1)
+                                if len(parts) == 2:
+                                    topic = parts[0].strip()
+                                    query = parts[1].strip()
+                                    url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
+                                    st.markdown(f"**{topic}**")
+                                    st.markdown(f"🔗 [Watch on YouTube]({url})")
+                                    st.divider()
+
+                        # Strategy checklist
+                        st.markdown("---")
+                        st.markdown("### ✅ Strategy Implementation Checklist")
+                        col1, col2 = st.columns(2)
+
+                        with col1:
+                            st.markdown("""
+**Before Applying:**
+- [ ] Research opportunity thoroughly
+- [ ] Customize all materials
+- [ ] Get feedback from 2+ people
+- [ ] Proofread everything 3x
+- [ ] Check all requirements
+                            """)
+
+                        with col2:
+                            st.markdown("""
+**After Applying:**
+- [ ] Send thank you/follow-up
+- [ ] Track application in spreadsheet
+- [ ] Set reminder for result date
+- [ ] Continue other applications
+- [ ] Reflect and improve process
+                            """)
+
+                        full_content = f"{result.content}\n\n---\nSUCCESS VIDEOS:\n{video_result.content}"
+                        st.download_button(
+                            label="📥 Download Complete Strategy",
+                            data=full_content,
+                            file_name="success_strategy_complete.txt",
+                            mime="text/plain"
+                        )
+
+                    except Exception as e:
+                        st.error(f"Error generating strategy: {str(e)}")
+
+        # TAB 6: Ask AI Anything
+        with ai_tab6, span("tab Ask AI", "tab"):
+            st.subheader("🤖 Ask AI Career Advisor")
+            st.markdown("Have a specific question? Ask the AI directly!")
+
+            user_question = st.text_area(
+                "Your Question:",
+                placeholder="E.g., Should I apply to this scholarship? How can I improve my chances? What skills should I learn?",
+                height=100
+            )
+
+            if st.button("🤖 Get Answer", use_container_width=True, type="primary"):
+                if user_question:
+                    with st.spinner("AI is thinking..."):
+                        try:
+                            from app_cache import get_llm
+                            llm = get_llm(temperature=0.7, call_site="strategy.ask_advisor")
+
+                            prompt = f"""You are an expert career advisor. Answer this question:
+
+Question: {user_question}
+
+Context about the person:
+- Name: {st.session_state.profile.name}
+- Education: {st.session_state.profile.education_level} in {st.session_state.profile.field_of_study}
+- Experience: {st.session_state.profile.experience_years} years
+- Skills: {st.session_state.profile.skills}
+- Goals: {st.session_state.profile.goals}
+
+Provide a detailed, helpful answer that:
+1. Directly addresses their question
+2. Considers their specific background
+3. Includes actionable advice
+4. Suggests next steps
+5. Provides relevant resources if applicable
+
+Be conversational but professional."""
+
+                            result = llm.invoke(prompt)
+
+                            st.markdown("### 💬 AI Response")
+                            st.write(result.content)
+
+                            # Related videos with links
+                            st.markdown("---")
+                            st.markdown("### 📺 Related Video Resources")
+
+                            video_prompt = f"""For question: "{user_question}", suggest 3 videos. Format EXACTLY as:
+1. Topic | search query"""
+
+                            video_result = llm.invoke(video_prompt)
+
+                            # Create clickable links
+                            import urllib.parse
+                            lines = video_result.content.strip().split('\n')
+                            for line in lines:
+                                if '|' in line:
+                                    parts = line.split('|', 1)
+                                    if len(parts) == 2:
+                                        topic = parts[0].strip()
+                                        query = parts[1].strip()
+                                        url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
+                                        st.markdown(f"**{topic}**")
+                                        st.markdown(f"🔗 [Watch on YouTube]({url})")
+                                        st.divider()
+
+                        except Exception as e:
+                            st.error(f"Error: {str(e)}")
+                else:
+                    st.warning("Please enter a question first!")
+
+        # Quick Tips Section
+        with st.expander("📖 How to Use AI Strategy Assistant"):
+            st.markdown("""
+            ### 6 Powerful Tools at Your Disposal:
+
+            **🗺️ Roadmap** - Get a personalized career roadmap with short, medium, and long-term goals
+
+            **📅 Timeline** - Create a week-by-week application timeline based on your matched opportunities
+
+            **💡 Tips & Advice** - Get expert tips on applications, interviews, CV writing, and more
+
+            **🎯 Profile Analysis** - Deep SWOT analysis of your strengths, weaknesses, opportunities, and threats
+
+            **📊 Success Strategy** - Data-driven strategy to maximize your acceptance rate
+
+            **🤖 Ask AI** - Have a specific question? Ask the AI career advisor directly!
+
+            All advice is personalized based on your profile and completely downloadable for offline reference.
+            """)
+
+        # Main Action Button
+        st.subheader("🚀 Run Complete AI Analysis")
+
+        col_info, col_btn = st.columns([2, 1])
+
+        with col_info:
+            st.info("This will run all AI agents in parallel to analyze your profile, find opportunities, and create an application strategy. Takes ~30-60 seconds.")
+
+        with col_btn:
+            run_analysis = st.button("🤖 Run AI Analysis", type="primary", use_container_width=True)
+
+        if run_analysis:
+            # Load opportunities for analysis
+            from opportunities_storage import ineligible_opportunities, list_opportunities
+            all_opps = list_opportunities()
+
+            # Only opportunities the profile can apply to are worth a place in the strategy
+            ineligible = ineligible_opportunities(st.session_state.profile)
+            eligible_opps = [opp for opp in all_opps if opp.get('id') not in ineligible]
+
+            if not all_opps:
+                st.warning("⚠️ No opportunities in database. Add some scholarships first!")
+            elif not eligible_opps:
+                st.warning(f"⚠️ You're not eligible for any of the {len(all_opps)} saved opportunities.")
+            else:
+                if len(eligible_opps) < len(all_opps):
+                    st.caption(f"🚫 Left out {len(all_opps) - len(eligible_opps)} opportunities you're not eligible for")
+                with st.spinner("🤖 AI agents are working... This may take 30-60 seconds"):
+                    try:
+                        # Run batch match to get scored opportunities
+                        from ai_evaluator import evaluate_match
+                        batch_results = []
+
+                        # Evaluate top 10 opportunities for strategy
+                        for opp_data in eligible_opps[:10]:
+                            try:
+                                from models import Opportunity
+                                opportunity = Opportunity(
+                                    title=opp_data.get('title', ''),
+                                    opp_type=opp_data.get('type', 'Scholarship'),
+                                    description=opp_data.get('description', ''),
+                                    requirements=opp_data.get('requirements', ''),
+                                    deadline=opp_data.get('deadline'),
+                                    digest=opp_data.get('digest')
+                                )
+
+                                result = evaluate_match(st.session_state.profile, opportunity)
+
+                                batch_results.append({
+                                    'opportunity': opportunity,
+                                    'result': result,
+                                    'opp_data': opp_data,
+                                    'score': result.compatibility_score
+                                })
+                            except:
+                                pass
+
+                        # Sort by score
+                        batch_results.sort(key=lambda x: x['score'], reverse=True)
+
+                        # Run orchestrator with results
+                        import asyncio
+                        from agents.orchestrator import orchestrate_ai_analysis
+
+                        loop = asyncio.new_event_loop()
+                        asyncio.set_event_loop(loop)
+                        unified_plan = loop.run_until_complete(
+                            orchestrate_ai_analysis(st.session_state.profile, batch_results)
+                        )
+
+                        st.success("✅ AI Analysis Complete!")
+                        st.markdown("---")
+
+                        # Display Results
+                        st.subheader("📊 Unified Action Plan")
+
+                        # Key Metrics
+                        col_m1, col_m2, col_m3 = st.columns(3)
+
+                        with col_m1:
+                            create_metric_card("Success Probability", f"{unified_plan.success_probability:.1%}")
+
+                        with col_m2:
+                            create_metric_card("Time Investment", f"{unified_plan.time_investment_hours} hours")
+
+                        with col_m3:
+                            create_metric_card("Priority Actions", str(len(unified_plan.priority_actions)))
+
+                        st.markdown("---")
+
+                        # Priority Actions
+                        st.subheader("🎯 Top Priority Actions")
+                        for idx, action in enumerate(unified_plan.priority_actions, 1):
+                            st.markdown(f"{idx}. {action}")
+
+                        st.markdown("---")
+
+                        # Recommended Next Steps
+                        st.subheader("📋 Recommended Next Steps")
+                        for idx, step in enumerate(unified_plan.recommended_next_steps, 1):
+                            st.markdown(f"{idx}. {step}")
+
+                        st.markdown("---")
+
+                        # Detailed Agent Results
+                        st.subheader("🔍 Detailed Agent Analysis")
+
+                        # Profile Optimization Results
+                        if unified_plan.profile_optimization:
+                            with st.expander("🔍 Profile Optimizer Agent Results", expanded=True):
+                                prof_opt = unified_plan.profile_optimization
+
+                                col1, col2 = st.columns(2)
+
+                                with col1:
+                                    st.markdown("### 💪 Quick Wins")
+                                    if 'quick_wins' in prof_opt and prof_opt['quick_wins']:
+                                        for qw in prof_opt['quick_wins'][:5]:
+                                            st.markdown(f"- **{qw.get('action', 'N/A')}** (Impact: {qw.get('impact_score', 0)}/10)")
+                                            st.caption(qw.get('rationale', ''))
+
+                                    st.markdown("### 🌟 Unique Strengths")
+                                    if 'unique_strengths' in prof_opt:
+                                        for strength in prof_opt['unique_strengths'][:3]:
+                                            st.success(f"✓ {strength}")
+
+                                with col2:
+                                    st.markdown("### ⚠️ Critical Gaps")
+                                    if 'critical_gaps' in prof_opt and prof_opt['critical_gaps']:
+                                        for gap in prof_opt['critical_gaps'][:5]:
+                                            st.markdown(f"- **{gap.get('area', 'N/A')}** (Severity: {gap.get('severity', 0)}/10)")
+                                            st.caption(gap.get('description', ''))
+
+                                    st.markdown("### 📊 Profile Strength")
+                                    if 'profile_strength_score' in prof_opt:
+                                        score = prof_opt['profile_strength_score']
+                                        st.metric("Overall Score", f"{score}/10")
+
+                        # Search Strategies
+                        if unified_plan.search_strategies:
+                            with st.expander("🎯 Opportunity Scout Agent Results"):
+                                search_strat = unified_plan.search_strategies
+
+                                if 'recommended_platforms' in search_strat:
+                                    st.markdown("### 🌐 Recommended Platforms")
+                                    for platform in search_strat['recommended_platforms'][:5]:
+                                        st.markdown(f"**{platform.get('name', 'N/A')}** - {platform.get('rationale', '')}")
+
+                                if 'search_keywords' in search_strat:
+                                    st.markdown("### 🔑 Search Keywords")
+                                    st.write(", ".join(search_strat['search_keywords'][:10]))
+
+                                # Hand the scout's URLs (and, with CRAWL_SEARCH_URL set, its queries) to the crawler
+                                from crawl_frontier import CrawlFrontier, seeds_from_scout
+                                queued = CrawlFrontier().add_seeds(seeds_from_scout(search_strat))
+                                if queued:
+                                    st.caption(f"🕷️ Queued {queued} new URLs for the crawler; run `python crawl_frontier.py --ingest` to crawl them")
+
+                        # Application Strategy
+                        if unified_plan.application_strategy:
+                            with st.expander("📋 Application Strategist Agent Results"):
+                                app_strat = unified_plan.application_strategy
+
+                                if 'prioritized_applications' in app_strat and app_strat['prioritized_applications']:
+                                    st.markdown("### 📊 Prioritized Applications")
+                                    for idx, app in enumerate(app_strat['prioritized_applications'][:5], 1):
+                                        col_a, col_b, col_c = st.columns([2, 1, 1])
+
+                                        with col_a:
+                                            st.markdown(f"**{idx}. {app.get('opportunity_title', 'N/A')}**")
+                                            st.caption(app.get('strategy_summary', ''))
+
+                                        with col_b:
+                                            st.metric("Success Rate", f"{app.get('success_probability', 0):.0%}")
+
+                                        with col_c:
+                                            priority = app.get('priority_level', 'Medium')
+                                            color = "🔴" if priority == "High" else "🟡" if priority == "Medium" else "🟢"
+                                            st.metric("Priority", f"{color} {priority}")
+
+                    except Exception as e:
+                        st.error(f"Error running AI analysis: {str(e)}")
+                        with st.expander("Debug Info"):
+                            import traceback
+                            st.code(traceback.format_exc())
+
+    with span("AI usage panel", "section"):
+        _llm_usage_panel()
+
+
+def _llm_usage_panel():
+    """Cost, latency and failures of every model call site, from llm_telemetry"""
+    st.markdown("---")
+    with st.expander("📡 AI Usage & Performance", expanded=False):
+        from llm_telemetry import get_telemetry, latency_bucket_labels
+
+        telemetry = get_telemetry()
+        windows = {"Last hour": 3600, "Last 24 hours": 24 * 3600, "Last 7 days": 7 * 24 * 3600, "All time": None}
+        window_label = st.radio("Window", list(windows), index=1, horizontal=True, key="llm_usage_window")
+        usage = telemetry.summary(window=windows[window_label])
+
+        if not usage["calls"] and not usage["cache_hits"]:
+            st.info("No AI calls recorded in this window yet.")
+            return
+
+        col_u1, col_u2, col_u3, col_u4 = st.columns(4)
+        with col_u1:
+            create_metric_card("AI Calls", f"{usage['calls']:,}", help_text=f"{usage['cache_hits']:,} more answered from cache")
+        with col_u2:
+            create_metric_card("Failures", f"{usage['errors']:,}", help_text=f"{usage['retries']:,} client retries")
+        with col_u3:
+            create_metric_card("Tokens", f"{usage['tokens']:,}")
+        with col_u4:
+            create_metric_card("Est. Cost", f"${usage['cost']:.4f}")
+
+        st.markdown("**By call site (most expensive first):**")
+        st.dataframe(
+            [
+                {
+                    "Call site": row["call_site"],
+                    "Calls": row["calls"],
+                    "Errors": row["errors"],
+                    "Retries": row["retries"],
+                    "Cache hits": row["cache_hits"],
+                    "Prompt tokens": row["input_tokens"],
+                    "Completion tokens": row["output_tokens"],
+                    "Cost ($)": round(row["cost"], 4),
+                    "p50 (s)": round(row["p50_latency"], 2),
+                    "p95 (s)": round(row["p95_latency"], 2)
+                }
+                for row in usage["call_sites"]
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.markdown("**Latency distribution:**")
+        st.bar_chart({
+            label: [count]
+            for label, count in zip(latency_bucket_labels(), usage["latency_histogram"])
+        })
+
+        failing = [row for row in usage["call_sites"] if row["last_error"]]
+        for row in failing:
+            st.caption(f"⚠️ {row['call_site']}: last error - {row['last_error']}")
+
+        col_e1, col_e2 = st.columns(2)
+        with col_e1:
+            st.download_button(
+                label="📥 Export Telemetry (JSON)",
+                data=telemetry.export_json,
+                file_name="llm_telemetry.json",
+                mime="application/json",
+                use_container_width=True
+            )
+        with col_e2:
+            if st.button("🗑️ Reset Telemetry", use_container_width=True, key="reset_llm_telemetry"):
+                telemetry.clear()
+                st.rerun()
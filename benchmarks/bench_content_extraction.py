@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tokens sent to the LLM vs. extraction accuracy
+
+Compares the old approach (strip script/style, truncate to 8,000 chars)
+with content_extractor.extract_main_content on the pages in
+benchmarks/fixtures/pages. Accuracy is the share of expected key facts
+(eligibility, funding, deadline...) that survive into the text the
+model would see.
+
+The fixture pages are synthetic, padded with generated navigation (see
+fixtures/pages/README.md), so the baseline's low recall comes from that
+padding. Treat the output as a regression check, not as a measure of
+recall on real pages.
+
+Usage:
+    python benchmarks/bench_content_extraction.py [--budget 1500]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+from content_extractor import extract_main_content, estimate_tokens
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+
+
+def baseline_extract(html: str) -> str:
+    """What agents/web_scraper did before: strip scripts/styles, keep first 8,000 chars"""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    text = soup.get_text(separator="\n", strip=True)
+    return text[:8000]
+
+
+def fact_recall(text: str, facts) -> float:
+    normalized = " ".join(text.split())
+    found = sum(1 for fact in facts if fact in normalized)
+    return found / len(facts) if facts else 1.0
+
+
+def run(budget: int, repeat: int):
+    expected = json.loads((FIXTURES_DIR / "expected.json").read_text())
+
+    rows = []
+    for name, facts in sorted(expected.items()):
+        html = (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+        for label, extractor in [
+            ("baseline", baseline_extract),
+            ("main-content", lambda h: extract_main_content(h, max_tokens=budget)),
+        ]:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                text = extractor(html)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+            rows.append({
+                "page": name,
+                "method": label,
+                "tokens": estimate_tokens(text),
+                "recall": fact_recall(text, facts),
+                "ms": elapsed_ms
+            })
+
+    print(f"{'page':<28} {'method':<13} {'tokens':>7} {'recall':>7} {'ms':>8}")
+    print("-" * 67)
+    for row in rows:
+        print(f"{row['page']:<28} {row['method']:<13} {row['tokens']:>7} {row['recall']:>7.0%} {row['ms']:>8.2f}")
+
+    print("-" * 67)
+    for label in ("baseline", "main-content"):
+        subset = [r for r in rows if r["method"] == label]
+        tokens = sum(r["tokens"] for r in subset)
+        recall = sum(r["recall"] for r in subset) / len(subset)
+        ms = sum(r["ms"] for r in subset) / len(subset)
+        print(f"{'TOTAL':<28} {label:<13} {tokens:>7} {recall:>7.0%} {ms:>8.2f}")
+    print("\nSynthetic fixture pages: recall here is not representative of real pages.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--budget", type=int, default=1500, help="Token budget for main-content extraction")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per page")
+    args = parser.parse_args()
+    run(args.budget, args.repeat)
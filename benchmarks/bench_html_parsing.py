@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTML parser backends for scraping
+
+Times full BeautifulSoup parsing, main-content extraction and the
+streaming/early-exit extractor for every available backend (lxml,
+html.parser) over a corpus of saved opportunity pages, and records
+peak Python memory with tracemalloc.
+
+Note: tracemalloc only sees allocations made through Python's allocator,
+so libxml2's own buffers are not counted for the lxml rows.
+
+Usage:
+    python benchmarks/bench_html_parsing.py [--corpus DIR] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_extractor import extract_main_content, extract_main_content_streaming
+from html_parsing import available_backends, make_soup
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "fixtures" / "pages"
+
+
+def measure(func, repeat: int):
+    """Median wall time (ms) over `repeat` runs and peak traced memory (KiB) of one run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak / 1024
+
+
+def run(corpus: Path, repeat: int, budget: int):
+    pages = sorted(corpus.glob("*.html"))
+    if not pages:
+        print(f"No .html files in {corpus}")
+        return
+
+    documents = [p.read_text(encoding="utf-8") for p in pages]
+    total_kb = sum(len(d) for d in documents) / 1024
+    print(f"Corpus: {len(documents)} pages, {total_kb:.0f} KiB from {corpus}")
+    print(f"Backends available: {', '.join(available_backends())}\n")
+
+    cases = []
+    for backend in available_backends():
+        cases.append((f"soup ({backend})", lambda d, b=backend: make_soup(d, b)))
+        cases.append((f"extract ({backend})", lambda d, b=backend: extract_main_content(d, budget, parser=b)))
+        cases.append((f"stream ({backend})", lambda d, b=backend: extract_main_content_streaming(d, budget, parser=b)))
+
+    print(f"{'case':<24} {'total ms':>10} {'per page':>10} {'peak KiB':>10}")
+    print("-" * 58)
+    for label, func in cases:
+        total_ms = 0.0
+        peak_kib = 0.0
+        for document in documents:
+            ms, kib = measure(lambda: func(document), repeat)
+            total_ms += ms
+            peak_kib = max(peak_kib, kib)
+        print(f"{label:<24} {total_ms:>10.2f} {total_ms / len(documents):>10.2f} {peak_kib:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per page")
+    parser.add_argument("--budget", type=int, default=1500, help="Token budget for extraction")
+    args = parser.parse_args()
+    run(args.corpus, args.repeat, args.budget)
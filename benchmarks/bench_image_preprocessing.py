@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vision payload size before and after image preprocessing
+
+Generates typical uploads in memory (a 12 MP phone photo of a document
+with EXIF rotation, a desktop screenshot, a colour flyer) or reads your
+own images, then reports payload size, preprocessing time, the OpenAI
+image token estimate and the upload time at a given bandwidth.
+
+Usage:
+    python benchmarks/bench_image_preprocessing.py [--images DIR] [--mbps 10]
+"""
+
+import argparse
+import math
+import random
+import sys
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from image_preprocessing import detect_mime_type, preprocess_image
+
+
+def openai_image_tokens(width: int, height: int) -> int:
+    """Tokens billed for a "high" detail image: 85 + 170 per 512px tile after OpenAI's resize"""
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def _text_lines(draw, width, height, color, step=60):
+    rng = random.Random(7)
+    for y in range(200, height - 200, step):
+        x = 200
+        while x < width - 400:
+            word = rng.randint(60, 260)
+            draw.rectangle([x, y, x + word, y + step // 3], fill=color)
+            x += word + 40
+
+
+def phone_photo_document() -> bytes:
+    img = Image.new("RGB", (4032, 3024), (182, 170, 150))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([300, 150, 3700, 2900], fill=(236, 232, 222))
+    _text_lines(draw, 3700, 2900, (40, 40, 48))
+    noise = Image.effect_noise((4032, 3024), 24).convert("RGB")
+    img = Image.blend(img, noise, 0.12).filter(ImageFilter.GaussianBlur(1))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotated 90 degrees, as most phones store portrait shots
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=95, exif=exif)
+    return buffer.getvalue()
+
+
+def screenshot() -> bytes:
+    img = Image.new("RGB", (2880, 1800), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, 0, 2880, 120], fill=(30, 60, 120))
+    _text_lines(draw, 2880, 1800, (20, 20, 20), step=48)
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def colour_flyer() -> bytes:
+    img = Image.new("RGB", (3000, 4200), (250, 200, 60))
+    draw = ImageDraw.Draw(img)
+    for i in range(0, 4200, 30):
+        draw.line([(0, i), (3000, i // 2)], fill=(230, 90 + i % 120, 40), width=12)
+    draw.rectangle([250, 900, 2750, 3600], fill=(255, 255, 255))
+    _text_lines(draw, 2750, 3600, (10, 40, 110), step=80)
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=92)
+    return buffer.getvalue()
+
+
+SAMPLES = [
+    ("phone photo (document)", phone_photo_document, "openai", True),
+    ("screenshot (PNG)", screenshot, "openai", True),
+    ("colour flyer", colour_flyer, "gemini", False),
+]
+
+
+def run(images_dir, mbps: float):
+    if images_dir:
+        samples = [
+            (p.name, (lambda p=p: p.read_bytes()), "openai", True)
+            for p in sorted(images_dir.iterdir())
+            if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+        ]
+    else:
+        samples = SAMPLES
+
+    bytes_per_second = mbps * 1_000_000 / 8
+    base64_overhead = 4 / 3
+
+    print(f"{'image':<24} {'before':>16} {'after':>16} {'mime':>11} {'prep ms':>8} {'tokens':>13} {'upload s':>13}")
+    print("-" * 108)
+    for label, make, target, document in samples:
+        raw = make()
+        prepared = preprocess_image(raw, target=target, document=document)
+
+        with Image.open(BytesIO(raw)) as img:
+            before_dims = img.size
+        before_tokens = openai_image_tokens(*before_dims)
+        after_tokens = openai_image_tokens(prepared.width, prepared.height)
+        before_upload = len(raw) * base64_overhead / bytes_per_second
+        after_upload = prepared.size * base64_overhead / bytes_per_second
+
+        print(
+            f"{label:<24} "
+            f"{len(raw) / 1024:>7.0f} KB {detect_mime_type(raw)[6:]:>5} "
+            f"{prepared.size / 1024:>7.0f} KB {prepared.reduction:>5.0%} "
+            f"{prepared.mime_type:>11} {prepared.elapsed_ms:>8.0f} "
+            f"{before_tokens:>6}->{after_tokens:<6} "
+            f"{before_upload:>6.2f}->{after_upload:<6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--images", type=Path, default=None, help="Directory of your own images (default: generated samples)")
+    parser.add_argument("--mbps", type=float, default=10.0, help="Upload bandwidth used for the upload time estimate")
+    args = parser.parse_args()
+    run(args.images, args.mbps)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PDF export of a large batch of evaluations
+
+Times exporting a synthetic batch-match result set as one report per
+evaluation (the old per-download path) against the combined portfolio
+report, rendered in-process and across a process pool.
+
+Usage:
+    python benchmarks/bench_pdf_reports.py [--evaluations 500] [--workers N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pdf_generator
+from models import MatchResult, Opportunity, UserProfile
+
+WORDS = "research leadership community python analysis funding degree international & <impact>".split()
+
+
+def synthetic_batch(count: int):
+    rng = random.Random(42)
+
+    def sentence(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+    profile = UserProfile(
+        name="Benchmark Candidate", education_level="Master's", field_of_study="Computer Science",
+        gpa=3.7, skills="Python, SQL, machine learning", experience_years=3, languages="English, Spanish",
+        achievements=sentence(40), goals=sentence(40)
+    )
+    evaluations = []
+    for i in range(count):
+        score = round(rng.random(), 2)
+        evaluations.append((
+            Opportunity(
+                title=f"Scholarship {i}", opp_type=rng.choice(["Scholarship", "Fellowship", "Academic Program"]),
+                description=sentence(60), requirements=sentence(40), deadline="2027-03-01"
+            ),
+            MatchResult(
+                compatibility_score=score, strengths=sentence(80), gaps=sentence(60), recommendation=sentence(60)
+            )
+        ))
+    evaluations.sort(key=lambda item: item[1].compatibility_score, reverse=True)
+    return profile, evaluations
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--evaluations", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count, at least 2)")
+    args = parser.parse_args()
+    # With one worker the report falls back to rendering in-process
+    args.workers = args.workers or max(os.cpu_count() or 1, 2)
+
+    profile, evaluations = synthetic_batch(args.evaluations)
+
+    def per_evaluation():
+        return sum(len(pdf_generator.generate_evaluation_pdf(profile, *item).getvalue()) for item in evaluations)
+
+    def in_process():
+        threshold = pdf_generator.PARALLEL_REPORT_THRESHOLD
+        pdf_generator.PARALLEL_REPORT_THRESHOLD = len(evaluations)
+        try:
+            return len(pdf_generator.generate_portfolio_pdf(profile, evaluations).getvalue())
+        finally:
+            pdf_generator.PARALLEL_REPORT_THRESHOLD = threshold
+
+    def process_pool():
+        buffer = BytesIO()
+        threshold = pdf_generator.PARALLEL_REPORT_THRESHOLD
+        pdf_generator.PARALLEL_REPORT_THRESHOLD = 0
+        try:
+            pdf_generator.write_portfolio_pdf(profile, evaluations, buffer, max_workers=args.workers)
+        finally:
+            pdf_generator.PARALLEL_REPORT_THRESHOLD = threshold
+        return len(buffer.getvalue())
+
+    print(f"{args.evaluations} evaluations, {args.workers} worker processes")
+    for label, fn in [
+        ("one PDF per evaluation", per_evaluation),
+        ("portfolio report, in-process", in_process),
+        ("portfolio report, process pool", process_pool)
+    ]:
+        size, seconds = timed(fn)
+        print(f"  {label:32s} {seconds:7.2f} s  {size / 1024:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
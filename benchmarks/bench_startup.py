@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: app cold start and per-rerun cost, with budgets
+
+Measures, each in a fresh interpreter, the import time of the app shell
+and of every page module (and which heavy libraries each one pulls in),
+then drives the app with Streamlit's AppTest and reports the CPU time of
+a rerun on every page. Exits with status 1 when a budget is exceeded.
+The heavy-import check also runs in the test suite (tests/test_startup.py),
+so a heavy import in the startup path fails the tests; the time budgets
+are only checked here.
+
+No API calls are made; history is written to a temporary database.
+
+Usage:
+    python benchmarks/bench_startup.py [--import-budget-ms 400] [--rerun-budget-ms 150] [--reruns 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Libraries that must only load when a handler needs them
+HEAVY_MODULES = ["langchain_openai", "openai", "fitz", "bs4", "google.generativeai", "reportlab", "PyPDF2"]
+
+IMPORT_PROBE = """
+import sys, time
+import streamlit  # Already loaded by the time the app script runs
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(f"{{elapsed:.1f}}|{{','.join(heavy)}}")
+"""
+
+
+def import_cost(module: str):
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    elapsed, heavy = output.split("|")
+    return float(elapsed), [name for name in heavy.split(",") if name]
+
+
+def rerun_costs(reruns: int):
+    from streamlit.testing.v1 import AppTest
+    import app_pages
+
+    # CPU time of the script thread only: AppTest itself sleeps while polling
+    # and spends its own CPU parsing the rendered elements
+    samples = []
+    render_page = app_pages.render_page
+
+    def timed_render_page(label):
+        start = time.thread_time()
+        try:
+            render_page(label)
+        finally:
+            samples.append((time.thread_time() - start) * 1000)
+
+    app_pages.render_page = timed_render_page
+    try:
+        app = AppTest.from_file(str(ROOT / "main.py"), default_timeout=120)
+        app.run()
+        first = samples[-1]
+
+        costs = {}
+        for label in app_pages.PAGES:
+            app.radio(key="active_page").set_value(label).run()
+            if app.exception:
+                raise RuntimeError(f"{label}: {app.exception[0].value}")
+            samples.clear()
+            for _ in range(reruns):
+                app.run()
+            costs[label] = statistics.median(samples)
+    finally:
+        app_pages.render_page = render_page
+    return first, costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--import-budget-ms", type=float, default=400)
+    parser.add_argument("--rerun-budget-ms", type=float, default=150)
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    os.environ["USER_DB_FILE"] = os.path.join(tempfile.mkdtemp(), "bench_user_data.db")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+    from app_pages import PAGES
+
+    failures = []
+    print("Cold import (fresh interpreter, streamlit already loaded)")
+    for module in ["enhanced_ui", "user_store"] + [f"app_pages.{name}" for name in PAGES.values()]:
+        elapsed, heavy = import_cost(module)
+        flag = ""
+        if elapsed > args.import_budget_ms:
+            flag = "  OVER BUDGET"
+            failures.append(f"import {module}: {elapsed:.0f} ms")
+        if heavy:
+            flag += f"  loads {', '.join(heavy)}"
+            failures.append(f"import {module} loads {', '.join(heavy)}")
+        print(f"  {module:28s} {elapsed:7.1f} ms{flag}")
+
+    first, costs = rerun_costs(args.reruns)
+    print(f"\nFirst render of the default page: {first:.0f} ms CPU")
+    print(f"Rerun CPU per page (median of {args.reruns})")
+    for label, cost in costs.items():
+        flag = ""
+        if cost > args.rerun_budget_ms:
+            flag = "  OVER BUDGET"
+            failures.append(f"rerun {label}: {cost:.0f} ms")
+        print(f"  {label:28s} {cost:7.1f} ms{flag}")
+
+    if failures:
+        print("\nBudget exceeded:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nAll within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import re
+from typing import Iterable, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, Tag
+from bs4.element import NavigableString, PreformattedString
+from html_parsing import (
+    BOILERPLATE_HINTS, BOILERPLATE_ROLES, BOILERPLATE_TAGS, CONTENT_HINTS, INLINE_TAGS,
+    StreamingBlockParser, iter_text_chunks, make_soup
+)
+from tracing import traced
+
+# Words that signal the sections the matcher actually needs
+RELEVANT_TERMS = re.compile(
+    r"\b(eligib\w*|requirement\w*|criteria|deadline\w*|closing date|apply|application\w*|"
+    r"funding|stipend|tuition|salary|award\w*|benefit\w*|covers?|citizen\w*|nationalit\w*|"
+    r"degree|bachelor\w*|master\w*|phd|doctoral|gpa|ielts|toefl|language|scholarship\w*|"
+    r"fellowship\w*|internship\w*|qualif\w*|duration|candidate\w*)\b",
+    re.IGNORECASE
+)
+
+BLOCK_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "td", "th", "dt", "dd", "blockquote", "pre"]
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+DEFAULT_TOKEN_BUDGET = 2000
+MIN_STREAMED_CHARS = 200  # Less text than this from a whole streamed page: re-parse it in full
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for OpenAI models (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def _hint_penalty(tag: Tag) -> float:
+    """Score adjustment from the class/id attributes of a block and its ancestors"""
+    adjustment = 0.0
+    for node in [tag] + list(tag.parents)[:4]:
+        if not isinstance(node, Tag):
+            continue
+        hint = " ".join(node.get("class", []) or []) + " " + (node.get("id") or "")
+        if not hint.strip():
+            continue
+        if BOILERPLATE_HINTS.search(hint):
+            adjustment -= 1.0
+        elif CONTENT_HINTS.search(hint):
+            adjustment += 0.5
+    return adjustment
+
+
+def score_text(name: str, text: str, link_chars: int = 0, hint_adjustment: float = 0.0) -> float:
+    """
+    Text-density score for a single block
+
+    Long, link-poor, punctuated text scores high; short link lists
+    (menus, footers) score low. Blocks mentioning eligibility,
+    deadlines or funding get a bonus so they survive the budget cut.
+    """
+    text_len = len(text)
+    link_density = min(link_chars / text_len, 1.0) if text_len else 1.0
+
+    score = min(text_len / 80.0, 5.0)
+    score += text.count(",") * 0.2 + text.count(".") * 0.1
+    score *= (1.0 - link_density)
+    score += len(RELEVANT_TERMS.findall(text)) * 0.75
+    score += hint_adjustment
+
+    if name in HEADING_TAGS:
+        score += 1.0
+    return score
+
+
+def _score_block(tag: Tag, text: str) -> float:
+    link_chars = sum(len(a.get_text(" ", strip=True)) for a in tag.find_all("a"))
+    return score_text(tag.name, text, link_chars, _hint_penalty(tag))
+
+
+def _collect_blocks(soup: BeautifulSoup) -> List[Tuple[int, str, str, float]]:
+    """
+    Return (position, tag name, text, score) for every leaf text block
+
+    Leaf block tags (<p>, <li>, headings... with no block inside) are blocks
+    of their own. Text outside them, such as text in bare <div>s or beside a
+    nested block, is grouped by its nearest non-inline container and
+    becomes a "div" block, so pages that mix both styles keep all of it.
+    """
+    blocks = []
+    seen_text = set()
+    is_leaf: dict = {}  # id(block tag) -> has no block tag inside
+    loose: dict = {}  # id(container) -> [position, container, parts, link chars]
+
+    def add(position: int, name: str, text: str, score_for):
+        text = " ".join(text.split())
+        if len(text) < 3 or text in seen_text:
+            return
+        seen_text.add(text)
+        blocks.append((position, name, text, score_for(text)))
+
+    for position, node in enumerate((soup.body or soup).descendants):
+        if isinstance(node, Tag):
+            if node.name in BLOCK_TAGS:
+                is_leaf[id(node)] = node.find(BLOCK_TAGS) is None
+                if is_leaf[id(node)]:
+                    add(position, node.name, node.get_text(" ", strip=True), lambda text, tag=node: _score_block(tag, text))
+            continue
+        if not isinstance(node, NavigableString) or isinstance(node, PreformattedString) or not node.strip():
+            continue
+
+        container, in_link = None, False
+        for parent in node.parents:
+            if is_leaf.get(id(parent)):
+                break  # Already part of a leaf block
+            if parent.name == "a":
+                in_link = True
+            if container is None and parent.name not in INLINE_TAGS:
+                container = parent
+        else:
+            if container is not None:
+                group = loose.setdefault(id(container), [position, container, [], 0])
+                group[2].append(node)
+                group[3] += len(node.strip()) if in_link else 0
+
+    for position, container, parts, link_chars in loose.values():
+        add(position, "div", " ".join(parts),
+            lambda text, tag=container, links=link_chars: score_text("div", text, links, _hint_penalty(tag)))
+
+    blocks.sort(key=lambda block: block[0])
+    return blocks
+
+
+def strip_boilerplate(soup: BeautifulSoup) -> BeautifulSoup:
+    """Remove tags and hinted containers that only hold page chrome"""
+    for tag in soup(list(BOILERPLATE_TAGS)):
+        tag.decompose()
+
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "main", "article"):
+            continue
+        hint = " ".join(tag.get("class", []) or []) + " " + (tag.get("id") or "")
+        role = tag.get("role") or ""
+        if role in BOILERPLATE_ROLES:
+            tag.decompose()
+        elif hint.strip() and BOILERPLATE_HINTS.search(hint) and not CONTENT_HINTS.search(hint):
+            tag.decompose()
+
+    return soup
+
+
+def select_blocks(
+    blocks: List[Tuple[int, str, str, float]],
+    max_tokens: int,
+    min_score: float = 0.5,
+    title: Optional[str] = None
+) -> str:
+    """
+    Keep the best scoring blocks that fit the budget and render them in page
+    order, so headings stay next to the paragraphs they introduce
+    """
+    budget_chars = max_tokens * 4
+    selected = []
+    used = len(title) + 1 if title else 0
+
+    # Short pages: when no text block stands out, nothing is boilerplate either
+    if not any(score >= min_score for _, name, _, score in blocks if name not in HEADING_TAGS):
+        min_score = float("-inf")
+
+    # Best blocks first, then restore document order
+    for block in sorted(blocks, key=lambda b: b[3], reverse=True):
+        position, name, text, score = block
+        if score < min_score and name not in HEADING_TAGS:
+            continue
+        cost = len(text) + 1
+        if used + cost > budget_chars:
+            continue
+        selected.append(block)
+        used += cost
+
+    selected.sort(key=lambda b: b[0])
+
+    # Drop headings whose section lost all its content
+    lines = [title] if title else []
+    for i, (position, name, text, score) in enumerate(selected):
+        if name in HEADING_TAGS:
+            next_block = selected[i + 1] if i + 1 < len(selected) else None
+            if next_block is None or (next_block[1] in HEADING_TAGS and next_block[1] <= name):
+                continue
+            if text == title:
+                continue
+            lines.append(f"\n## {text}")
+        elif name == "li":
+            lines.append(f"- {text}")
+        else:
+            lines.append(text)
+
+    return "\n".join(lines).strip()
+
+
+@traced(category="parse")
+def extract_main_content(
+    html,
+    max_tokens: int = DEFAULT_TOKEN_BUDGET,
+    min_score: float = 0.5,
+    parser: Optional[str] = None
+) -> str:
+    """
+    Extract the relevant text of a web page within a token budget
+
+    Accepts raw HTML (str/bytes) or an already parsed BeautifulSoup object.
+    Blocks are scored by text density and relevance and the best ones are
+    kept until the budget is spent. Uses lxml when installed.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else make_soup(html, parser)
+    title = extract_page_title(soup)
+    strip_boilerplate(soup)
+
+    blocks = _collect_blocks(soup)
+    if not blocks:
+        return title or ""
+
+    return select_blocks(blocks, max_tokens, min_score, title)
+
+
+@traced(category="parse")
+def extract_main_content_streaming(
+    html: Union[str, bytes, Iterable],
+    max_tokens: int = DEFAULT_TOKEN_BUDGET,
+    min_score: float = 0.5,
+    parser: Optional[str] = None,
+    collect_factor: float = 2.0
+) -> str:
+    """
+    Early-exit variant of extract_main_content
+
+    Parses incrementally (a whole document or an iterable of str/bytes
+    chunks, e.g. response.iter_content()) and stops reading as soon as
+    relevant blocks worth `collect_factor` times the budget have been
+    collected, so the rest of a large page is never parsed or downloaded.
+    A page read to the end that yields less than MIN_STREAMED_CHARS of text
+    is handed to extract_main_content instead.
+    """
+    stream = StreamingBlockParser(parser)
+    collect_chars = max_tokens * 4 * collect_factor
+
+    blocks = []
+    seen_text = set()
+    collected = 0
+    received = []
+
+    def take(ready):
+        nonlocal collected
+        for name, text, link_chars, hint in ready:
+            if text in seen_text:
+                continue
+            seen_text.add(text)
+            score = score_text(name, text, link_chars, hint)
+            blocks.append((len(blocks), name, text, score))
+            if score >= min_score:
+                collected += len(text)
+
+    for chunk in iter_text_chunks(html):
+        received.append(chunk)
+        take(stream.feed(chunk))
+        if collected >= collect_chars:
+            break
+    else:
+        take(stream.close())
+        if sum(len(text) for _, _, text, _ in blocks) < MIN_STREAMED_CHARS:
+            # Markup the collector doesn't follow; the full parse sees everything
+            return extract_main_content("".join(received), max_tokens, min_score, parser)
+
+    if not blocks:
+        return stream.title or ""
+
+    return select_blocks(blocks, max_tokens, min_score, stream.title)
+
+
+def extract_page_title(html, parser: Optional[str] = None) -> Optional[str]:
+    """Best-effort page title (og:title, <title> or first <h1>)"""
+    soup = html if isinstance(html, BeautifulSoup) else make_soup(html, parser)
+
+    og_title = soup.find("meta", attrs={"property": "og:title"})
+    if og_title and og_title.get("content"):
+        return og_title["content"].strip()
+    if soup.title and soup.title.string:
+        return soup.title.string.strip()
+    h1 = soup.find("h1")
+    if h1:
+        return h1.get_text(" ", strip=True)
+    return None
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Polite crawl frontier for discovering new opportunities
+
+Takes seed URLs (from the Opportunity Scout agent or a seed file), respects
+robots.txt and per-domain rate limits, prioritizes links by predicted
+relevance to the user's profile, and persists its queue so a crawl can be
+stopped and resumed.
+
+Usage:
+    python crawl_frontier.py --seeds crawl_seeds.json --max-pages 50 [--ingest]
+"""
+
+import heapq
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from app_metrics import CRAWL_FRONTIER_SIZE, SCRAPE_REQUESTS
+from content_extractor import extract_main_content, extract_page_title
+from html_parsing import make_soup
+
+FRONTIER_STATE_FILE = Path("crawl_frontier.json")
+SEEDS_FILE = Path("crawl_seeds.json")
+
+USER_AGENT = "OpportunityMatcherBot/1.0 (+https://github.com/salmanowes2022/opportunity-matcher)"
+DEFAULT_DELAY_SECONDS = 2.0  # Minimum gap between two requests to the same domain
+MAX_DEPTH = 3
+MAX_PAGES_PER_DOMAIN = 200
+INGEST_THRESHOLD = 0.35  # Page relevance needed before a page is sent to the LLM extractor
+ROBOTS_RETRY_SECONDS = 300.0  # robots.txt answered 429/5xx or was unreachable: hold the domain this long
+MAX_IDLE_SECONDS = 60.0  # crawl() stops (state saved) rather than wait longer than this for any domain
+
+# Terms that mark pages (and links) likely to describe an opportunity
+OPPORTUNITY_TERMS = {
+    "scholarship", "scholarships", "fellowship", "fellowships", "grant", "grants",
+    "funding", "award", "awards", "internship", "internships", "phd", "masters",
+    "master", "postgraduate", "graduate", "studentship", "eligibility", "apply",
+    "application", "deadline", "stipend", "tuition", "bursary", "program", "programme"
+}
+
+SKIP_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip", ".doc", ".docx",
+    ".xls", ".xlsx", ".ppt", ".pptx", ".mp4", ".mp3", ".css", ".js", ".ico"
+)
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+def profile_terms(profile) -> set:
+    """Keywords from a UserProfile used to predict link relevance"""
+    if profile is None:
+        return set()
+    text = " ".join([
+        profile.field_of_study or "",
+        profile.skills or "",
+        profile.goals or "",
+        profile.education_level or ""
+    ])
+    return {w for w in _words(text) if len(w) > 2}
+
+
+def score_relevance(text: str, terms: set) -> float:
+    """
+    Predicted relevance (0.0 to 1.0) of a page or link text
+
+    Half the score comes from opportunity vocabulary, half from overlap
+    with the profile's field, skills and goals.
+    """
+    words = set(_words(text))
+    if not words:
+        return 0.0
+
+    opportunity_hits = len(words & OPPORTUNITY_TERMS)
+    opportunity_score = min(opportunity_hits / 3.0, 1.0)
+
+    if not terms:
+        return opportunity_score
+
+    profile_hits = len(words & terms)
+    profile_score = min(profile_hits / 3.0, 1.0)
+    return 0.5 * opportunity_score + 0.5 * profile_score
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Absolute http(s) URL without fragment, or None if it should not be crawled"""
+    if base:
+        url = urljoin(base, url)
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    if parsed.path.lower().endswith(SKIP_EXTENSIONS):
+        return None
+    return url
+
+
+def domain_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+@dataclass
+class CrawledPage:
+    url: str
+    title: Optional[str]
+    text: str
+    relevance: float
+    depth: int
+    links: List[Tuple[str, str]] = field(default_factory=list)  # (url, anchor text)
+
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs to crawl with robots.txt and per-domain politeness
+
+    `session`, `clock` and `sleep` can be swapped out so the crawler runs
+    against a local fixture server without real waiting.
+    """
+
+    def __init__(
+        self,
+        state_file: Path = FRONTIER_STATE_FILE,
+        profile=None,
+        delay_seconds: float = DEFAULT_DELAY_SECONDS,
+        max_depth: int = MAX_DEPTH,
+        max_pages_per_domain: int = MAX_PAGES_PER_DOMAIN,
+        allowed_domains: Optional[Iterable[str]] = None,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.state_file = Path(state_file)
+        self.terms = profile_terms(profile)
+        self.delay_seconds = delay_seconds
+        self.max_depth = max_depth
+        self.max_pages_per_domain = max_pages_per_domain
+        self.allowed_domains = {d.lower() for d in allowed_domains} if allowed_domains else None
+        self.session = session or requests.Session()
+        # requests already sets its own User-Agent, so setdefault would keep it
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.clock = clock
+        self.sleep = sleep
+
+        self.queue: List[Tuple[float, int, str, int]] = []  # (-priority, seq, url, depth)
+        self.seen = set()
+        self.next_allowed: Dict[str, float] = {}
+        self.pages_per_domain: Dict[str, int] = {}
+        self.robots: Dict[str, Optional[RobotFileParser]] = {}
+        self.robots_retry_at: Dict[str, float] = {}  # Domains whose robots.txt was unavailable
+        self._seq = 0
+
+        self.load()
+
+    # Queue management
+
+    def add(self, url: str, priority: float = 1.0, depth: int = 0) -> bool:
+        """Queue a URL unless it was already seen or is out of scope"""
+        url = normalize_url(url)
+        if not url or url in self.seen or depth > self.max_depth:
+            return False
+        if self.allowed_domains is not None and domain_of(url) not in self.allowed_domains:
+            return False
+
+        self.seen.add(url)
+        self._seq += 1
+        heapq.heappush(self.queue, (-priority, self._seq, url, depth))
+        return True
+
+    def add_seeds(self, urls: Iterable[str], priority: float = 1.0) -> int:
+        added = sum(1 for url in urls if self.add(url, priority, 0))
+        self.save()
+        return added
+
+    def __len__(self):
+        return len(self.queue)
+
+    def next_url(self) -> Tuple[Optional[Tuple[str, int, float]], float]:
+        """
+        Pop the best URL whose domain may be fetched now
+
+        Returns ((url, depth, priority), 0) when one is ready, otherwise
+        (None, seconds until the earliest domain becomes available).
+        """
+        now = self.clock()
+        deferred = []
+        result = None
+        wait = float("inf")
+
+        while self.queue:
+            item = heapq.heappop(self.queue)
+            priority, _, url, depth = item
+            domain = domain_of(url)
+
+            if self.pages_per_domain.get(domain, 0) >= self.max_pages_per_domain:
+                continue  # Domain budget spent; drop it
+
+            ready_at = self.next_allowed.get(domain, 0.0)
+            if ready_at <= now:
+                result = (url, depth, -priority)
+                break
+
+            wait = min(wait, ready_at - now)
+            deferred.append(item)
+
+        for item in deferred:
+            heapq.heappush(self.queue, item)
+
+        if result:
+            return result, 0.0
+        return None, (wait if wait != float("inf") else 0.0)
+
+    # Politeness
+
+    def _robots_for(self, url: str) -> Optional[RobotFileParser]:
+        parsed = urlparse(url)
+        domain = parsed.netloc.lower()
+        if domain in self.robots and self.robots_retry_at.get(domain, float("inf")) > self.clock():
+            return self.robots[domain]
+
+        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        self.robots_retry_at.pop(domain, None)
+        try:
+            response = self.session.get(robots_url, timeout=10)
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code == 429 or response.status_code >= 500:
+                # Server trouble, not a missing file: stay off the whole domain and ask again later
+                parser.disallow_all = True
+                self.robots_retry_at[domain] = self.clock() + ROBOTS_RETRY_SECONDS
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except requests.RequestException:
+            # Unreachable robots.txt: be conservative and skip the domain for now
+            parser.disallow_all = True
+            self.robots_retry_at[domain] = self.clock() + ROBOTS_RETRY_SECONDS
+
+        self.robots[domain] = parser
+        return parser
+
+    def allowed(self, url: str) -> bool:
+        parser = self._robots_for(url)
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    def defer(self, url: str, depth: int, priority: float, until: float):
+        """Put a popped URL back and hold its domain until `until`"""
+        self.next_allowed[domain_of(url)] = max(self.next_allowed.get(domain_of(url), 0.0), until)
+        self._seq += 1
+        heapq.heappush(self.queue, (-priority, self._seq, url, depth))
+
+    def _domain_delay(self, url: str) -> float:
+        parser = self._robots_for(url)
+        crawl_delay = parser.crawl_delay(USER_AGENT) if parser else None
+        return max(self.delay_seconds, float(crawl_delay or 0))
+
+    # Fetching
+
+    def fetch(self, url: str, depth: int) -> Optional[CrawledPage]:
+        """Fetch and parse one page; returns None for non-HTML or failed fetches"""
+        domain = domain_of(url)
+        self.next_allowed[domain] = self.clock() + self._domain_delay(url)
+        self.pages_per_domain[domain] = self.pages_per_domain.get(domain, 0) + 1
+
+        try:
+            response = self.session.get(url, timeout=15)
+        except requests.RequestException:
+            SCRAPE_REQUESTS.labels("crawler", "fetch_error").inc()
+            return None
+        if response.status_code >= 400:
+            SCRAPE_REQUESTS.labels("crawler", "http_error").inc()
+            return None
+        if "html" not in response.headers.get("Content-Type", "html"):
+            SCRAPE_REQUESTS.labels("crawler", "not_html").inc()
+            return None
+        SCRAPE_REQUESTS.labels("crawler", "ok").inc()
+
+        soup = make_soup(response.content)
+        links = []
+        for a in soup.find_all("a", href=True):
+            if (a.get("rel") and "nofollow" in a.get("rel")):
+                continue
+            link = normalize_url(a["href"], base=response.url or url)
+            if link:
+                links.append((link, a.get_text(" ", strip=True)))
+
+        title = extract_page_title(soup)
+        text = extract_main_content(soup)  # Mutates soup, so links are read first
+        relevance = score_relevance(f"{title or ''} {text}", self.terms)
+
+        return CrawledPage(url=url, title=title, text=text, relevance=relevance, depth=depth, links=links)
+
+    def enqueue_links(self, page: CrawledPage) -> int:
+        """Queue outgoing links, prioritized by anchor/URL relevance and the parent page's relevance"""
+        added = 0
+        for link, anchor in page.links:
+            link_score = score_relevance(f"{anchor} {urlparse(link).path.replace('-', ' ').replace('/', ' ')}", self.terms)
+            priority = 0.6 * link_score + 0.4 * page.relevance - 0.1 * (page.depth + 1)
+            if self.add(link, priority, page.depth + 1):
+                added += 1
+        return added
+
+    def crawl(
+        self,
+        max_pages: int = 50,
+        on_page: Optional[Callable[[CrawledPage], None]] = None,
+        save_every: int = 5
+    ) -> List[CrawledPage]:
+        """
+        Crawl up to `max_pages` pages, sleeping when every queued domain is
+        rate limited. Stops early if the next domain is more than
+        MAX_IDLE_SECONDS away. `on_page` is called for each fetched page
+        (e.g. to ingest it). State is saved periodically so the crawl can
+        resume.
+        """
+        crawled = []
+        CRAWL_FRONTIER_SIZE.set_function(lambda: len(self.queue))
+        try:
+            while len(crawled) < max_pages and self.queue:
+                item, wait = self.next_url()
+                if item is None:
+                    if not self.queue or wait > MAX_IDLE_SECONDS:
+                        break
+                    self.sleep(wait)
+                    continue
+
+                url, depth, priority = item
+                if not self.allowed(url):
+                    domain = domain_of(url)
+                    if domain in self.robots_retry_at:
+                        self.defer(url, depth, priority, self.robots_retry_at[domain])
+                    continue
+
+                page = self.fetch(url, depth)
+                if page is None:
+                    continue
+
+                self.enqueue_links(page)
+                crawled.append(page)
+                if on_page:
+                    on_page(page)
+
+                if len(crawled) % save_every == 0:
+                    self.save()
+        finally:
+            self.save()
+
+        return crawled
+
+    # Persistence
+
+    def save(self):
+        state = {
+            "queue": [[-p, url, depth] for p, _, url, depth in sorted(self.queue)],
+            "seen": sorted(self.seen),
+            "next_allowed": self.next_allowed,
+            "pages_per_domain": self.pages_per_domain
+        }
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def load(self):
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.seen = set(state.get("seen", []))
+        self.next_allowed = state.get("next_allowed", {})
+        self.pages_per_domain = state.get("pages_per_domain", {})
+        for priority, url, depth in state.get("queue", []):
+            self._seq += 1
+            self.queue.append((-priority, self._seq, url, depth))
+        heapq.heapify(self.queue)
+
+
+def seeds_from_scout(scout_result, search_url_template: Optional[str] = None) -> List[str]:
+    """
+    Seed URLs from an OpportunityScoutResult
+
+    URLs mentioned anywhere in the result are used directly. Search queries
+    become seeds only when a search URL template (e.g. from the
+    CRAWL_SEARCH_URL env var, with a {query} placeholder) is configured.
+    """
+    from urllib.parse import quote_plus
+
+    search_url_template = search_url_template or os.environ.get("CRAWL_SEARCH_URL")
+    data = scout_result.model_dump() if hasattr(scout_result, "model_dump") else dict(scout_result)
+
+    seeds = re.findall(r"https?://[^\s\"'<>)\]]+", json.dumps(data))
+
+    if search_url_template:
+        for query in data.get("search_queries", []):
+            seeds.append(search_url_template.format(query=quote_plus(query.get("query", ""))))
+
+    return list(dict.fromkeys(seeds))
+
+
+def load_seed_file(path: Path = SEEDS_FILE) -> List[str]:
+    """Read seed URLs from a JSON list (or {"seeds": [...]}) file"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, "r") as f:
+        data = json.load(f)
+    return data.get("seeds", []) if isinstance(data, dict) else list(data)
+
+
+def ingest_page(page: CrawledPage, threshold: float = INGEST_THRESHOLD) -> bool:
+    """Send a relevant crawled page through LLM extraction into the opportunity database"""
+    if page.relevance < threshold or not page.text:
+        return False
+
+    from agents.web_scraper import extract_opportunity_from_text
+    from opportunities_storage import save_opportunity
+
+    try:
+        scraped = extract_opportunity_from_text(page.url, page.text)
+    except Exception:
+        return False
+
+    return save_opportunity({
+        "title": scraped.title,
+        "type": scraped.opp_type,
+        "description": scraped.description,
+        "requirements": scraped.requirements,
+        "deadline": scraped.deadline,
+        "provider": scraped.provider,
+        "funding": scraped.funding,
+        "link": page.url,
+        "source": "crawler"
+    })
+
+
+if __name__ == "__main__":
+    import argparse
+    from user_store import DEFAULT_USER_ID, load_profile
+
+    parser = argparse.ArgumentParser(description="Crawl seed URLs for new opportunities")
+    parser.add_argument("--seeds", type=Path, default=SEEDS_FILE, help="JSON file with seed URLs")
+    parser.add_argument("--state", type=Path, default=FRONTIER_STATE_FILE, help="Frontier state file (resumable)")
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=DEFAULT_DELAY_SECONDS, help="Seconds between requests per domain")
+    parser.add_argument("--ingest", action="store_true", help="Extract and save relevant pages to the database")
+    parser.add_argument("--user", default=DEFAULT_USER_ID, help="User whose profile guides link prioritization")
+    args = parser.parse_args()
+
+    profile = load_profile(args.user)
+
+    frontier = CrawlFrontier(state_file=args.state, profile=profile, delay_seconds=args.delay)
+    frontier.add_seeds(load_seed_file(args.seeds))
+
+    def report(page: CrawledPage):
+        saved = ingest_page(page) if args.ingest else False
+        print(f"[{page.relevance:.2f}] {page.url} {'-> saved' if saved else ''}")
+
+    pages = frontier.crawl(max_pages=args.max_pages, on_page=report)
+    print(f"Crawled {len(pages)} pages, {len(frontier)} URLs still queued ({args.state})")
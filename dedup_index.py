@@ -0,0 +1,209 @@
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEDUP_INDEX_FILE = Path("opportunities_dedup_index.json")
+
+NUM_PERM = 64  # MinHash signature length
+NUM_BANDS = 16  # LSH bands (4 rows each -> candidates from ~0.5 Jaccard up)
+DUPLICATE_THRESHOLD = 0.6  # Estimated Jaccard similarity to call it a duplicate
+# Record bookkeeping that belongs to the incoming record, never to the one it is merged into
+MERGE_SKIP_KEYS = ("id", "saved_at", "duplicate_of", "duplicate_similarity")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures stay comparable across runs and processes
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERM)
+]
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "for", "to", "in", "on", "at", "by", "with",
+    "is", "are", "be", "this", "that", "from", "as", "it", "its", "will", "your", "you"
+}
+
+
+def _tokens(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return [w for w in words if w not in STOPWORDS]
+
+
+def shingles(title: str, description: str) -> set:
+    """Word shingles for an opportunity: title words plus description 3-grams"""
+    features = {f"t:{w}" for w in _tokens(title)}
+
+    words = _tokens(description)
+    if len(words) < 3:
+        features.update(f"d:{w}" for w in words)
+    else:
+        features.update(f"d:{' '.join(words[i:i + 3])}" for i in range(len(words) - 2))
+
+    return features
+
+
+def _hash_feature(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(features: set) -> List[int]:
+    """MinHash signature of a feature set"""
+    if not features:
+        return [_MAX_HASH] * NUM_PERM
+
+    hashed = [_hash_feature(f) for f in features]
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def signature_for(opp: Dict) -> List[int]:
+    """MinHash signature for an opportunity record"""
+    return minhash(shingles(opp.get("title", ""), opp.get("description", "")))
+
+
+def estimated_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity from two signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class DedupIndex:
+    """
+    MinHash LSH index over opportunity title + description
+
+    Each signature is split into bands; records that share any band
+    bucket become candidates, so a lookup only compares against a
+    handful of records instead of the whole database.
+    """
+
+    def __init__(self, num_bands: int = NUM_BANDS, threshold: float = DUPLICATE_THRESHOLD):
+        self.num_bands = num_bands
+        self.rows = NUM_PERM // num_bands
+        self.threshold = threshold
+        self.signatures: Dict[int, List[int]] = {}
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], set] = {}
+
+    def _band_keys(self, signature: List[int]):
+        for band in range(self.num_bands):
+            start = band * self.rows
+            yield (band, tuple(signature[start:start + self.rows]))
+
+    def add(self, opp_id: int, signature: List[int]):
+        self.remove(opp_id)
+        self.signatures[opp_id] = signature
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, set()).add(opp_id)
+
+    def remove(self, opp_id: int):
+        signature = self.signatures.pop(opp_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(opp_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def candidates(self, signature: List[int]) -> set:
+        found = set()
+        for key in self._band_keys(signature):
+            found.update(self.buckets.get(key, ()))
+        return found
+
+    def find_duplicates(self, signature: List[int]) -> List[Tuple[int, float]]:
+        """Return (id, similarity) of indexed records above the threshold, best first"""
+        matches = []
+        for opp_id in self.candidates(signature):
+            similarity = estimated_similarity(signature, self.signatures[opp_id])
+            if similarity >= self.threshold:
+                matches.append((opp_id, similarity))
+        return sorted(matches, key=lambda m: m[1], reverse=True)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def to_dict(self) -> Dict:
+        return {
+            "num_perm": NUM_PERM,
+            "num_bands": self.num_bands,
+            "signatures": {str(k): v for k, v in self.signatures.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DedupIndex":
+        index = cls(num_bands=data.get("num_bands", NUM_BANDS))
+        for opp_id, signature in data.get("signatures", {}).items():
+            index.add(int(opp_id), signature)
+        return index
+
+    @classmethod
+    def build(cls, opportunities: List[Dict]) -> "DedupIndex":
+        index = cls()
+        for opp in opportunities:
+            if opp.get("id") is not None:
+                index.add(opp["id"], signature_for(opp))
+        return index
+
+
+def load_index(opportunities: Optional[List[Dict]] = None) -> DedupIndex:
+    """
+    Load the persisted index, rebuilding it from the given records when the
+    file is missing, unreadable, or out of sync with the database
+    """
+    index = None
+    if DEDUP_INDEX_FILE.exists():
+        try:
+            with open(DEDUP_INDEX_FILE, "r") as f:
+                data = json.load(f)
+            if data.get("num_perm") == NUM_PERM:
+                index = DedupIndex.from_dict(data)
+        except (OSError, ValueError):
+            index = None
+
+    if opportunities is not None:
+        ids = {opp.get("id") for opp in opportunities if opp.get("id") is not None}
+        if index is None or set(index.signatures) != ids:
+            index = DedupIndex.build(opportunities)
+            save_index(index)
+
+    return index or DedupIndex()
+
+
+def save_index(index: DedupIndex):
+    with open(DEDUP_INDEX_FILE, "w") as f:
+        json.dump(index.to_dict(), f)
+
+
+def merge_opportunity(existing: Dict, new: Dict) -> Dict:
+    """
+    Merge a near-duplicate into the existing record
+
+    Missing fields are filled from the new record, longer descriptions and
+    requirements win, and every source link is kept in `alternate_links`.
+    """
+    merged = dict(existing)
+
+    for key, value in new.items():
+        if key in MERGE_SKIP_KEYS or value in (None, "", "null"):
+            continue
+        current = merged.get(key)
+        if current in (None, "", "null", "Not specified"):
+            merged[key] = value
+        elif key in ("description", "requirements") and len(str(value)) > len(str(current)):
+            merged[key] = value
+
+    new_link = new.get("link")
+    if new_link and new_link != merged.get("link"):
+        links = merged.get("alternate_links", [])
+        if new_link not in links:
+            merged["alternate_links"] = links + [new_link]
+
+    merged["duplicate_count"] = merged.get("duplicate_count", 0) + 1
+    return merged
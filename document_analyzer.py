@@ -0,0 +1,352 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from langchain_openai import ChatOpenAI
+
+from app_cache import get_llm
+from app_metrics import BATCH_PENDING, batch_item_done
+from content_extractor import estimate_tokens
+from models import ChunkAnalysis, DocumentAnalysis
+from pdf_extractor import split_paragraphs
+from tracing import in_current_context, traced
+
+CHUNK_TOKENS = 1500  # Size of each map step; small enough that nothing gets truncated
+MAX_CONCURRENT_CHUNKS = 6
+CHUNK_RETRIES = 1
+SUMMARY_FACT_TOKENS = 3000  # Merged facts passed to the final suggestions step
+
+# Different spellings the model uses for the same field
+KEY_ALIASES = {
+    "cgpa": "gpa",
+    "cumulative_gpa": "gpa",
+    "grade_point_average": "gpa",
+    "overall_gpa": "gpa",
+    "full_name": "name",
+    "candidate_name": "name",
+    "student_name": "name",
+    "email_address": "email",
+    "phone_number": "phone",
+    "technical_skills": "skills",
+    "soft_skills": "skills",
+    "skill": "skills",
+    "language": "languages",
+    "work_experience": "experience",
+    "employment": "experience",
+    "employment_history": "experience",
+    "awards": "achievements",
+    "honors": "achievements",
+    "honours": "achievements",
+    "certification": "certifications",
+    "course": "courses",
+    "publication": "publications",
+    "project": "projects",
+    "degree_level": "degree",
+    "major": "field_of_study",
+    "field": "field_of_study"
+}
+
+# Keys whose values from different sections add up instead of competing
+LIST_KEYS = {
+    "skills", "languages", "experience", "education", "achievements", "certifications",
+    "courses", "publications", "projects", "activities", "volunteering", "references"
+}
+
+CHUNK_PROMPT = """You are reading section {index} of {total} of a document (CV, transcript, certificate, etc.).
+
+Extract every piece of key information in THIS section that matters for job or scholarship applications:
+name, contact details, degree, field of study, institution, GPA/grades, courses, skills,
+work experience, languages, test scores, awards, certifications, publications, projects, dates.
+
+Rules:
+- Use short snake_case keys (e.g. "gpa", "degree", "skills", "experience")
+- One fact per distinct value; do not invent facts that are not in the text
+- confidence is how clearly the text states the value (0.0 to 1.0)
+
+Document type hint: {hint}
+
+SECTION TEXT:
+{text}
+"""
+
+
+@dataclass
+class Chunk:
+    index: int
+    text: str
+
+    @property
+    def heading(self) -> str:
+        return self.text.split("\n", 1)[0][:60]
+
+
+def _split_long_paragraph(paragraph: str, max_tokens: int) -> List[str]:
+    """Split an oversized paragraph on lines, then sentences, keeping pieces under budget"""
+    pieces, current = [], ""
+    units = paragraph.splitlines() if "\n" in paragraph else re.split(r"(?<=[.!?])\s+", paragraph)
+    for unit in units:
+        while estimate_tokens(unit) > max_tokens:
+            # A single unbroken run of text: hard split on characters
+            head, unit = unit[:max_tokens * 4], unit[max_tokens * 4:]
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(head)
+        candidate = f"{current}\n{unit}" if current else unit
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = unit
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+@traced(category="parse")
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS) -> List[Chunk]:
+    """
+    Pack consecutive paragraphs into chunks of at most `max_tokens`
+
+    Chunk boundaries fall on paragraph and heading breaks so sections such
+    as "Education" or one semester of a transcript stay together. Every
+    character of the input ends up in exactly one chunk.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for paragraph in split_paragraphs(text):
+        pieces = [paragraph] if estimate_tokens(paragraph) <= max_tokens else _split_long_paragraph(paragraph, max_tokens)
+        for piece in pieces:
+            cost = estimate_tokens(piece)
+            if current and used + cost > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+    if current:
+        chunks.append("\n\n".join(current))
+    return [Chunk(index=i, text=c) for i, c in enumerate(chunks)]
+
+
+def normalize_key(key: str) -> str:
+    key = re.sub(r"[^a-z0-9]+", "_", (key or "").lower()).strip("_")
+    return KEY_ALIASES.get(key, key)
+
+
+def _normalize_value(value: str) -> str:
+    return " ".join((value or "").lower().split()).rstrip(".")
+
+
+def _split_list_value(value: str) -> List[str]:
+    return [item.strip() for item in re.split(r"[;\n]|,(?![^(]*\))", value) if item.strip()]
+
+
+def merge_chunk_analyses(results: List[Tuple[Chunk, Optional[ChunkAnalysis]]]) -> Dict[str, str]:
+    """
+    Deterministically merge per-chunk facts into one key_information dict
+
+    - keys are normalized (e.g. "CGPA" and "cumulative_gpa" both become "gpa")
+    - list-like keys (skills, experience, courses...) are unioned in
+      document order without duplicates
+    - for single-valued keys the value with the highest confidence wins,
+      then the one stated most often, then the earliest; every losing value
+      is kept under "<key>_alternatives" so no section is silently dropped
+
+    The output only depends on chunk order, never on completion order.
+    """
+    order: List[str] = []
+    values: Dict[str, List[Tuple[str, float, int]]] = {}
+
+    for chunk, analysis in sorted(results, key=lambda r: r[0].index):
+        if analysis is None:
+            continue
+        for fact in analysis.facts:
+            key = normalize_key(fact.key)
+            value = (fact.value or "").strip()
+            if not key or not value:
+                continue
+            if key not in values:
+                order.append(key)
+                values[key] = []
+            values[key].append((value, fact.confidence, chunk.index))
+
+    merged: Dict[str, str] = {}
+    for key in order:
+        entries = values[key]
+
+        if key in LIST_KEYS:
+            items, seen = [], set()
+            for value, _, _ in entries:
+                for item in _split_list_value(value):
+                    normalized = _normalize_value(item)
+                    if normalized not in seen:
+                        seen.add(normalized)
+                        items.append(item)
+            merged[key] = "; ".join(items)
+            continue
+
+        candidates: Dict[str, Dict] = {}
+        for value, confidence, index in entries:
+            normalized = _normalize_value(value)
+            candidate = candidates.setdefault(normalized, {"value": value, "confidence": 0.0, "count": 0, "first": index, "chunks": []})
+            candidate["confidence"] = max(candidate["confidence"], confidence)
+            candidate["count"] += 1
+            candidate["chunks"].append(index + 1)
+
+        ranked = sorted(candidates.values(), key=lambda c: (-c["confidence"], -c["count"], c["first"]))
+        merged[key] = ranked[0]["value"]
+        if len(ranked) > 1:
+            merged[f"{key}_alternatives"] = "; ".join(
+                f"{c['value']} (section {', '.join(map(str, c['chunks']))})" for c in ranked[1:]
+            )
+
+    return merged
+
+
+def _document_type(results: List[Tuple[Chunk, Optional[ChunkAnalysis]]], hint: Optional[str]) -> str:
+    if hint:
+        return hint
+    votes: Dict[str, int] = {}
+    for _, analysis in sorted(results, key=lambda r: r[0].index):
+        if analysis and analysis.document_type:
+            label = analysis.document_type.strip()
+            votes[label] = votes.get(label, 0) + max(len(analysis.facts), 1)
+    if not votes:
+        return "Unknown"
+    # Ties go to the label seen first (dicts keep insertion order)
+    return max(votes, key=votes.get)
+
+
+def _analyze_single(text: str, hint: Optional[str], llm: ChatOpenAI) -> DocumentAnalysis:
+    """Short documents fit in one call"""
+    prompt = f"""Analyze this document text and provide structured information.
+
+Document text:
+{text}
+
+Document type hint: {hint or 'None'}
+
+Provide:
+1. Document type (CV, transcript, certificate, etc.)
+2. Key information extracted (as a dictionary)
+3. Suggestions for the user
+4. Confidence score (0.0 to 1.0)
+
+Return as structured data."""
+
+    analysis = llm.with_structured_output(DocumentAnalysis, method="function_calling").invoke(prompt)
+    analysis.extracted_text = text
+    return analysis
+
+
+def _suggestions(key_information: Dict[str, str], document_type: str, llm: ChatOpenAI) -> str:
+    lines, used = [], 0
+    for key, value in key_information.items():
+        line = f"- {key}: {value}"
+        used += estimate_tokens(line)
+        if used > SUMMARY_FACT_TOKENS:
+            break
+        lines.append(line)
+
+    prompt = f"""This {document_type} was analyzed section by section. Key information found:
+
+{chr(10).join(lines)}
+
+In 3-5 short bullet points, suggest how the user can use this information in job and scholarship
+applications, and point out anything important that seems to be missing."""
+    return llm.invoke(prompt).content
+
+
+@traced(category="extract")
+def analyze_document_text(
+    text: str,
+    document_type_hint: Optional[str] = None,
+    max_workers: int = MAX_CONCURRENT_CHUNKS,
+    chunk_tokens: int = CHUNK_TOKENS
+) -> DocumentAnalysis:
+    """
+    Map-reduce analysis of a document of any length
+
+    The text is split into coherent chunks, key information is extracted
+    from all chunks concurrently (so latency stays about one call deep
+    regardless of length), merged deterministically, and a final short call
+    writes the suggestions. Chunks that fail after a retry are listed in
+    key_information["unprocessed_sections"] rather than skipped silently.
+    """
+    llm = get_llm(temperature=0, call_site="document_analysis")
+
+    chunks = chunk_text(text, chunk_tokens)
+    if len(chunks) <= 1:
+        return _analyze_single(text, document_type_hint, llm)
+
+    extractor = llm.with_structured_output(ChunkAnalysis)
+
+    def run(chunk: Chunk) -> Tuple[Chunk, Optional[ChunkAnalysis]]:
+        prompt = CHUNK_PROMPT.format(
+            index=chunk.index + 1,
+            total=len(chunks),
+            hint=document_type_hint or "Unknown",
+            text=chunk.text
+        )
+        analysis = None
+        for _ in range(CHUNK_RETRIES + 1):
+            try:
+                analysis = extractor.invoke(prompt)
+                break
+            except Exception:
+                continue
+        batch_item_done("document_chunks", analysis is not None)
+        return chunk, analysis
+
+    BATCH_PENDING.labels("document_chunks").inc(len(chunks))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        results = list(executor.map(in_current_context(run), chunks))
+
+    key_information = merge_chunk_analyses(results)
+    failed = [chunk for chunk, analysis in results if analysis is None]
+    if failed:
+        key_information["unprocessed_sections"] = "; ".join(
+            f"section {chunk.index + 1} ({chunk.heading})" for chunk in failed
+        )
+
+    document_type = _document_type(results, document_type_hint)
+
+    try:
+        suggestions = _suggestions(key_information, document_type, llm)
+    except Exception as e:
+        suggestions = f"Key information extracted from {len(chunks)} sections. Could not generate suggestions: {str(e)}"
+
+    confidences = [
+        fact.confidence
+        for _, analysis in results if analysis
+        for fact in analysis.facts
+    ]
+    coverage = (len(chunks) - len(failed)) / len(chunks)
+    confidence = (sum(confidences) / len(confidences) if confidences else 0.5) * coverage
+
+    return DocumentAnalysis(
+        document_type=document_type,
+        extracted_text=text,
+        key_information=key_information,
+        suggestions=suggestions,
+        confidence_score=round(min(max(confidence, 0.0), 1.0), 2)
+    )
+
+
+def document_digest(text: str, key_information: Optional[Dict[str, str]] = None, max_tokens: int = CHUNK_TOKENS * 2) -> str:
+    """
+    Text to hand a follow-up prompt: the document itself when it is short,
+    otherwise its merged key information (which covers every section).
+
+    Makes no model call. Pass the key_information of an earlier
+    analyze_document_text run; without it, long text falls back to an
+    extractive digest of its most informative sentences.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if not key_information:
+        from prompt_budget import digest_text
+        return digest_text(text, max_tokens)
+    return "\n".join(f"- {key}: {value}" for key, value in key_information.items())
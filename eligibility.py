@@ -0,0 +1,211 @@
+"""
+Hard eligibility rules, parsed from requirements once at ingest
+
+extract_constraints reads the requirements and description with
+patterns and picks out four kinds of rule:
+- the degree the candidate must already hold
+- a minimum GPA on a 4.0 scale
+- required languages, each an any-of group ("English or French"), with
+  tests implying a language (IELTS means English)
+- citizenship or residence rules
+
+Sentences that only express a preference ("preferred", "a plus") or
+are negated ("not required", "without", "ineligible") are ignored. Where the text allows more than one reading, the more
+permissive one wins, because a wrong skip costs more than a wasted
+evaluation.
+
+Enrichment stores the result on the record under "eligibility".
+EligibilityIndex, built with the catalog, uses it to skip opportunities
+a profile clearly can't apply to before any model call, and labels each
+skip with its reasons. Citizenship is recorded and shown but never
+filtered on, because profiles don't store a nationality. Unknown profile
+values (no GPA, education "Other") never cause a skip.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+CONSTRAINTS_VERSION = 2
+
+DEGREE_LEVELS = {"High School": 0, "Bachelor's": 1, "Master's": 2, "PhD": 3}
+_DEGREE_NAMES = {level: name for name, level in DEGREE_LEVELS.items()}
+_DEGREE_WORDS = (
+    (3, r"\bph\.?\s?d|\bdoctora(?:l|te)"),
+    (2, r"\bmaster'?s|\bmsc\b|\bm\.sc|\bmba\b|\bgraduate"),
+    (1, r"\bbachelor'?s|\bundergraduate|\bbsc\b|\bb\.sc|\buniversity")
+)
+_DEGREE = "|".join(pattern for _, pattern in _DEGREE_WORDS)
+_HOLDS_DEGREE = re.compile(
+    rf"(?:hold|have|possess|completed?|obtained|earned|with)\s+(?:an?\s+|the\s+)?(?:completed\s+)?(?P<a>{_DEGREE})\s+(?:degree|diploma)"
+    rf"|(?P<b>{_DEGREE})\s+(?:degree|diploma)\s+(?:is\s+|are\s+)?(?:required|mandatory|or equivalent)",
+    re.IGNORECASE
+)
+
+_GPA = re.compile(
+    r"(?:minimum|min\.?|at least|of at least|above|over)\s+(?:an?\s+)?(?:cumulative\s+|overall\s+)?(?:gpa|grade point average)\s*(?:of\s*)?[:=]?\s*(?P<a>\d(?:\.\d{1,2})?)"
+    r"|(?:gpa|grade point average)\s*(?:of\s*)?[:=]?\s*(?P<b>\d(?:\.\d{1,2})?)\s*(?:/\s*4(?:\.0)?\s*)?(?:or\s+(?:higher|above|better|more)|\+|minimum|min\b)"
+    r"|(?:gpa|grade point average)\s+(?:of\s+)?(?:at least|minimum(?:\s+of)?|no (?:less|lower) than)\s*(?P<c>\d(?:\.\d{1,2})?)",
+    re.IGNORECASE
+)
+_OTHER_SCALE = re.compile(r"\d(?:\.\d+)?\s*(?:/|out of)\s*(?:5|10|20|100)\b", re.IGNORECASE)
+
+LANGUAGES = (
+    "English", "German", "French", "Spanish", "Italian", "Portuguese", "Dutch", "Swedish", "Norwegian",
+    "Danish", "Finnish", "Polish", "Russian", "Turkish", "Arabic", "Hebrew", "Chinese", "Mandarin",
+    "Japanese", "Korean", "Hindi"
+)
+_LANGUAGE_TESTS = {
+    "ielts": "English", "toefl": "English", "cambridge english": "English", "pte academic": "English",
+    "duolingo english": "English", "testdaf": "German", "dsh": "German", "goethe-zertifikat": "German",
+    "delf": "French", "dalf": "French", "tcf": "French", "dele": "Spanish", "jlpt": "Japanese",
+    "hsk": "Chinese", "topik": "Korean"
+}
+_LANGUAGE_NAMES = "|".join(LANGUAGES)
+_LANGUAGE_NEED = re.compile(
+    rf"(?:fluen\w*|proficien\w*|native|command|knowledge|skills?|speak\w*|written and spoken)\s+(?:in\s+|of\s+)?(?:the\s+)?"
+    rf"(?P<a>(?:{_LANGUAGE_NAMES})(?:\s*(?:,|/|or)\s*(?:{_LANGUAGE_NAMES}))*)"
+    rf"|(?P<b>(?:{_LANGUAGE_NAMES})(?:\s*(?:,|/|or)\s*(?:{_LANGUAGE_NAMES}))*)\s+(?:language\s+)?(?:proficiency|fluency|skills|is required|required|at C1|at B2|level)",
+    re.IGNORECASE
+)
+_LANGUAGE_TEST = re.compile(r"\b(" + "|".join(re.escape(test) for test in _LANGUAGE_TESTS) + r")\b", re.IGNORECASE)
+_ALIASES = {"mandarin": "Chinese"}
+
+_CITIZENSHIP = re.compile(r"citizens?\b|citizenship|nationals?\b|nationality|permanent residen|residents? of", re.IGNORECASE)
+_SOFT = re.compile(r"prefer|desirable|advantage|a plus|ideally|nice to have|welcome|encouraged|recommended", re.IGNORECASE)
+# "not eligible", "no German required", "must not have completed": a rule that excludes, or isn't one
+_NEGATION = re.compile(r"\b(?:not|no|without|ineligible|never|cannot)\b|n't\b", re.IGNORECASE)
+_SENTENCE = re.compile(r"(?<=[.!?;])\s+|\s*\n+\s*")
+
+
+def _sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE.split(text or "") if sentence and sentence.strip()]
+
+
+def _degree_level(words: str) -> int:
+    return next(level for level, pattern in _DEGREE_WORDS if re.search(pattern, words, re.IGNORECASE))
+
+
+def _language(name: str) -> str:
+    name = name.strip().lower()
+    return _ALIASES.get(name, name.capitalize())
+
+
+def extract_constraints(requirements: str, description: str = "") -> Dict:
+    """Hard rules stated in an opportunity's text; stored on the record as "eligibility\""""
+    degree_levels, gpas, language_groups, citizenship = [], [], [], []
+    for sentence in _sentences(f"{requirements or ''}\n{description or ''}"):
+        if _SOFT.search(sentence) or _NEGATION.search(sentence):
+            continue
+
+        for match in _HOLDS_DEGREE.finditer(sentence):
+            degree_levels.append(_degree_level(match.group("a") or match.group("b")))
+
+        if not _OTHER_SCALE.search(sentence):
+            for match in _GPA.finditer(sentence):
+                value = float(match.group("a") or match.group("b") or match.group("c"))
+                if 0 < value <= 4.0:
+                    gpas.append(value)
+
+        for match in _LANGUAGE_NEED.finditer(sentence):
+            names = re.findall(_LANGUAGE_NAMES, match.group("a") or match.group("b"), re.IGNORECASE)
+            group = sorted({_language(name) for name in names})
+            if group and group not in language_groups:
+                language_groups.append(group)
+        # Tests named together are alternatives ("IELTS, TOEFL or DELF accepted")
+        group = sorted({_LANGUAGE_TESTS[test.lower()] for test in _LANGUAGE_TEST.findall(sentence)})
+        if group and group not in language_groups:
+            language_groups.append(group)
+
+        if _CITIZENSHIP.search(sentence) and sentence not in citizenship:
+            citizenship.append(sentence[:200])
+
+    # Every group must be met, so a group is redundant next to a narrower one inside it
+    language_groups = [
+        group for group in language_groups
+        if not any(other != group and set(other) < set(group) for other in language_groups)
+    ]
+    return {
+        "version": CONSTRAINTS_VERSION,
+        "min_degree": _DEGREE_NAMES[min(degree_levels)] if degree_levels else None,
+        "min_gpa": min(gpas) if gpas else None,
+        "languages": language_groups,
+        "citizenship": citizenship
+    }
+
+
+def record_constraints(opp: Dict) -> Dict:
+    """Stored constraints of a record, or parsed now for records not enriched yet"""
+    constraints = opp.get("eligibility")
+    if constraints and constraints.get("version") == CONSTRAINTS_VERSION:
+        return constraints
+    return extract_constraints(opp.get("requirements") or "", opp.get("description") or "")
+
+
+def _profile_languages(profile) -> set:
+    return {_language(name) for name in re.findall(_LANGUAGE_NAMES, profile.languages or "", re.IGNORECASE)}
+
+
+def check_eligibility(profile, constraints: Dict) -> List[str]:
+    """Why `profile` clearly can't apply; empty when it may be eligible"""
+    reasons = []
+    level = DEGREE_LEVELS.get(profile.education_level)
+    required = constraints.get("min_degree")
+    if level is not None and required and level < DEGREE_LEVELS[required]:
+        reasons.append(f"Requires a {required} degree (you have {profile.education_level})")
+
+    if profile.gpa and constraints.get("min_gpa") and profile.gpa < constraints["min_gpa"]:
+        reasons.append(f"Requires a GPA of at least {constraints['min_gpa']:g} (yours is {profile.gpa:g})")
+
+    spoken = _profile_languages(profile)
+    for group in constraints.get("languages") or []:
+        if not spoken.intersection(group):
+            reasons.append(f"Requires {' or '.join(group)} (you list {profile.languages or 'no languages'})")
+    return reasons
+
+
+class EligibilityIndex:
+    """
+    Constraints of a catalog, indexed for screening a profile against all
+    of it without visiting records that have no rule it breaks
+    """
+
+    def __init__(self, records: List[Dict]):
+        self.ids: List[Optional[int]] = [opp.get("id") for opp in records]
+        self.constraints: Dict[int, Dict] = {}
+        self.by_degree: Dict[int, List[int]] = {}
+        gpa_rules: List[Tuple[float, int]] = []
+        self.language_rules: List[int] = []
+
+        for position, opp in enumerate(records):
+            constraints = record_constraints(opp)
+            if constraints.get("min_degree"):
+                self.by_degree.setdefault(DEGREE_LEVELS[constraints["min_degree"]], []).append(position)
+            if constraints.get("min_gpa"):
+                gpa_rules.append((constraints["min_gpa"], position))
+            if constraints.get("languages"):
+                self.language_rules.append(position)
+            if constraints.get("min_degree") or constraints.get("min_gpa") or constraints.get("languages"):
+                self.constraints[position] = constraints
+
+        gpa_rules.sort()
+        self.gpa_thresholds = [gpa for gpa, _ in gpa_rules]
+        self.gpa_positions = [position for _, position in gpa_rules]
+
+    def screen(self, profile) -> Dict[int, List[str]]:
+        """Skip reasons by opportunity id, for every opportunity `profile` clearly can't apply to"""
+        candidates = set()
+        level = DEGREE_LEVELS.get(profile.education_level)
+        if level is not None:
+            for required, positions in self.by_degree.items():
+                if required > level:
+                    candidates.update(positions)
+        if profile.gpa:
+            candidates.update(self.gpa_positions[bisect_right(self.gpa_thresholds, profile.gpa):])
+        candidates.update(self.language_rules)
+
+        skipped = {}
+        for position in candidates:
+            reasons = check_eligibility(profile, self.constraints[position])
+            if reasons:
+                skipped[self.ids[position]] = reasons
+        return skipped
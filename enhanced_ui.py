@@ -213,4 +213,31 @@ def create_status_indicator(score):
         <div style="font-size: 1.2rem; font-weight: 600; color: {color};">{status}</div>
         <div style="font-size: 1.5rem; font-weight: 700; margin-top: 0.5rem;">{score:.1%}</div>
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+def paginate(total, key, page_sizes=(10, 25, 50)):
+    """
+    Page controls for a list of `total` items
+
+    Returns (offset, limit) for the current page so callers only query and
+    render one window of items. The page number is clamped when the page
+    size grows or the list shrinks.
+    """
+    if total <= page_sizes[0]:
+        return 0, page_sizes[0]
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        page_size = st.selectbox("Per page", page_sizes, key=f"{key}_page_size")
+    pages = max((total - 1) // page_size + 1, 1)
+
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with col2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+    with col3:
+        start = (page - 1) * page_size
+        st.caption(f"Showing {start + 1}-{min(start + page_size, total)} of {total}")
+
+    return (page - 1) * page_size, page_size
@@ -0,0 +1,176 @@
+"""
+Features precomputed for every saved opportunity
+
+save_opportunity hands each new or merged record to `enrich_later`. A
+background thread then computes the record's features and writes them
+back in one batch. The features are stored on the record under
+"features":
+- deadline_date: the deadline normalized to YYYY-MM-DD, or None for
+  rolling or unparseable deadlines
+- funding_value, funding_currency: the amount in `funding` (the first
+  one next to a currency, skipping years and durations) and its ISO
+  currency code
+- keywords: the most frequent content words of the title, description
+  and requirements
+- token_counts: tokens in the description and requirements
+- lexical_vector: L2-normalized term frequencies of the top terms, as a
+  sparse {term: weight} map
+
+The prompt digest (prompt_budget.make_digest) is stored under "digest",
+and the hard eligibility rules (eligibility.extract_constraints) under
+"eligibility".
+
+Consumers read these and fall back to parsing the raw text for records
+that haven't been enriched yet. Records saved before this existed are
+enriched by the backfill:
+
+    python enrichment.py --backfill [--force]
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from math import sqrt
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app_metrics import STAGE_ERRORS
+from dedup_index import STOPWORDS
+from eligibility import extract_constraints
+from prompt_budget import count_tokens, make_digest
+
+FEATURES_VERSION = 5
+KEYWORDS = 15
+VECTOR_TERMS = 50
+
+_DATE_FORMATS = (
+    "%Y-%m-%d", "%Y/%m/%d", "%d.%m.%Y", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y",
+    "%B %d, %Y", "%B %d %Y", "%b %d, %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y",
+    "%B %Y", "%b %Y"
+)
+_ORDINAL = re.compile(r"(\d{1,2})(st|nd|rd|th)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z][a-z0-9+#-]{2,}")
+
+
+def parse_deadline(value) -> Optional[str]:
+    """A deadline string ("2026-03-15", "March 15th, 2026", "15/03/2026") as YYYY-MM-DD"""
+    if not isinstance(value, str):
+        return None
+    text = _ORDINAL.sub(r"\1", value.strip().rstrip("."))
+    text = re.sub(r"\s+", " ", text)
+    for fmt in _DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+        return parsed.isoformat()
+    return None
+
+
+def parse_funding_amount(value) -> Tuple[Optional[float], Optional[str]]:
+    """(amount, currency code) of a funding string; (None, None) without an amount"""
+    if not value:
+        return None, None
+    from intelligence.portfolio import parse_money
+    amount, currency = parse_money(str(value))
+    if not amount:
+        return None, None
+    return amount, currency
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD.findall((text or "").lower()) if word not in STOPWORDS]
+
+
+def lexical_vector(counts: Counter, size: int = VECTOR_TERMS) -> Dict[str, float]:
+    top = counts.most_common(size)
+    norm = sqrt(sum(count * count for _, count in top)) or 1.0
+    return {term: round(count / norm, 4) for term, count in top}
+
+
+def compute_features(opp: Dict) -> Dict:
+    """Everything stored under "features" for one record"""
+    description, requirements = opp.get("description") or "", opp.get("requirements") or ""
+    counts = Counter(_terms(f"{opp.get('title') or ''} {description} {requirements}"))
+    funding_value, funding_currency = parse_funding_amount(opp.get("funding"))
+    return {
+        "version": FEATURES_VERSION,
+        "deadline_date": parse_deadline(opp.get("deadline")),
+        "funding_value": funding_value,
+        "funding_currency": funding_currency,
+        "keywords": [term for term, _ in counts.most_common(KEYWORDS)],
+        "token_counts": {"description": count_tokens(description), "requirements": count_tokens(requirements)},
+        "lexical_vector": lexical_vector(counts)
+    }
+
+
+def enrich(opp: Dict) -> Dict:
+    """The fields enrichment adds to a record"""
+    return {
+        "features": compute_features(opp),
+        "digest": make_digest(opp.get("description") or "", opp.get("requirements") or ""),
+        "eligibility": extract_constraints(opp.get("requirements") or "", opp.get("description") or "")
+    }
+
+
+def needs_enrichment(opp: Dict) -> bool:
+    return (opp.get("features") or {}).get("version") != FEATURES_VERSION or not opp.get("digest")
+
+
+def enrich_records(opp_ids: Optional[Iterable[int]] = None, force: bool = False) -> int:
+    """Enrich saved records (all of them without `opp_ids`) in one write; returns how many changed"""
+    from opportunities_storage import update_opportunities
+
+    def update(opp: Dict) -> Optional[Dict]:
+        return enrich(opp) if force or needs_enrichment(opp) else None
+
+    return update_opportunities(update, opp_ids)
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enrichment")
+_pending: Set[int] = set()
+_pending_lock = threading.Lock()
+_draining = False
+_log = logging.getLogger("enrichment")
+
+
+def _drain():
+    global _draining
+    while True:
+        with _pending_lock:
+            opp_ids = set(_pending)
+            _pending.clear()
+            if not opp_ids:
+                _draining = False
+                return
+        try:
+            enrich_records(opp_ids, force=True)
+        except Exception:
+            # The records keep working unenriched; the next backfill retries them
+            _log.exception("Enriching %d opportunities failed", len(opp_ids))
+            STAGE_ERRORS.labels("enrichment").inc()
+
+
+def enrich_later(opp_ids: Iterable[int]):
+    """Queue records for enrichment on the background thread; ids saved meanwhile share one write"""
+    global _draining
+    with _pending_lock:
+        _pending.update(opp_ids)
+        if _draining:
+            return
+        _draining = True
+    _executor.submit(_drain)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute features for saved opportunities")
+    parser.add_argument("--backfill", action="store_true", help="Enrich records that are missing features, digests or eligibility rules")
+    parser.add_argument("--force", action="store_true", help="Recompute every record")
+    args = parser.parse_args()
+
+    if not (args.backfill or args.force):
+        parser.error("nothing to do: pass --backfill or --force")
+    print(f"Enriched {enrich_records(force=args.force)} opportunities")
@@ -0,0 +1,316 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup
+
+# lxml is a C parser and several times faster than the pure-Python html.parser
+try:
+    from lxml import etree as lxml_etree
+    HAS_LXML = True
+except ImportError:
+    lxml_etree = None
+    HAS_LXML = False
+
+PARSER_PREFERENCE = ["lxml", "html.parser"]
+
+# Block elements whose text is collected while streaming
+STREAM_BLOCK_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "td", "th", "dt", "dd", "blockquote", "pre"}
+
+# Elements that run inside a line of text; loose text outside block tags is
+# grouped by its nearest ancestor that is not one of these
+INLINE_TAGS = {
+    "a", "abbr", "b", "bdi", "bdo", "br", "cite", "code", "data", "dfn", "em", "font", "i", "kbd",
+    "label", "mark", "q", "s", "samp", "small", "span", "strong", "sub", "sup", "time", "u", "var", "wbr"
+}
+
+# Elements that never contain opportunity details (skipped with their subtree)
+BOILERPLATE_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "footer", "header", "aside", "form", "button", "select"
+}
+
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary"}
+
+# Class/id fragments that usually mark navigation, cookie banners, sidebars etc.
+BOILERPLATE_HINTS = re.compile(
+    r"(nav|menu|footer|header|sidebar|breadcrumb|cookie|consent|banner|social|share|"
+    r"newsletter|subscribe|related|comment|advert|promo|popup|modal|skip-link)",
+    re.IGNORECASE
+)
+
+# Class/id fragments that usually mark the article body
+CONTENT_HINTS = re.compile(
+    r"(content|article|main|post|entry|body|detail|description|scholarship|program|job)",
+    re.IGNORECASE
+)
+
+Markup = Union[str, bytes]
+
+# A streamed block: (tag name, text, characters inside links, class/id hint adjustment)
+StreamBlock = Tuple[str, str, int, float]
+
+
+def available_backends() -> List[str]:
+    """Parser backends usable in this environment, fastest first"""
+    return [b for b in PARSER_PREFERENCE if b != "lxml" or HAS_LXML]
+
+
+def default_backend() -> str:
+    """Fastest available parser backend"""
+    return available_backends()[0]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Use the requested backend if it is installed, otherwise fall back"""
+    if backend and backend in available_backends():
+        return backend
+    return default_backend()
+
+
+def make_soup(markup: Markup, backend: Optional[str] = None) -> BeautifulSoup:
+    """Parse markup into BeautifulSoup with the fastest available backend"""
+    return BeautifulSoup(markup, resolve_backend(backend))
+
+
+def _hint_adjustment(tag: str, attrs: dict) -> Optional[float]:
+    """
+    None when the element should be skipped entirely, otherwise the score
+    adjustment its class/id contributes to the blocks inside it
+    """
+    if tag in BOILERPLATE_TAGS or (attrs.get("role") or "") in BOILERPLATE_ROLES:
+        return None
+
+    hint = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+    if not hint.strip():
+        return 0.0
+    if BOILERPLATE_HINTS.search(hint):
+        if CONTENT_HINTS.search(hint) or tag in ("html", "body", "main", "article"):
+            return -1.0
+        return None
+    if CONTENT_HINTS.search(hint):
+        return 0.5
+    return 0.0
+
+
+class _StreamCollector:
+    """
+    Shared state machine for both streaming backends
+
+    Text inside block tags becomes a block when the tag closes. Text outside
+    them (bare <div>s, text beside a nested block) is gathered as a "div"
+    block until the next non-inline tag opens or closes, matching how
+    content_extractor groups it in the full parse.
+    """
+
+    def __init__(self):
+        self.skip_depth = 0  # >0 while inside a skipped subtree
+        self.stack: List[Tuple[str, Optional[float]]] = []
+        self.block: Optional[dict] = None
+        self.loose: Optional[dict] = None
+        self.link_depth = 0
+        self.title_parts: List[str] = []
+        self.in_title = False
+        self.og_title: Optional[str] = None
+        self.ready: List[StreamBlock] = []
+
+    def start(self, tag: str, attrs: dict):
+        tag = tag.lower()
+        if tag == "meta" and attrs.get("property") == "og:title" and attrs.get("content"):
+            self.og_title = attrs["content"].strip()
+        if tag in ("meta", "link", "br", "img", "input", "hr"):
+            return
+
+        if tag == "title":
+            self.in_title = True
+        if tag not in INLINE_TAGS and not self.skip_depth:
+            self._flush_loose()
+
+        adjustment = _hint_adjustment(tag, attrs)
+        self.stack.append((tag, adjustment))
+        if adjustment is None or self.skip_depth:
+            self.skip_depth += 1
+            return
+
+        if tag in STREAM_BLOCK_TAGS:
+            # A nested block closes the text collected so far by its parent
+            self._flush()
+            self.block = self._new_block(tag)
+        elif tag == "a":
+            self.link_depth += 1
+
+    def end(self, tag: str):
+        tag = tag.lower()
+        if tag == "title":
+            self.in_title = False
+        if tag not in INLINE_TAGS and not self.skip_depth:
+            self._flush_loose()
+
+        # Pop up to and including the matching start tag (tolerates unclosed tags)
+        if not any(t == tag for t, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, adjustment = self.stack.pop()
+            if adjustment is None or self.skip_depth:
+                self.skip_depth = max(self.skip_depth - 1, 0)
+            elif open_tag in STREAM_BLOCK_TAGS:
+                self._flush()
+            elif open_tag == "a":
+                self.link_depth = max(self.link_depth - 1, 0)
+            if open_tag == tag:
+                break
+
+    def data(self, text: str):
+        if self.in_title:
+            self.title_parts.append(text)
+            return
+        if self.skip_depth:
+            return
+        block = self.block
+        if block is None:
+            if self.loose is None:
+                if not text.strip():
+                    return
+                self.loose = self._new_block("div")
+            block = self.loose
+        block["parts"].append(text)
+        if self.link_depth:
+            block["link_chars"] += len(text.strip())
+
+    def _new_block(self, tag: str) -> dict:
+        return {"tag": tag, "parts": [], "link_chars": 0, "hint": sum(a for _, a in self.stack if a)}
+
+    def _emit(self, block: dict):
+        text = " ".join(" ".join(block["parts"]).split())
+        if len(text) >= 3:
+            self.ready.append((block["tag"], text, block["link_chars"], block["hint"]))
+
+    def _flush(self):
+        if self.block is not None:
+            self._emit(self.block)
+            self.block = None
+
+    def _flush_loose(self):
+        if self.loose is not None:
+            self._emit(self.loose)
+            self.loose = None
+
+    def finish(self):
+        self._flush()
+        self._flush_loose()
+
+    @property
+    def title(self) -> Optional[str]:
+        if self.og_title:
+            return self.og_title
+        title = " ".join("".join(self.title_parts).split())
+        return title or None
+
+
+class _StdlibStreamParser(HTMLParser):
+    def __init__(self, collector: _StreamCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class _LxmlTarget:
+    """SAX-style target for lxml's feed parser; no tree is built"""
+
+    def __init__(self, collector: _StreamCollector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, data):
+        self.collector.data(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return None
+
+
+class _LxmlStreamParser:
+    def __init__(self, collector: _StreamCollector):
+        self.parser = lxml_etree.HTMLParser(target=_LxmlTarget(collector), recover=True)
+
+    def feed(self, chunk: str):
+        self.parser.feed(chunk)
+
+    def close(self):
+        try:
+            self.parser.close()
+        except lxml_etree.XMLSyntaxError:
+            pass
+
+
+def iter_text_chunks(markup: Union[Markup, Iterable[Markup]], chunk_size: int = 16384) -> Iterator[str]:
+    """Normalise a document, or an iterable of str/bytes chunks, into text chunks"""
+    if isinstance(markup, (str, bytes)):
+        document = markup
+        chunks = (document[i:i + chunk_size] for i in range(0, len(document), chunk_size))
+    else:
+        chunks = markup
+
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+class StreamingBlockParser:
+    """
+    Incremental parser that yields leaf text blocks as soon as they close
+
+    Boilerplate subtrees (nav, footer, cookie banners...) are skipped
+    without being materialised, and callers can stop feeding at any
+    point once they have collected enough content.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = resolve_backend(backend)
+        self.collector = _StreamCollector()
+        if self.backend == "lxml":
+            self._parser = _LxmlStreamParser(self.collector)
+        else:
+            self._parser = _StdlibStreamParser(self.collector)
+
+    def feed(self, chunk: str) -> List[StreamBlock]:
+        self._parser.feed(chunk)
+        return self._take()
+
+    def close(self) -> List[StreamBlock]:
+        self._parser.close()
+        self.collector.finish()
+        return self._take()
+
+    def _take(self) -> List[StreamBlock]:
+        ready, self.collector.ready = self.collector.ready, []
+        return ready
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.collector.title
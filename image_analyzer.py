@@ -1,21 +1,42 @@
-from langchain_openai import ChatOpenAI
+from app_cache import DEFAULT_MODEL, get_llm
 from models import DocumentAnalysis
-import os
 import base64
-from io import BytesIO
-from PIL import Image
+from image_preprocessing import PreparedImage, preprocess_image
+from image_cache import get_image_cache
+from llm_telemetry import get_telemetry
+from tracing import traced
 
 def encode_image(image_bytes):
     """Convert image bytes to base64 string for API"""
     return base64.b64encode(image_bytes).decode('utf-8')
 
-def analyze_document_image(image_bytes, document_type_hint=None):
+@traced(category="extract")
+def analyze_document_image(image_bytes, document_type_hint=None, use_cache=True):
     """
     Analyze uploaded document image and extract relevant information
+
+    Accepts raw image bytes or an already preprocessed PreparedImage.
+    Repeat uploads of the exact same image are answered from the image
+    cache without an API call.
     """
     
-    # Encode image for API
-    base64_image = encode_image(image_bytes)
+    # Downscale/normalize before encoding; the model never sees more than ~2048x768
+    if isinstance(image_bytes, PreparedImage):
+        prepared = image_bytes
+        source_bytes = prepared.source or prepared.data
+    else:
+        prepared = None
+        source_bytes = image_bytes
+
+    cache = get_image_cache()
+    if use_cache:
+        cached = cache.get("document", source_bytes, document_type_hint)
+        if cached is not None:
+            get_telemetry().record_cache_hit("document_image_analysis", DEFAULT_MODEL)
+            return DocumentAnalysis(**cached)
+
+    if prepared is None:
+        prepared = preprocess_image(image_bytes, target="openai", document=True)
     
     system_prompt = """You are an expert document analyzer specializing in academic and professional documents.
 
@@ -53,11 +74,7 @@ Be specific and accurate. If text is unclear or partially obscured, note that in
 """
 
     # Create the model with vision capabilities
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",  # Supports vision
-        temperature=0.1,  # Low temperature for accuracy
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    llm = get_llm(temperature=0.1, call_site="document_image_analysis")
 
     try:
         # Create message with image
@@ -76,7 +93,7 @@ Be specific and accurate. If text is unclear or partially obscured, note that in
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{base64_image}",
+                            "url": prepared.data_url(),
                             "detail": "high"
                         }
                     }
@@ -102,6 +119,9 @@ Be specific and accurate. If text is unclear or partially obscured, note that in
             suggestions="Document analyzed. Review the extracted text and update your profile accordingly.",
             confidence_score=0.8
         )
+
+        if use_cache:
+            cache.put("document", source_bytes, result.model_dump(), document_type_hint)
         
         return result
         
@@ -114,10 +134,15 @@ Be specific and accurate. If text is unclear or partially obscured, note that in
             confidence_score=0.0
         )
 
-def extract_profile_info_from_text(extracted_text: str, current_profile=None):
+def extract_profile_info_from_text(extracted_text: str, current_profile=None, key_information=None):
     """
     Use AI to extract profile information from document text
+
+    Long documents are passed as `key_information`, the merged result of
+    the map-reduce analysis the caller already ran, instead of the full
+    text. Building the prompt makes no model call of its own.
     """
+    from document_analyzer import document_digest
     
     system_prompt = """You are an expert at extracting structured profile information from document text.
 
@@ -137,7 +162,7 @@ Return structured data that can be used to populate a user profile."""
 From this document text, extract profile information:
 
 DOCUMENT TEXT:
-{extracted_text}
+{document_digest(extracted_text, key_information)}
 
 CURRENT PROFILE (if any):
 {current_profile.model_dump() if current_profile else "No existing profile"}
@@ -146,11 +171,7 @@ Extract and structure the information. If current profile exists, suggest update
 Provide specific, actionable data that can be used to enhance the user's profile.
 """
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    llm = get_llm(temperature=0.2, call_site="profile_extraction")
 
     try:
         response = llm.invoke([
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app_metrics import CACHE_LOOKUPS
+
+IMAGE_CACHE_FILE = Path("image_analysis_cache.json")
+
+CACHE_VERSION = 2  # Entries from older versions are dropped on load
+MAX_ENTRIES = 200
+MAX_CACHE_BYTES = 5 * 1024 * 1024  # Serialized results kept on disk
+PHASH_MAX_DISTANCE = 4  # Differing bits (of 64) that still count as the same image
+ASPECT_TOLERANCE = 0.03  # Perceptual matches must also have (nearly) the same shape
+SIZE_TOLERANCE = 0.25  # ... and a file size within this fraction of each other
+FINGERPRINT_MEMO_SIZE = 64  # Recent uploads whose fingerprint is kept between lookup and put
+
+# Kinds whose near-duplicates may share a result. Documents are exact-only:
+# two CVs from the same template hash within a few bits of each other.
+PERCEPTUAL_KINDS = {"opportunity"}
+
+_HASH_SIZE = 8
+_DCT_SIZE = 32
+
+# cos((2x + 1) * u * pi / 2N) for the low-frequency rows the hash keeps
+_DCT_COEFFICIENTS = [
+    [math.cos((2 * x + 1) * u * math.pi / (2 * _DCT_SIZE)) for x in range(_DCT_SIZE)]
+    for u in range(_HASH_SIZE)
+]
+
+
+def content_hash(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def perceptual_hash(image_bytes: bytes) -> Optional[int]:
+    """64-bit perceptual hash, or None if the bytes are not a readable image"""
+    fingerprint = image_fingerprint(image_bytes)
+    return fingerprint[0] if fingerprint else None
+
+
+def image_fingerprint(image_bytes: bytes) -> Optional[Tuple[int, float]]:
+    """
+    64-bit DCT perceptual hash (pHash)
+
+    The image is reduced to 32x32 grayscale, transformed with a 2D DCT and
+    the 8x8 lowest frequencies are compared to their median. Re-compressed,
+    resized or re-photographed-at-the-same-angle copies land within a few
+    bits of each other. Returns (hash, aspect ratio), or None if the bytes
+    are not a readable image.
+    """
+    try:
+        with Image.open(BytesIO(image_bytes)) as img:
+            img.draft("L", (_DCT_SIZE * 4, _DCT_SIZE * 4))  # Fast JPEG downscale on decode
+            img = ImageOps.exif_transpose(img)
+            aspect = img.width / img.height
+            img = img.convert("L").resize((_DCT_SIZE, _DCT_SIZE), Image.LANCZOS)
+            pixels = list(img.getdata())
+    except (UnidentifiedImageError, OSError):
+        return None
+
+    rows = [pixels[i * _DCT_SIZE:(i + 1) * _DCT_SIZE] for i in range(_DCT_SIZE)]
+
+    # Separable DCT: rows first, then columns, keeping only the low frequencies
+    row_dct = [[sum(c * p for c, p in zip(coeffs, row)) for coeffs in _DCT_COEFFICIENTS] for row in rows]
+    low = [
+        sum(_DCT_COEFFICIENTS[v][y] * row_dct[y][u] for y in range(_DCT_SIZE))
+        for v in range(_HASH_SIZE)
+        for u in range(_HASH_SIZE)
+    ]
+
+    # The DC term only reflects overall brightness
+    median = sorted(low[1:])[len(low[1:]) // 2]
+    bits = 0
+    for value in low:
+        bits = (bits << 1) | (1 if value > median else 0)
+    return bits, aspect
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class ImageAnalysisCache:
+    """
+    Results of vision-model calls keyed by image content
+
+    Lookups try the exact SHA-256 of the upload first. For PERCEPTUAL_KINDS
+    they then try the nearest perceptual hash within `max_distance` bits,
+    but only among entries stored under the same `scope` (the user id) and
+    with nearly the same aspect ratio and file size; a close hash alone is
+    not taken to mean the same image. Entries are namespaced by `kind`,
+    `variant` (e.g. the document type hint) and `scope` so different
+    prompts and users never share near-matches. Least recently used entries
+    are evicted once the entry count or the serialized size exceeds its
+    bound.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[Path] = IMAGE_CACHE_FILE,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_CACHE_BYTES,
+        max_distance: int = PHASH_MAX_DISTANCE
+    ):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        # sha256 -> (pHash, aspect) of recent uploads, least recently used first
+        self._fingerprints: "OrderedDict[str, Optional[Tuple[int, float]]]" = OrderedDict()
+        self._fingerprints_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def _key(kind: str, variant: Optional[str], digest: str, scope: Optional[str] = None) -> str:
+        return f"{kind}:{variant or ''}:{scope or ''}:{digest}"
+
+    def _fingerprint_for(self, image_bytes: bytes) -> Tuple[str, Optional[Tuple[int, float]]]:
+        digest = content_hash(image_bytes)
+        with self._fingerprints_lock:
+            if digest in self._fingerprints:
+                self._fingerprints.move_to_end(digest)
+                return digest, self._fingerprints[digest]
+
+        fingerprint = image_fingerprint(image_bytes)
+        with self._fingerprints_lock:
+            self._fingerprints[digest] = fingerprint
+            while len(self._fingerprints) > FINGERPRINT_MEMO_SIZE:
+                self._fingerprints.popitem(last=False)
+        return digest, fingerprint
+
+    def lookup(
+        self, kind: str, image_bytes: bytes, variant: Optional[str] = None, scope: Optional[str] = None
+    ) -> Tuple[Optional[Any], str]:
+        """
+        Return (cached value, how it matched) where the match is "exact",
+        "perceptual" or "miss"
+        """
+        digest = content_hash(image_bytes)
+        with self._lock:
+            entry = self.entries.get(self._key(kind, variant, digest, scope))
+            if entry is not None:
+                CACHE_LOOKUPS.labels(f"image_{kind}", "hit").inc()
+                return self._hit(entry), "exact"
+
+        fingerprint = self._fingerprint_for(image_bytes)[1] if kind in PERCEPTUAL_KINDS else None
+        if fingerprint is not None:
+            phash, aspect = fingerprint
+            size = len(image_bytes)
+            with self._lock:
+                best, best_distance = None, self.max_distance + 1
+                for entry in self.entries.values():
+                    if entry["kind"] != kind or entry["variant"] != (variant or "") or entry["phash"] is None:
+                        continue
+                    if entry.get("scope", "") != (scope or "") or not entry.get("bytes"):
+                        continue
+                    if abs(entry["aspect"] - aspect) > ASPECT_TOLERANCE * aspect:
+                        continue
+                    if abs(entry["bytes"] - size) > SIZE_TOLERANCE * max(entry["bytes"], size):
+                        continue
+                    distance = hamming_distance(phash, int(entry["phash"], 16))
+                    if distance < best_distance:
+                        best, best_distance = entry, distance
+                if best is not None:
+                    CACHE_LOOKUPS.labels(f"image_{kind}", "hit").inc()
+                    return self._hit(best), "perceptual"
+
+        self.misses += 1
+        CACHE_LOOKUPS.labels(f"image_{kind}", "miss").inc()
+        return None, "miss"
+
+    def get(
+        self, kind: str, image_bytes: bytes, variant: Optional[str] = None, scope: Optional[str] = None
+    ) -> Optional[Any]:
+        return self.lookup(kind, image_bytes, variant, scope)[0]
+
+    def _hit(self, entry: Dict[str, Any]) -> Any:
+        self.hits += 1
+        entry["last_used"] = time.time()
+        return entry["value"]
+
+    def put(
+        self, kind: str, image_bytes: bytes, value: Any, variant: Optional[str] = None, scope: Optional[str] = None
+    ):
+        """Store a JSON-serializable result (dicts, or model_dump() of a pydantic model)"""
+        if kind in PERCEPTUAL_KINDS:
+            digest, fingerprint = self._fingerprint_for(image_bytes)
+        else:
+            digest, fingerprint = content_hash(image_bytes), None
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self.entries[self._key(kind, variant, digest, scope)] = {
+                "kind": kind,
+                "variant": variant or "",
+                "scope": scope or "",
+                "bytes": len(image_bytes),
+                "phash": f"{fingerprint[0]:016x}" if fingerprint else None,
+                "aspect": fingerprint[1] if fingerprint else None,
+                "value": value,
+                "size": size,
+                "created_at": now,
+                "last_used": now
+            }
+            self._evict()
+        self.save()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self.entries.values())
+        if len(self.entries) <= self.max_entries and total <= self.max_bytes:
+            return
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if len(self.entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= self.entries.pop(key)["size"]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+        self.save()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "bytes": sum(e["size"] for e in self.entries.values()),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def save(self):
+        if self.cache_file is None:
+            return
+        with self._lock:
+            data = json.dumps({"version": CACHE_VERSION, "entries": self.entries})
+        # Batch extraction saves from several threads; they share one tmp file
+        with self._save_lock:
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            with open(tmp_file, "w") as f:
+                f.write(data)
+            os.replace(tmp_file, self.cache_file)
+
+    def load(self):
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("entries", {})
+
+
+_cache: Optional[ImageAnalysisCache] = None
+
+
+def get_image_cache() -> ImageAnalysisCache:
+    """Process-wide cache shared by every Streamlit session"""
+    global _cache
+    if _cache is None:
+        _cache = ImageAnalysisCache()
+    return _cache
@@ -0,0 +1,163 @@
+import base64
+import time
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Largest image each vision model actually looks at, as (long side, short side).
+# OpenAI "high" detail fits the image in 2048x2048 and then scales the short
+# side to 768; Gemini tiles at 768px, so two tiles on the short side is plenty
+# for printed text. Anything bigger is only extra upload and server-side resizing.
+MODEL_RESOLUTION = {
+    "openai": (2048, 768),
+    "gemini": (1536, 1536)
+}
+
+JPEG_QUALITY = 85
+
+FORMAT_MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+    "GIF": "image/gif"
+}
+
+
+@dataclass
+class PreparedImage:
+    """Re-encoded image ready for a vision API, with payload measurements"""
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    original_size: int
+    original_dimensions: Tuple[int, int]
+    elapsed_ms: float
+    source: bytes = field(default=b"", repr=False)  # The original upload, e.g. for cache keys
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def reduction(self) -> float:
+        """Share of the original payload saved (0.0 when nothing was saved)"""
+        if not self.original_size:
+            return 0.0
+        return max(1 - self.size / self.original_size, 0.0)
+
+    def base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.base64()}"
+
+    def gemini_part(self) -> dict:
+        return {"mime_type": self.mime_type, "data": self.data}
+
+
+def detect_mime_type(image_bytes: bytes, default: str = "image/jpeg") -> str:
+    """MIME type from the image's actual format rather than its file name"""
+    try:
+        with Image.open(BytesIO(image_bytes)) as img:
+            return FORMAT_MIME_TYPES.get(img.format, default)
+    except (UnidentifiedImageError, OSError):
+        return default
+
+
+def _target_size(width: int, height: int, max_long: int, max_short: int) -> Tuple[int, int]:
+    scale = min(1.0, max_long / max(width, height), max_short / min(width, height))
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def _encode(img: Image.Image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == "PNG":
+        img.save(buffer, format="PNG", optimize=True)
+    else:
+        img.save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def preprocess_image(
+    image_bytes: bytes,
+    target: str = "openai",
+    document: bool = True,
+    max_size: Optional[Tuple[int, int]] = None
+) -> PreparedImage:
+    """
+    Shrink an uploaded image to what the vision model can actually use
+
+    - applies the EXIF orientation, so phone photos are not sent sideways
+    - downscales to the model's effective resolution
+    - for documents, converts to grayscale and stretches contrast, which
+      keeps text legible and compresses far better than colour photos
+    - re-encodes as JPEG (or PNG for screenshots/graphics when smaller)
+      and reports the real MIME type
+
+    If the image cannot be decoded the original bytes are returned unchanged.
+    """
+    start = time.perf_counter()
+    max_long, max_short = max_size or MODEL_RESOLUTION.get(target, MODEL_RESOLUTION["openai"])
+
+    try:
+        with Image.open(BytesIO(image_bytes)) as img:
+            source_format = img.format
+            original_dimensions = img.size
+            img.load()
+            orientation = img.getexif().get(0x0112, 1)
+            img = ImageOps.exif_transpose(img)
+    except (UnidentifiedImageError, OSError):
+        return PreparedImage(
+            data=image_bytes,
+            mime_type="image/jpeg",
+            width=0,
+            height=0,
+            original_size=len(image_bytes),
+            original_dimensions=(0, 0),
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            source=image_bytes
+        )
+
+    if img.mode in ("RGBA", "LA", "P"):
+        # Flatten transparency onto white so it does not turn black in JPEG
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        img = background
+
+    if document:
+        img = ImageOps.autocontrast(img.convert("L"), cutoff=1)
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    size = _target_size(img.width, img.height, max_long, max_short)
+    if size != img.size:
+        img = img.resize(size, Image.LANCZOS)
+
+    data, fmt = _encode(img, "JPEG"), "JPEG"
+    if source_format in ("PNG", "GIF"):
+        # Screenshots and flat graphics are usually smaller (and sharper) as PNG
+        png = _encode(img, "PNG")
+        if len(png) < len(data):
+            data, fmt = png, "PNG"
+
+    if len(data) >= len(image_bytes) and orientation == 1 and source_format in FORMAT_MIME_TYPES:
+        # Already small and upright; the model resizes it anyway, so keep the smaller original
+        data, fmt = image_bytes, source_format
+        width, height = original_dimensions
+    else:
+        width, height = img.size
+
+    return PreparedImage(
+        data=data,
+        mime_type=FORMAT_MIME_TYPES[fmt],
+        width=width,
+        height=height,
+        original_size=len(image_bytes),
+        original_dimensions=original_dimensions,
+        elapsed_ms=(time.perf_counter() - start) * 1000,
+        source=image_bytes
+    )
@@ -76,18 +76,21 @@ class IntelligenceMetrics:
     def calculate_roi_metrics(
         effort_hours: int,
         success_probability: float,
-        funding_amount: str = None
+        funding_amount: str = None,
+        funding_value: float = None
     ) -> Dict:
-        """Calculate return on investment for applications"""
-
-        # Parse funding if provided
-        funding_value = 0
-        if funding_amount:
-            # Simple extraction of numbers
-            import re
-            numbers = re.findall(r'\d+', funding_amount.replace(',', ''))
-            if numbers:
-                funding_value = int(numbers[0])
+        """
+        Calculate return on investment for applications
+
+        Pass `funding_value` from a record's features (computed at ingest)
+        to skip parsing `funding_amount`.
+        """
+
+        if funding_value is None:
+            # Parsed once per distinct string (cached)
+            from intelligence.portfolio import parse_funding
+            funding_value = parse_funding(funding_amount)
+        funding_value = int(funding_value)
 
         expected_value = funding_value * success_probability if funding_value else 0
         value_per_hour = expected_value / effort_hours if effort_hours > 0 else 0
@@ -0,0 +1,252 @@
+import re
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Hours to prepare one application, by opportunity type (research + materials + forms)
+EFFORT_HOURS_BY_TYPE = {
+    "Scholarship": 10.0,
+    "Fellowship": 12.0,
+    "Academic Program": 15.0,
+    "Job": 4.0,
+    "Internship": 4.0
+}
+DEFAULT_EFFORT_HOURS = 6.0
+
+# Manual process estimates, same as IntelligenceMetrics.calculate_time_saved
+RESEARCH_MINUTES = 30
+EVALUATION_MINUTES = 20
+MATERIAL_MINUTES = 120
+
+SCORE_BINS = np.linspace(0.0, 1.0, 11)
+URGENT_DAYS = 30
+
+# ISO code for each way a currency is written
+# Checked in order: CAD and AUD come before USD so "C$", "A$" and
+# "Canadian dollars" aren't read as US dollars
+CURRENCIES = (
+    ("CAD", r"\bcad\b|\bc\$|\bcanadian dollars?\b"),
+    ("AUD", r"\baud\b|\ba\$|\baustralian dollars?\b"),
+    ("USD", r"(?<![a-z])\$|\bus\$|\busd\b|\bus dollars?\b|\bdollars?\b"),
+    ("EUR", r"€|\beur\b|\beuros?\b"),
+    ("GBP", r"£|\bgbp\b|\bpounds?\b"),
+    ("CHF", r"\bchf\b|\bswiss francs?\b"),
+    ("JPY", r"¥|\bjpy\b|\byen\b"),
+    ("INR", r"₹|\binr\b|\brupees?\b")
+)
+_MONEY = re.compile(
+    r"(?P<pre>[$€£¥₹]|\b(?:usd|eur|gbp|chf|cad|aud|jpy|inr)\b|\b[ca]\$)?\s?"
+    r"(?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"\s*(?P<mult>k\b|m\b|million\b|thousand\b)?"
+    r"\s*(?P<post>usd|eur|gbp|chf|cad|aud|jpy|inr|(?:us )?dollars?|euros?|pounds?|rupees?|yen|(?:swiss )?francs?)?"
+    r"(?P<unit>\s*(?:years?|yrs?|months?|weeks?|days?|hours?|%|percent|students?|awards?|scholarships?|"
+    r"positions?|places?|people|recipients?|credits?|semesters?)\b)?",
+    re.IGNORECASE
+)
+_MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "m": 1e6, "million": 1e6}
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _currency_code(text: str) -> Optional[str]:
+    text = (text or "").lower()
+    return next((code for code, pattern in CURRENCIES if re.search(pattern, text)), None)
+
+
+@lru_cache(maxsize=4096)
+def parse_money(funding: Optional[str]) -> Tuple[float, Optional[str]]:
+    """
+    (amount, ISO currency) of a funding string, e.g. "3 years, $20,000" -> (20000.0, "USD")
+
+    Numbers written next to a currency win. Otherwise the first number that
+    isn't a duration, count or percentage ("3 years", "2 awards") or a bare
+    year is taken. Returns (0.0, None) when there is no amount ("Full
+    tuition", None). Cached, since the same few strings repeat across the
+    catalog and history.
+    """
+    if not funding:
+        return 0.0, None
+    text = str(funding)
+    candidates = []
+    for match in _MONEY.finditer(text):
+        value = float(match.group("num").replace(",", ""))
+        multiplier = _MULTIPLIERS.get((match.group("mult") or "").lower(), 1.0)
+        currency = match.group("pre") or match.group("post")
+        if match.group("unit") and not currency:
+            continue
+        if not currency and multiplier == 1.0 and value.is_integer() and 1900 <= value <= 2100:
+            continue  # A year ("for 2026/27")
+        candidates.append((value * multiplier, _currency_code(currency) if currency else None))
+    if not candidates:
+        return 0.0, None
+    amount, currency = next((c for c in candidates if c[1]), candidates[0])
+    return amount, currency or _currency_code(text)
+
+
+def parse_funding(funding: Optional[str]) -> float:
+    """The amount of a funding string ("$10,000", "€5k", "Up to 1.2M"); see parse_money"""
+    return parse_money(funding)[0]
+
+
+def _deadline(value) -> str:
+    value = (value or "").strip() if isinstance(value, str) else ""
+    return value if _ISO_DATE.match(value) else "NaT"
+
+
+@dataclass
+class PortfolioArrays:
+    """Column arrays over a set of opportunities, one row per opportunity"""
+    titles: List[str]
+    types: np.ndarray         # str
+    scores: np.ndarray        # float64, NaN when not evaluated
+    funding: np.ndarray       # float64, 0 when unknown
+    currencies: np.ndarray    # str ISO code of `funding`, "" when unknown
+    effort_hours: np.ndarray  # float64
+    deadlines: np.ndarray     # datetime64[D], NaT when unknown
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "PortfolioArrays":
+        """
+        Build from dicts with title, type, score, funding and deadline keys
+
+        Rows may also carry funding_value, funding_currency and
+        deadline_date, precomputed at ingest (enrichment); those are used
+        instead of parsing the text.
+        This is the only per-row Python loop; every metric afterwards is
+        computed on whole arrays.
+        """
+        titles, types, scores, funding, currencies, deadlines = [], [], [], [], [], []
+        for row in rows:
+            titles.append(row.get("title") or "")
+            types.append(row.get("type") or "Other")
+            score = row.get("score")
+            scores.append(np.nan if score is None else float(score))
+            if row.get("funding_value") is None:
+                amount, currency = parse_money(row.get("funding"))
+            else:
+                amount, currency = float(row["funding_value"]), row.get("funding_currency")
+            funding.append(amount)
+            currencies.append(currency or "")
+            deadlines.append(row.get("deadline_date") or _deadline(row.get("deadline")))
+
+        types_array = np.array(types, dtype=str)
+        effort = np.full(len(titles), DEFAULT_EFFORT_HOURS)
+        for opp_type, hours in EFFORT_HOURS_BY_TYPE.items():
+            effort[types_array == opp_type] = hours
+
+        return cls(
+            titles=titles,
+            types=types_array,
+            scores=np.array(scores, dtype=np.float64),
+            funding=np.array(funding, dtype=np.float64),
+            currencies=np.array(currencies, dtype=str),
+            effort_hours=effort,
+            deadlines=np.array(deadlines, dtype="datetime64[D]")
+        )
+
+    @classmethod
+    def from_opportunities(cls, opportunities: Iterable[Dict], scores: Optional[Dict[str, float]] = None) -> "PortfolioArrays":
+        """Catalog records (opportunities_storage dicts), optionally with scores by title"""
+        scores = scores or {}
+        return cls.from_rows(
+            {**opp, **(opp.get("features") or {}), "score": scores.get(opp.get("title"))} for opp in opportunities
+        )
+
+
+def portfolio_metrics(portfolio: PortfolioArrays, num_materials: int = 0, today: Optional[date] = None) -> Dict:
+    """
+    Expected value, ROI per hour, score distribution, deadlines and time
+    saved for a whole portfolio in one vectorized pass
+
+    Money is never added up across currencies: funding, expected value and
+    value per hour are reported per currency under "by_currency" (key ""
+    for amounts with no recognizable currency), most common currency first.
+    """
+    n = len(portfolio)
+    evaluated = ~np.isnan(portfolio.scores)
+    scores = np.where(evaluated, portfolio.scores, 0.0)
+
+    expected_value = portfolio.funding * scores
+    value_per_hour = np.divide(
+        expected_value, portfolio.effort_hours,
+        out=np.zeros(n), where=portfolio.effort_hours > 0
+    )
+
+    histogram, _ = np.histogram(portfolio.scores[evaluated], bins=SCORE_BINS)
+
+    today = np.datetime64(today or date.today(), "D")
+    days_left = (portfolio.deadlines - today).astype("timedelta64[D]").astype(np.float64)
+    days_left[np.isnat(portfolio.deadlines)] = np.nan
+    with np.errstate(invalid="ignore"):
+        upcoming = days_left >= 0
+        urgent = upcoming & (days_left <= URGENT_DAYS)
+
+    type_names, type_index = np.unique(portfolio.types, return_inverse=True)
+    type_counts = np.bincount(type_index, minlength=len(type_names))
+
+    by_currency = {}
+    funded = portfolio.funding > 0
+    currency_names, currency_counts = np.unique(portfolio.currencies[funded], return_counts=True)
+    for currency in currency_names[np.argsort(-currency_counts, kind="stable")]:
+        rows = funded & (portfolio.currencies == currency)
+        hours = portfolio.effort_hours[rows & evaluated].sum()
+        best = int(np.argmax(np.where(rows, value_per_hour, -1.0)))
+        by_currency[str(currency)] = {
+            "count": int(rows.sum()),
+            "funding": float(portfolio.funding[rows].sum()),
+            "expected_value": float(expected_value[rows].sum()),
+            "expected_value_per_hour": float(expected_value[rows].sum() / hours) if hours else 0.0,
+            "best_value_per_hour": float(value_per_hour[best]),
+            "best_value_title": portfolio.titles[best] if value_per_hour[best] > 0 else None
+        }
+
+    evaluated_count = int(evaluated.sum())
+    minutes_saved = evaluated_count * (RESEARCH_MINUTES + EVALUATION_MINUTES) + num_materials * MATERIAL_MINUTES
+
+    return {
+        "opportunities": n,
+        "evaluated": evaluated_count,
+        "avg_score": float(scores[evaluated].mean()) if evaluated_count else 0.0,
+        "median_score": float(np.median(portfolio.scores[evaluated])) if evaluated_count else 0.0,
+        "score_histogram": histogram.tolist(),
+        "effort_hours": float(portfolio.effort_hours[evaluated].sum()),
+        "by_currency": by_currency,
+        "upcoming_deadlines": int(upcoming.sum()),
+        "urgent_deadlines": int(urgent.sum()),
+        "time_saved_hours": round(minutes_saved / 60, 1),
+        "by_type": {str(name): {"count": int(count)} for name, count in zip(type_names, type_counts)}
+    }
+
+
+def top_by_value_per_hour(portfolio: PortfolioArrays, k: int = 5, currency: Optional[str] = None) -> List[Dict]:
+    """
+    The k opportunities with the best expected value per hour of effort,
+    among those funded in `currency` ("" for unknown); amounts in different
+    currencies are never ranked against each other
+    """
+    if not len(portfolio):
+        return []
+    scores = np.nan_to_num(portfolio.scores)
+    value_per_hour = np.divide(
+        portfolio.funding * scores, portfolio.effort_hours,
+        out=np.zeros(len(portfolio)), where=portfolio.effort_hours > 0
+    )
+    if currency is not None:
+        value_per_hour[portfolio.currencies != currency] = 0.0
+    k = min(k, len(portfolio))
+    top = np.argpartition(-value_per_hour, k - 1)[:k]
+    top = top[np.argsort(-value_per_hour[top])]
+    return [
+        {
+            "title": portfolio.titles[i],
+            "value_per_hour": float(value_per_hour[i]),
+            "currency": str(portfolio.currencies[i]),
+            "score": float(scores[i])
+        }
+        for i in top if value_per_hour[i] > 0
+    ]
@@ -0,0 +1,93 @@
+"""
+LangChain callback that reports every chat model call to llm_telemetry
+
+Attached to the shared clients built by app_cache.get_llm, one handler per
+call site, so invoke, stream, structured output and chains are all
+recorded without touching the call sites. Kept apart from llm_telemetry
+so the dashboard can read telemetry without importing LangChain.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from llm_telemetry import LLMCall, begin_call, end_call, get_telemetry
+from tracing import span
+
+
+def _usage(response: LLMResult) -> Tuple[int, int, int]:
+    """(input, output, cached input) tokens of a chat response"""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0), cached or 0
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0), 0
+
+
+class TelemetryCallbackHandler(BaseCallbackHandler):
+    """
+    Records one LLMCall per chat model run
+
+    A `call_site` entry in the run's metadata (e.g. passed through
+    `config={"metadata": {...}}`) overrides the handler's call site.
+    """
+
+    def __init__(self, call_site: str):
+        self.call_site = call_site
+        self._runs: Dict[UUID, Tuple[LLMCall, float, Optional[LLMCall], Any]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ):
+        params = kwargs.get("invocation_params") or {}
+        call = LLMCall(
+            call_site=(metadata or {}).get("call_site", self.call_site),
+            model=params.get("model") or params.get("model_name") or "unknown"
+        )
+        llm_span = span(f"llm {call.call_site}", "llm", call_site=call.call_site, model=call.model)
+        # Sync runs call back on the requesting thread, so retries logged
+        # by the client while this run is active belong to it
+        self._runs[run_id] = (call, time.perf_counter(), begin_call(call), llm_span)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        call, start, previous, llm_span = run
+        call.input_tokens, call.output_tokens, call.cached_tokens = _usage(response)
+        call.model = (response.llm_output or {}).get("model_name") or call.model
+        self._finish(call, start, previous, llm_span)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        call, start, previous, llm_span = run
+        call.fail(error)
+        self._finish(call, start, previous, llm_span)
+
+    @staticmethod
+    def _finish(call: LLMCall, start: float, previous: Optional[LLMCall], llm_span):
+        end_call(previous)
+        call.latency = time.perf_counter() - start
+        get_telemetry().record(call)
+        llm_span.set(
+            model=call.model,
+            input_tokens=call.input_tokens,
+            output_tokens=call.output_tokens,
+            retries=call.retries,
+            outcome=call.outcome
+        )
+        llm_span.finish()
@@ -0,0 +1,350 @@
+"""
+Per-call accounting for every model request the app makes
+
+Each call records its call site, model, tokens (prompt, completion and
+provider-cached), latency, retries and outcome. Totals per call site are
+kept for all time, the last RECENT_CALLS calls are kept individually for
+rolling windows (latency percentiles and histograms over e.g. the last
+hour), and both are persisted to TELEMETRY_FILE.
+
+LangChain clients from app_cache.get_llm report here through
+llm_callbacks.TelemetryCallbackHandler; other clients (Gemini) wrap their
+request in `get_telemetry().track(...)`. Answers served from an app cache
+instead of a request are counted with record_cache_hit. Every record is
+also fed to app_metrics.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+from app_metrics import observe_llm_call
+from tracing import span
+
+TELEMETRY_FILE = Path("llm_telemetry.json")
+
+RECENT_CALLS = 2000  # Individual calls kept for rolling windows
+SAVE_INTERVAL = 5.0  # Seconds between writes to disk while calls are coming in
+LATENCY_BUCKETS = (0.5, 1, 2, 4, 8, 16, 32)  # Upper bounds in seconds; one more bucket for anything slower
+
+# USD per 1M tokens: (input, cached input, output). Matched by longest model name prefix
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gemini-2.0-flash": (0.10, 0.025, 0.40),
+    "gemini-1.5-flash": (0.075, 0.01875, 0.30)
+}
+
+_MAX_ERROR_LENGTH = 300
+
+
+def latency_bucket(seconds: float) -> int:
+    return bisect_left(LATENCY_BUCKETS, seconds)
+
+
+def latency_bucket_labels() -> List[str]:
+    labels, lower = [], 0
+    for upper in LATENCY_BUCKETS:
+        labels.append(f"{lower}-{upper}s")
+        lower = upper
+    return labels + [f">{lower}s"]
+
+
+def call_cost(model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimated USD cost of one call; 0 for models without a known price"""
+    name = (model or "").split("/")[-1]
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if name.startswith(prefix):
+            input_price, cached_price, output_price = MODEL_PRICES[prefix]
+            uncached = max(input_tokens - cached_tokens, 0)
+            return (uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1e6
+    return 0.0
+
+
+@dataclass
+class LLMCall:
+    """One model request (or one answer served from an app cache)"""
+    call_site: str
+    model: str
+    started_at: float = field(default_factory=time.time)
+    latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+    retries: int = 0
+    outcome: str = "ok"  # ok, error or cache_hit
+    error: Optional[str] = None
+
+    @property
+    def cost(self) -> float:
+        return call_cost(self.model, self.input_tokens, self.output_tokens, self.cached_tokens)
+
+    def fail(self, error: BaseException):
+        self.outcome = "error"
+        self.error = f"{type(error).__name__}: {error}"[:_MAX_ERROR_LENGTH]
+
+
+@dataclass
+class CallSiteStats:
+    """All-time totals for one call site"""
+    calls: int = 0  # Model requests, cache hits excluded
+    errors: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+    latency_total: float = 0.0
+    latency_histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    last_error: Optional[str] = None
+
+    def add(self, call: LLMCall):
+        if call.outcome == "cache_hit":
+            self.cache_hits += 1
+            return
+        self.calls += 1
+        self.retries += call.retries
+        self.input_tokens += call.input_tokens
+        self.output_tokens += call.output_tokens
+        self.cached_tokens += call.cached_tokens
+        self.cost += call.cost
+        self.latency_total += call.latency
+        self.latency_histogram[latency_bucket(call.latency)] += 1
+        if call.outcome == "error":
+            self.errors += 1
+            self.last_error = call.error
+
+    @property
+    def avg_latency(self) -> float:
+        return self.latency_total / self.calls if self.calls else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class LLMTelemetry:
+    """Thread-safe store of call records, shared by every session in the process"""
+
+    def __init__(
+        self,
+        telemetry_file: Optional[Path] = TELEMETRY_FILE,
+        max_recent: int = RECENT_CALLS,
+        save_interval: float = SAVE_INTERVAL
+    ):
+        self.telemetry_file = Path(telemetry_file) if telemetry_file else None
+        self.save_interval = save_interval
+        self.totals: Dict[str, CallSiteStats] = {}
+        self.recent: Deque[LLMCall] = deque(maxlen=max_recent)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._last_save = 0.0
+        self._dirty = False
+        self.load()
+
+    def record(self, call: LLMCall):
+        observe_llm_call(call)
+        with self._lock:
+            self.totals.setdefault(call.call_site, CallSiteStats()).add(call)
+            self.recent.append(call)
+            self._dirty = True
+        if time.time() - self._last_save >= self.save_interval:
+            self.save()
+
+    def record_cache_hit(self, call_site: str, model: str):
+        self.record(LLMCall(call_site=call_site, model=model, outcome="cache_hit"))
+
+    @contextmanager
+    def track(self, call_site: str, model: str) -> Iterator[LLMCall]:
+        """
+        Time a request made outside LangChain; set the token counts on the
+        yielded call. Exceptions are recorded as errors and re-raised.
+        """
+        call = LLMCall(call_site=call_site, model=model)
+        start = time.perf_counter()
+        previous = begin_call(call)
+        try:
+            with span(f"llm {call_site}", "llm", call_site=call_site, model=model) as llm_span:
+                yield call
+                llm_span.set(input_tokens=call.input_tokens, output_tokens=call.output_tokens)
+        except BaseException as e:
+            call.fail(e)
+            raise
+        finally:
+            end_call(previous)
+            call.latency = time.perf_counter() - start
+            self.record(call)
+
+    def summary(self, window: Optional[float] = None) -> Dict:
+        """
+        Per call site figures, most expensive first
+
+        Without a window these are all-time totals; with one (seconds) they
+        are computed from the individual calls made within it.
+        """
+        with self._lock:
+            if window is None:
+                sites = {name: stats for name, stats in self.totals.items()}
+                latencies = {}
+                for call in self.recent:
+                    if call.outcome != "cache_hit":
+                        latencies.setdefault(call.call_site, []).append(call.latency)
+            else:
+                since = time.time() - window
+                sites, latencies = {}, {}
+                for call in self.recent:
+                    if call.started_at < since:
+                        continue
+                    sites.setdefault(call.call_site, CallSiteStats()).add(call)
+                    if call.outcome != "cache_hit":
+                        latencies.setdefault(call.call_site, []).append(call.latency)
+
+        rows = []
+        for name, stats in sites.items():
+            site_latencies = sorted(latencies.get(name, []))
+            rows.append({
+                "call_site": name,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "error_rate": stats.error_rate,
+                "retries": stats.retries,
+                "cache_hits": stats.cache_hits,
+                "input_tokens": stats.input_tokens,
+                "output_tokens": stats.output_tokens,
+                "cached_tokens": stats.cached_tokens,
+                "cost": stats.cost,
+                "avg_latency": stats.avg_latency,
+                "p50_latency": _percentile(site_latencies, 0.5),
+                "p95_latency": _percentile(site_latencies, 0.95),
+                "latency_histogram": list(stats.latency_histogram),
+                "last_error": stats.last_error
+            })
+        rows.sort(key=lambda row: (row["cost"], row["calls"]), reverse=True)
+
+        histogram = [sum(counts) for counts in zip(*(row["latency_histogram"] for row in rows))] if rows else []
+        return {
+            "window_seconds": window,
+            "calls": sum(row["calls"] for row in rows),
+            "errors": sum(row["errors"] for row in rows),
+            "retries": sum(row["retries"] for row in rows),
+            "cache_hits": sum(row["cache_hits"] for row in rows),
+            "tokens": sum(row["input_tokens"] + row["output_tokens"] for row in rows),
+            "cost": sum(row["cost"] for row in rows),
+            "latency_histogram": histogram,
+            "call_sites": rows
+        }
+
+    def export_json(self) -> str:
+        """All-time totals, the last 24 hours and every retained call, as JSON"""
+        with self._lock:
+            calls = [asdict(call) for call in self.recent]
+        return json.dumps({
+            "exported_at": time.time(),
+            "latency_buckets": latency_bucket_labels(),
+            "all_time": self.summary(),
+            "last_24_hours": self.summary(window=24 * 3600),
+            "calls": calls
+        }, indent=2)
+
+    def clear(self):
+        with self._lock:
+            self.totals.clear()
+            self.recent.clear()
+            self._dirty = True
+        self.save()
+
+    def save(self):
+        if self.telemetry_file is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({
+                "version": 1,
+                "totals": {name: asdict(stats) for name, stats in self.totals.items()},
+                "recent": [asdict(call) for call in self.recent]
+            })
+            self._dirty = False
+            self._last_save = time.time()
+        with self._save_lock:
+            tmp_file = self.telemetry_file.with_suffix(".tmp")
+            with open(tmp_file, "w") as f:
+                f.write(data)
+            os.replace(tmp_file, self.telemetry_file)
+
+    def load(self):
+        if self.telemetry_file is None or not self.telemetry_file.exists():
+            return
+        try:
+            with open(self.telemetry_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") != 1:
+                return
+            totals = {name: CallSiteStats(**stats) for name, stats in data.get("totals", {}).items()}
+            recent = [LLMCall(**call) for call in data.get("recent", [])]
+        except (OSError, ValueError, TypeError):
+            return
+        self.totals = totals
+        self.recent.extend(recent)
+
+
+# The call in flight on each thread, so client retries can be attributed to it
+_active = threading.local()
+
+
+def begin_call(call: LLMCall) -> Optional[LLMCall]:
+    """Mark `call` as in flight on this thread; returns the one it replaces"""
+    previous = getattr(_active, "call", None)
+    _active.call = call
+    return previous
+
+
+def end_call(previous: Optional[LLMCall] = None):
+    _active.call = previous
+
+
+class _RetryCounter(logging.Handler):
+    """The OpenAI client logs each retry it makes; count them against the active call"""
+
+    def emit(self, record: logging.LogRecord):
+        call = getattr(_active, "call", None)
+        if call is not None and str(record.msg).startswith("Retrying request"):
+            call.retries += 1
+
+
+def _watch_retries():
+    logger = logging.getLogger("openai._base_client")
+    logger.addHandler(_RetryCounter(level=logging.INFO))
+    if logger.getEffectiveLevel() > logging.INFO:
+        logger.setLevel(logging.INFO)
+
+
+_telemetry: Optional[LLMTelemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> LLMTelemetry:
+    """Process-wide telemetry store, flushed to disk on exit"""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = LLMTelemetry()
+                _watch_retries()
+                atexit.register(_telemetry.save)
+    return _telemetry
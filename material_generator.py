@@ -1,17 +1,29 @@
-from langchain_openai import ChatOpenAI
-from models import UserProfile, Opportunity, ApplicationMaterial
-import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-def generate_application_material(
-    profile: UserProfile, 
-    opportunity: Opportunity, 
+from app_cache import get_llm
+from app_metrics import BATCH_PENDING, batch_item_done
+from models import UserProfile, Opportunity, ApplicationMaterial, MaterialReview
+from prompt_budget import MATERIAL_TOKENS, opportunity_fields
+from tracing import in_current_context, traced
+
+
+def count_words(text: str) -> int:
+    """Words in the material, counted locally rather than trusted from the model"""
+    return len(re.findall(r"\S+", text or ""))
+
+
+def _build_messages(
+    profile: UserProfile,
+    opportunity: Opportunity,
     material_type: str,
-    target_word_count: int = 500
-) -> ApplicationMaterial:
-    """
-    Generate application materials like cover letters, personal statements
-    """
-    
+    target_word_count: int,
+    text_only: bool = False
+) -> List[Dict]:
     # Different prompts for different material types
     prompts = {
         "cover_letter": {
@@ -54,6 +66,7 @@ def generate_application_material(
     prompt_config = prompts.get(material_type, prompts["cover_letter"])
     
     system_prompt = prompt_config["system"]
+    opp_text = opportunity_fields(opportunity, MATERIAL_TOKENS)
     
     human_prompt = f"""
 CANDIDATE PROFILE:
@@ -69,8 +82,8 @@ Goals: {profile.goals}
 OPPORTUNITY:
 Title: {opportunity.title}
 Type: {opportunity.opp_type}
-Description: {opportunity.description}
-Requirements: {opportunity.requirements}
+Description: {opp_text["description"]}
+Requirements: {opp_text["requirements"]}
 
 TASK:
 Write a {material_type.replace('_', ' ')} following this structure: {prompt_config["structure"]}
@@ -84,32 +97,44 @@ Requirements:
 4. Use professional but engaging tone
 5. Include specific examples and achievements
 6. Show genuine enthusiasm and fit
-
+"""
+    if text_only:
+        human_prompt += """
+Reply with the text of the material only: no title, no notes before or after it.
+"""
+    else:
+        human_prompt += """
 Also provide:
 - Key points you highlighted in the material
 - Suggestions for how the candidate could improve or customize further
 """
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.5,  # Slightly higher for more creative writing
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
-
-    chain = llm.with_structured_output(ApplicationMaterial)
-
-    # Format the messages (human_prompt already has all values formatted above)
-    messages = [
+    # human_prompt already has all values formatted above
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": human_prompt}
     ]
 
+
+@traced(category="materials")
+def generate_application_material(
+    profile: UserProfile, 
+    opportunity: Opportunity, 
+    material_type: str,
+    target_word_count: int = 500
+) -> ApplicationMaterial:
+    """
+    Generate application materials like cover letters, personal statements
+    """
+    llm = get_llm(temperature=0.5, call_site="material_generation")
+
+    chain = llm.with_structured_output(ApplicationMaterial)
+    messages = _build_messages(profile, opportunity, material_type, target_word_count)
+
     try:
         result = chain.invoke(messages)
         
-        # Count words in the generated content
-        word_count = len(result.content.split())
-        result.word_count = word_count
+        result.word_count = count_words(result.content)
         result.material_type = material_type
         
         return result
@@ -121,4 +146,244 @@ Also provide:
             word_count=0,
             key_points_highlighted=[],
             suggestions_for_improvement="Please check your API configuration and try again."
-        )
\ No newline at end of file
+        )
+
+
+def stream_application_material(
+    profile: UserProfile,
+    opportunity: Opportunity,
+    material_type: str,
+    target_word_count: int = 500
+) -> Iterator[str]:
+    """
+    Yield the text of the material as the model writes it
+
+    Same prompt as generate_application_material, but as plain text so the
+    first words arrive in about a second instead of after the whole
+    structured response. Follow with review_application_material() for the
+    key points and suggestions.
+    """
+    llm = get_llm(temperature=0.5, call_site="material_generation.stream")
+    messages = _build_messages(profile, opportunity, material_type, target_word_count, text_only=True)
+    for chunk in llm.stream(messages):
+        if chunk.content:
+            yield chunk.content
+
+
+@traced(category="materials")
+def review_application_material(
+    content: str,
+    opportunity: Opportunity,
+    material_type: str
+) -> MaterialReview:
+    """Key points the finished material highlights and how to improve it"""
+    llm = get_llm(temperature=0.3, call_site="material_review")
+    prompt = f"""Here is a {material_type.replace('_', ' ')} written for the {opportunity.opp_type} "{opportunity.title}".
+
+Requirements of the opportunity:
+{opportunity_fields(opportunity, MATERIAL_TOKENS, fields=("requirements",))["requirements"]}
+
+MATERIAL:
+{content}
+
+List the key points this material highlights (short phrases), and give concrete suggestions
+for how the candidate could improve or customize it further."""
+
+    try:
+        return llm.with_structured_output(MaterialReview).invoke(prompt)
+    except Exception as e:
+        return MaterialReview(
+            key_points_highlighted=[],
+            suggestions_for_improvement=f"Could not review the material: {str(e)}"
+        )
+
+
+def complete_streamed_material(content: str, review: MaterialReview, material_type: str) -> ApplicationMaterial:
+    """Assemble the ApplicationMaterial for streamed text once its review is in"""
+    return ApplicationMaterial(
+        material_type=material_type,
+        content=content,
+        word_count=count_words(content),
+        key_points_highlighted=review.key_points_highlighted,
+        suggestions_for_improvement=review.suggestions_for_improvement
+    )
+
+
+# Batch generation
+
+MAX_CONCURRENT_MATERIALS = 4
+DRAFT_REUSE_SIMILARITY = 0.35  # Requirement overlap (Jaccard) at which a draft is edited instead of rewritten
+
+_COMMON_WORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "are", "you", "your", "will", "have",
+    "has", "our", "their", "must", "should", "able", "who", "all", "any", "per", "least"
+}
+
+
+@dataclass
+class MaterialDraft:
+    """One material of a batch; `based_on` names the draft it was adapted from"""
+    opportunity: Opportunity
+    content: str = ""
+    word_count: int = 0
+    based_on: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def requirement_terms(opportunity: Opportunity) -> set:
+    words = re.findall(r"[a-z][a-z0-9+#]{2,}", f"{opportunity.requirements} {opportunity.description}".lower())
+    return {w for w in words if w not in _COMMON_WORDS}
+
+
+def draft_similarity(a: Opportunity, b: Opportunity) -> float:
+    """0 for different opportunity types, otherwise Jaccard overlap of requirement terms"""
+    if a.opp_type.strip().lower() != b.opp_type.strip().lower():
+        return 0.0
+    terms_a, terms_b = requirement_terms(a), requirement_terms(b)
+    if not terms_a or not terms_b:
+        return 0.0
+    return len(terms_a & terms_b) / len(terms_a | terms_b)
+
+
+def plan_drafts(
+    opportunities: List[Opportunity],
+    existing: Optional[List[MaterialDraft]] = None,
+    threshold: float = DRAFT_REUSE_SIMILARITY
+) -> List[Tuple[Opportunity, Optional[Union[int, MaterialDraft]]]]:
+    """
+    Decide, for each opportunity, what its material starts from
+
+    Returns (opportunity, base) pairs in input order, where base is None
+    (write from scratch), a MaterialDraft from an earlier batch, or the
+    index of a from-scratch opportunity in this batch. Each new target is
+    matched to its most similar candidate at or above `threshold`.
+    """
+    reusable = [draft for draft in (existing or []) if draft.ok and draft.content]
+    plan = []
+    anchors: List[int] = []
+    for i, opportunity in enumerate(opportunities):
+        candidates = [(draft_similarity(opportunity, d.opportunity), d) for d in reusable]
+        candidates += [(draft_similarity(opportunity, opportunities[a]), a) for a in anchors]
+        best = max(candidates, key=lambda c: c[0], default=(0.0, None))
+        if best[1] is not None and best[0] >= threshold:
+            plan.append((opportunity, best[1]))
+        else:
+            plan.append((opportunity, None))
+            anchors.append(i)
+    return plan
+
+
+def _edit_messages(draft: MaterialDraft, opportunity: Opportunity, material_type: str, target_word_count: int) -> List[Dict]:
+    opp_text = opportunity_fields(opportunity, MATERIAL_TOKENS)
+    return [
+        {"role": "system", "content": "You adapt application materials to a new opportunity, keeping everything that still applies."},
+        {"role": "user", "content": f"""This {material_type.replace('_', ' ')} was written for "{draft.opportunity.title}":
+
+{draft.content}
+
+Adapt it for this {opportunity.opp_type} instead:
+Title: {opportunity.title}
+Description: {opp_text["description"]}
+Requirements: {opp_text["requirements"]}
+
+Replace every name, detail and claim specific to the old opportunity, re-order the evidence so it
+answers the new requirements, and keep the candidate's facts unchanged. Target about
+{target_word_count} words. Reply with the text of the material only."""}
+    ]
+
+
+def _run(llm, messages: List[Dict], draft: MaterialDraft) -> MaterialDraft:
+    response = llm.invoke(messages)
+    draft.content = response.content.strip()
+    draft.word_count = count_words(draft.content)
+    usage = getattr(response, "usage_metadata", None) or {}
+    draft.input_tokens = usage.get("input_tokens", 0)
+    draft.output_tokens = usage.get("output_tokens", 0)
+    return draft
+
+
+@traced(category="materials")
+def generate_materials_batch(
+    profile: UserProfile,
+    opportunities: List[Opportunity],
+    material_type: str,
+    target_word_count: int = 500,
+    existing_drafts: Optional[List[MaterialDraft]] = None,
+    max_workers: int = MAX_CONCURRENT_MATERIALS,
+    on_done: Optional[Callable[[MaterialDraft], None]] = None
+) -> List[MaterialDraft]:
+    """
+    Write one material per opportunity, several at a time
+
+    Opportunities unlike anything drafted so far are written from scratch
+    first, concurrently. Each remaining one is then produced as an edit of
+    its closest draft (same type, overlapping requirements), which needs
+    neither the full profile nor the writing brief, also concurrently.
+    Failures are recorded per draft. Results come back in input order;
+    `on_done(draft)` is called from worker threads as each one finishes.
+    """
+    llm = get_llm(temperature=0.5, call_site="material_generation.batch")
+    plan = plan_drafts(opportunities, existing_drafts)
+    drafts = [MaterialDraft(opportunity=opportunity) for opportunity, _ in plan]
+
+    def write(i: int) -> MaterialDraft:
+        opportunity, base = plan[i]
+        draft = drafts[i]
+        try:
+            if base is None:
+                messages = _build_messages(profile, opportunity, material_type, target_word_count, text_only=True)
+            else:
+                source = drafts[base] if isinstance(base, int) else base
+                if source.ok and source.opportunity == opportunity:
+                    # Already drafted in an earlier batch
+                    draft.content, draft.word_count, draft.based_on = source.content, source.word_count, source.opportunity.title
+                    batch_item_done("materials", True)
+                    if on_done:
+                        on_done(draft)
+                    return draft
+                if not source.ok:
+                    # The draft to edit failed; fall back to writing this one from scratch
+                    messages = _build_messages(profile, opportunity, material_type, target_word_count, text_only=True)
+                else:
+                    draft.based_on = source.opportunity.title
+                    messages = _edit_messages(source, opportunity, material_type, target_word_count)
+            _run(llm, messages, draft)
+        except Exception as e:
+            draft.error = str(e)
+        batch_item_done("materials", draft.ok)
+        if on_done:
+            on_done(draft)
+        return draft
+
+    fresh = [i for i, (_, base) in enumerate(plan) if base is None]
+    edits = [i for i, (_, base) in enumerate(plan) if base is not None]
+    workers = max(1, min(max_workers, len(plan)))
+    BATCH_PENDING.labels("materials").inc(len(plan))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        write = in_current_context(write)
+        list(executor.map(write, fresh))
+        list(executor.map(write, edits))
+    return drafts
+
+
+def materials_zip(drafts: List[MaterialDraft], material_type: str) -> bytes:
+    """All successful drafts as .txt files in one zip archive"""
+    buffer = BytesIO()
+    used = set()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for draft in drafts:
+            if not draft.ok:
+                continue
+            stem = re.sub(r"[^A-Za-z0-9]+", "_", draft.opportunity.title).strip("_")[:60] or "opportunity"
+            name, n = f"{material_type}_{stem}.txt", 2
+            while name in used:
+                name, n = f"{material_type}_{stem}_{n}.txt", n + 1
+            used.add(name)
+            archive.writestr(name, draft.content)
+    return buffer.getvalue()
@@ -20,6 +20,7 @@ class Opportunity(BaseModel):
     description: str
     requirements: str
     deadline: Optional[str] = None
+    digest: Optional[Dict] = None  # Compact description/requirements from prompt_budget.make_digest
 
 class MatchResult(BaseModel):
     """AI evaluation result with structured output - ONLY for opportunity matching"""
@@ -36,6 +37,11 @@ class ApplicationMaterial(BaseModel):
     key_points_highlighted: List[str]
     suggestions_for_improvement: str
 
+class MaterialReview(BaseModel):
+    """Follow-up notes on a streamed application material"""
+    key_points_highlighted: List[str]
+    suggestions_for_improvement: str
+
 class DocumentAnalysis(BaseModel):
     """Analysis result from uploaded document images - ONLY for document analysis"""
     document_type: str  # "cv", "transcript", "certificate", "other"
@@ -45,4 +51,15 @@ class DocumentAnalysis(BaseModel):
     confidence_score: float  # 0.0 to 1.0
 
     class Config:
-        extra = "forbid"
\ No newline at end of file
+        extra = "forbid"
+
+class DocumentFact(BaseModel):
+    """One piece of key information found in a section of a document"""
+    key: str  # e.g. "gpa", "degree", "skills"
+    value: str
+    confidence: float  # 0.0 to 1.0
+
+class ChunkAnalysis(BaseModel):
+    """Key information from one chunk of a long document - ONLY for map-reduce document analysis"""
+    document_type: str  # Best guess from this chunk alone
+    facts: List[DocumentFact]
@@ -1,17 +1,27 @@
 import json
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional
 from datetime import datetime
 import streamlit as st
+from dedup_index import load_index, save_index, signature_for, merge_opportunity
+from eligibility import EligibilityIndex
+from tracing import traced
 
 OPPORTUNITIES_FILE = Path("opportunities_database.json")
 
+BROWSE_TYPES = ["Scholarship", "Job", "Academic Program"]  # Everything else counts as "Other"
+
+# Held for each read-modify-write of the file; enrichment writes from a background thread
+_write_lock = threading.RLock()
+
 def initialize_database():
     """Create empty database file if it doesn't exist"""
     if not OPPORTUNITIES_FILE.exists():
         with open(OPPORTUNITIES_FILE, 'w') as f:
             json.dump([], f)
 
+@traced(category="storage")
 def load_all_opportunities() -> List[Dict]:
     """Load all opportunities from JSON file"""
     try:
@@ -22,57 +32,206 @@ def load_all_opportunities() -> List[Dict]:
         st.error(f"Error loading opportunities: {str(e)}")
         return []
 
-def save_opportunity(opp_data: Dict) -> bool:
+@traced(category="storage")
+def save_opportunity(opp_data: Dict, on_duplicate: str = "merge") -> bool:
     """
     Save a new opportunity to database
-    Returns True if successful
+    Near-duplicates of a saved opportunity (same title/description from another
+    URL or image) are detected with the MinHash index:
+    - on_duplicate="merge": fold the new data into the existing record (default)
+    - on_duplicate="flag": save it anyway, marked with `duplicate_of`
+    - on_duplicate="allow": save it without checking
+    Returns True if successful. When a near-duplicate was found (merge or
+    flag), its id and similarity are set on opp_data as `duplicate_of` and
+    `duplicate_similarity`, so callers can tell a merge from a new record.
     """
     try:
-        opportunities = load_all_opportunities()
-        
-        # Add metadata
-        opp_data['saved_at'] = datetime.now().isoformat()
-        opp_data['id'] = len(opportunities) + 1
-        
-        opportunities.append(opp_data)
-        
-        with open(OPPORTUNITIES_FILE, 'w') as f:
-            json.dump(opportunities, f, indent=2)
-        
-        return True
+        with _write_lock:
+            opportunities = load_all_opportunities()
+            index = load_index(opportunities)
+            signature = signature_for(opp_data)
+
+            duplicates = index.find_duplicates(signature) if on_duplicate != "allow" else []
+            if duplicates:
+                existing_id, similarity = duplicates[0]
+
+                if on_duplicate == "merge":
+                    for i, opp in enumerate(opportunities):
+                        if opp.get('id') == existing_id:
+                            opportunities[i] = merge_opportunity(opp, opp_data)
+                            index.add(existing_id, signature_for(opportunities[i]))
+                            st.info(f"Merged with existing opportunity '{opp.get('title')}' ({similarity:.0%} similar)")
+                            break
+
+                    with open(OPPORTUNITIES_FILE, 'w') as f:
+                        json.dump(opportunities, f, indent=2)
+                    save_index(index)
+                    _invalidate_catalog()
+                    _enrich_later(existing_id)
+                    # Reported to the caller only, after the merge, so the stored record never points at itself
+                    opp_data['duplicate_of'] = existing_id
+                    opp_data['duplicate_similarity'] = round(similarity, 2)
+                    return True
+
+                opp_data['duplicate_of'] = existing_id
+                opp_data['duplicate_similarity'] = round(similarity, 2)
+
+            # Add metadata
+            opp_data['saved_at'] = datetime.now().isoformat()
+            opp_data['id'] = max((opp.get('id', 0) for opp in opportunities), default=0) + 1
+
+            opportunities.append(opp_data)
+
+            with open(OPPORTUNITIES_FILE, 'w') as f:
+                json.dump(opportunities, f, indent=2)
+
+            index.add(opp_data['id'], signature)
+            save_index(index)
+            _invalidate_catalog()
+            _enrich_later(opp_data['id'])
+
+            return True
     except Exception as e:
         st.error(f"Error saving opportunity: {str(e)}")
         return False
 
+def _enrich_later(opp_id: int):
+    # Deadline, funding, keywords, digest etc. are computed off the request path
+    from enrichment import enrich_later
+    enrich_later([opp_id])
+
+@traced(category="storage")
+def update_opportunities(update: Callable[[Dict], Optional[Dict]], opp_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Apply `update` to saved records (those in `opp_ids`, or all) in one write
+
+    `update(record)` returns the fields to set on it, or None to leave it
+    as is. Returns how many records changed. Errors propagate, since this
+    also runs off the script thread where st.error can't be shown.
+    """
+    wanted = set(opp_ids) if opp_ids is not None else None
+    with _write_lock:
+        opportunities = load_all_opportunities()
+        changed = 0
+        for opp in opportunities:
+            if wanted is not None and opp.get('id') not in wanted:
+                continue
+            fields = update(opp)
+            if fields:
+                opp.update(fields)
+                changed += 1
+        if changed:
+            with open(OPPORTUNITIES_FILE, 'w') as f:
+                json.dump(opportunities, f, indent=2)
+            _invalidate_catalog()
+    return changed
+
+@traced(category="storage")
 def delete_opportunity(opp_id: int) -> bool:
     """Delete opportunity by ID"""
     try:
-        opportunities = load_all_opportunities()
-        opportunities = [opp for opp in opportunities if opp.get('id') != opp_id]
+        with _write_lock:
+            opportunities = load_all_opportunities()
+            opportunities = [opp for opp in opportunities if opp.get('id') != opp_id]
         
-        with open(OPPORTUNITIES_FILE, 'w') as f:
-            json.dump(opportunities, f, indent=2)
+            with open(OPPORTUNITIES_FILE, 'w') as f:
+                json.dump(opportunities, f, indent=2)
+
+            index = load_index()
+            index.remove(opp_id)
+            save_index(index)
+            _invalidate_catalog()
         
-        return True
+            return True
     except Exception as e:
         st.error(f"Error deleting opportunity: {str(e)}")
         return False
 
-def search_opportunities(query: str) -> List[Dict]:
-    """Search opportunities by title or type"""
-    opportunities = load_all_opportunities()
-    query_lower = query.lower()
-    
+@st.cache_data(max_entries=32, show_spinner=False)
+def _search(query_lower: str, stamp) -> List[Dict]:
     return [
-        opp for opp in opportunities
+        opp for opp in reversed(_load_catalog()["opportunities"])
         if query_lower in opp.get('title', '').lower()
         or query_lower in opp.get('type', '').lower()
     ]
 
+def search_opportunities(query: str) -> List[Dict]:
+    """Search opportunities by title or type (cached per query until the database changes)"""
+    return _search(query.lower(), _file_stamp())
+
 def get_opportunity_by_id(opp_id: int) -> Optional[Dict]:
     """Get specific opportunity by ID"""
-    opportunities = load_all_opportunities()
-    for opp in opportunities:
-        if opp.get('id') == opp_id:
-            return opp
-    return None
\ No newline at end of file
+    return _load_catalog()["by_id"].get(opp_id)
+
+def list_opportunities() -> List[Dict]:
+    """
+    All opportunities in saved order, served from the cached catalog
+
+    For read-only use (matching, selection lists); the records are shared
+    across sessions, so copy before changing one.
+    """
+    return list(reversed(_load_catalog()["opportunities"]))
+
+def _file_stamp():
+    try:
+        stat = OPPORTUNITIES_FILE.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+@traced(category="storage")
+def _build_catalog(stamp) -> Dict:
+    """
+    Newest-first opportunity list with per-type position lists, id lookup,
+    counts and the eligibility index. One shared copy per process; `stamp` is the file's mtime and
+    size, so any save/delete produces a new key and a rebuild.
+    """
+    opportunities = list(reversed(load_all_opportunities()))
+    by_type: Dict[str, List[int]] = {}
+    for position, opp in enumerate(opportunities):
+        opp_type = opp.get('type') if opp.get('type') in BROWSE_TYPES else "Other"
+        by_type.setdefault(opp_type, []).append(position)
+
+    return {
+        "opportunities": opportunities,
+        "by_type": by_type,
+        "by_id": {opp.get('id'): opp for opp in opportunities},
+        "counts": {opp_type: len(positions) for opp_type, positions in by_type.items()},
+        "eligibility": EligibilityIndex(opportunities)
+    }
+
+def _invalidate_catalog():
+    # The file stamp already changes on write; clearing as well covers
+    # filesystems with coarse mtimes where a same-size rewrite keeps the stamp
+    _build_catalog.clear()
+    _search.clear()
+
+def _load_catalog() -> Dict:
+    initialize_database()
+    return _build_catalog(_file_stamp())
+
+def opportunity_counts() -> Dict[str, int]:
+    """Number of opportunities per browse type (Scholarship, Job, Academic Program, Other) and in total"""
+    catalog = _load_catalog()
+    counts = {opp_type: catalog["counts"].get(opp_type, 0) for opp_type in BROWSE_TYPES + ["Other"]}
+    counts["total"] = len(catalog["opportunities"])
+    return counts
+
+def ineligible_opportunities(profile) -> Dict[int, List[str]]:
+    """Opportunities `profile` clearly can't apply to, by id, with the reasons (see eligibility.py)"""
+    return _load_catalog()["eligibility"].screen(profile)
+
+def query_opportunities(opp_type: Optional[str] = None, limit: int = 10, offset: int = 0) -> List[Dict]:
+    """
+    One page of opportunities, newest first, optionally of a single browse type
+
+    Uses the cached per-type index, so a page costs O(limit) regardless of
+    how many opportunities are saved. Records are shared; do not mutate them.
+    """
+    catalog = _load_catalog()
+    if opp_type is None:
+        return catalog["opportunities"][offset:offset + limit]
+    positions = catalog["by_type"].get(opp_type, [])[offset:offset + limit]
+    return [catalog["opportunities"][p] for p in positions]
@@ -1,40 +1,28 @@
 import os
+import re
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
 import google.generativeai as genai
-from typing import Optional, Dict
 import streamlit as st
-import json
+from pydantic import ValidationError
 
-def setup_gemini():
-    """Initialize Gemini with API key"""
-    # Try environment variable first, then Streamlit secrets
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key and hasattr(st, 'secrets'):
-        api_key = st.secrets.get("GEMINI_API_KEY")
-    
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found. Please add it to your .env file or Streamlit secrets")
-    
-    genai.configure(api_key=api_key)
-    # Use the latest stable flash model that supports vision
-    return genai.GenerativeModel('models/gemini-2.0-flash')
-
-def extract_opportunity_from_image(image_bytes: bytes) -> Optional[Dict]:
-    """
-    Extract opportunity details from an image of a poster, flyer, or announcement
-    Returns dict with: title, type, description, requirements, deadline
-    """
-    
-    try:
-        model = setup_gemini()
-        
-        # Create image part for Gemini
-        image_part = {
-            "mime_type": "image/jpeg",
-            "data": image_bytes
-        }
-        
-        # Detailed extraction prompt
-        prompt = """You are analyzing an image that contains information about a scholarship, job posting, academic program, fellowship, or other opportunity.
+from app_metrics import BATCH_PENDING, batch_item_done
+from models import Opportunity
+from image_preprocessing import preprocess_image
+from image_cache import get_image_cache
+from llm_telemetry import get_telemetry
+from tracing import in_current_context, traced
+
+GEMINI_MODEL = 'models/gemini-2.0-flash'
+MAX_CONCURRENT_EXTRACTIONS = 4  # Parallel Gemini calls for batch uploads
+
+OPPORTUNITY_TYPES = ["Scholarship", "Job", "Academic Program", "Fellowship", "Internship", "Other"]
+
+EXTRACTION_PROMPT = """You are analyzing an image that contains information about a scholarship, job posting, academic program, fellowship, or other opportunity.
 
 Your task: Extract key information and return it as a JSON object.
 
@@ -57,7 +45,7 @@ Return ONLY valid JSON with this exact structure:
     "requirements": "string",
     "deadline": "YYYY-MM-DD or null",
     "provider": "string or null",
-    "funding": "string or null", 
+    "funding": "string or null",
     "location": "string or null",
     "link": "string or null"
 }
@@ -68,40 +56,223 @@ Rules:
 - Be thorough - extract ALL visible requirements
 - Preserve exact wording where important
 """
-        
-        # Generate content
-        response = model.generate_content([prompt, image_part])
-        
-        # Parse JSON response
-        response_text = response.text.strip()
-        
-        # Clean markdown code blocks if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        elif response_text.startswith("```"):
-            response_text = response_text[3:]
-        
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Parse JSON
-        extracted = json.loads(response_text)
-        
-        # Check for error
-        if "error" in extracted:
-            return None
-        
-        # Validate required fields
-        if not extracted.get("title") or not extracted.get("description"):
-            return None
-        
-        return extracted
-        
+
+OPTIONAL_FIELDS = ("provider", "funding", "location", "link")
+
+_model = None
+_model_lock = threading.Lock()
+
+
+class ExtractionError(ValueError):
+    """The model response could not be turned into a valid opportunity"""
+
+
+def _get_api_key() -> Optional[str]:
+    # Try environment variable first, then Streamlit secrets
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key and hasattr(st, 'secrets'):
+        try:
+            api_key = st.secrets.get("GEMINI_API_KEY")
+        except Exception:
+            api_key = None
+    return api_key
+
+
+def setup_gemini():
+    """
+    Gemini model handle, configured once per process
+
+    genai.configure() sets global client state, so it is only called the
+    first time; every extraction (and every worker thread) reuses the model.
+    """
+    global _model
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is None:
+            api_key = _get_api_key()
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY not found. Please add it to your .env file or Streamlit secrets")
+
+            genai.configure(api_key=api_key)
+            # Use the latest stable flash model that supports vision
+            _model = genai.GenerativeModel(GEMINI_MODEL)
+    return _model
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        value = "\n".join(f"- {item}" for item in value)
+    value = str(value).strip()
+    return None if value.lower() in ("", "null", "none", "n/a") else value
+
+
+def _normalize_type(value: Optional[str]) -> str:
+    value = (value or "").strip().lower()
+    for opp_type in OPPORTUNITY_TYPES:
+        if value == opp_type.lower() or value.rstrip("s") == opp_type.lower():
+            return opp_type
+    if value in ("program", "programme", "academic programme", "degree"):
+        return "Academic Program"
+    return "Other"
+
+
+@traced(category="parse")
+def parse_extraction(response_text: str) -> Dict:
+    """
+    Strictly parse a model response into an opportunity dict
+
+    Accepts bare JSON or JSON inside a markdown code fence, validates the
+    core fields against the Opportunity schema and returns the form-ready
+    dict (title, type, description, requirements, deadline, provider,
+    funding, location, link). Raises ExtractionError otherwise.
+    """
+    text = (response_text or "").strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        data = json.loads(text)
     except json.JSONDecodeError as e:
-        st.error(f"Failed to parse AI response as JSON: {str(e)}")
+        raise ExtractionError(f"Failed to parse AI response as JSON: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise ExtractionError("AI response is not a JSON object")
+    if "error" in data:
+        raise ExtractionError(str(data["error"]))
+
+    try:
+        opportunity = Opportunity(
+            title=_clean(data.get("title")) or "",
+            opp_type=_normalize_type(data.get("type") or data.get("opp_type")),
+            description=_clean(data.get("description")) or "",
+            requirements=_clean(data.get("requirements")) or "Not specified",
+            deadline=_clean(data.get("deadline"))
+        )
+    except ValidationError as e:
+        raise ExtractionError(f"Extracted data does not match the opportunity schema: {str(e)}")
+
+    if not opportunity.title or not opportunity.description:
+        raise ExtractionError("Extraction is missing a title or description")
+
+    extracted = {
+        "title": opportunity.title,
+        "type": opportunity.opp_type,
+        "description": opportunity.description,
+        "requirements": opportunity.requirements,
+        "deadline": opportunity.deadline
+    }
+    for key in OPTIONAL_FIELDS:
+        # Older prompts used "amount" for funding
+        extracted[key] = _clean(data.get(key) if key != "funding" else data.get("funding") or data.get("amount"))
+    return extracted
+
+
+@traced(category="extract")
+def extract_opportunity(image_bytes: bytes, use_cache: bool = True, user_id: Optional[str] = None) -> Dict:
+    """
+    Extract one opportunity from image bytes, raising on failure
+
+    Posters `user_id` uploaded before (including re-compressed copies) are
+    answered from the image cache without calling Gemini. Safe to call
+    from worker threads: nothing here touches the Streamlit UI.
+    """
+    cache = get_image_cache()
+    if use_cache:
+        cached = cache.get("opportunity", image_bytes, scope=user_id)
+        if cached is not None:
+            get_telemetry().record_cache_hit("opportunity_image_extraction", GEMINI_MODEL)
+            return cached
+
+    model = setup_gemini()
+
+    # Flyers are often colour graphics, so keep colour but shrink and fix orientation
+    prepared = preprocess_image(image_bytes, target="gemini", document=False)
+    if not prepared.width:
+        raise ExtractionError("File is not a readable image")
+
+    with get_telemetry().track("opportunity_image_extraction", GEMINI_MODEL) as call:
+        response = model.generate_content([EXTRACTION_PROMPT, prepared.gemini_part()])
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            call.input_tokens = usage.prompt_token_count or 0
+            call.output_tokens = usage.candidates_token_count or 0
+    extracted = parse_extraction(response.text)
+
+    if use_cache:
+        cache.put("opportunity", image_bytes, extracted, scope=user_id)
+
+    return extracted
+
+
+def extract_opportunity_from_image(
+    image_bytes: bytes, use_cache: bool = True, user_id: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    Extract opportunity details from an image of a poster, flyer, or announcement
+    Returns dict with: title, type, description, requirements, deadline
+    """
+    try:
+        return extract_opportunity(image_bytes, use_cache, user_id)
+    except ExtractionError as e:
+        st.error(str(e))
         return None
     except Exception as e:
         st.error(f"Error extracting opportunity from image: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+@dataclass
+class ImageExtraction:
+    """Outcome of one image in a batch: either `data` or `error` is set"""
+    name: str
+    data: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+
+ImageInput = Union[bytes, Tuple[str, bytes]]
+
+
+def extract_many(
+    images: Iterable[ImageInput],
+    max_workers: int = MAX_CONCURRENT_EXTRACTIONS,
+    use_cache: bool = True,
+    user_id: Optional[str] = None
+) -> List[ImageExtraction]:
+    """
+    Extract opportunities from several images in parallel
+
+    `images` holds raw bytes or (name, bytes) pairs. At most `max_workers`
+    Gemini calls run at once, and a failure on one image (unreadable,
+    not an opportunity, API error) is recorded on its result instead of
+    aborting the batch. Results come back in input order.
+    """
+    items = [
+        item if isinstance(item, tuple) else (f"image {i + 1}", item)
+        for i, item in enumerate(images)
+    ]
+    if not items:
+        return []
+
+    # Gemini is configured by the first cache miss (setup_gemini is locked and
+    # runs once), so a batch answered entirely from the cache needs no API key
+    def run(item: Tuple[str, bytes]) -> ImageExtraction:
+        name, image_bytes = item
+        try:
+            result = ImageExtraction(name=name, data=extract_opportunity(image_bytes, use_cache, user_id))
+        except Exception as e:
+            result = ImageExtraction(name=name, error=str(e))
+        batch_item_done("opportunity_images", result.ok)
+        return result
+
+    BATCH_PENDING.labels("opportunity_images").inc(len(items))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        return list(executor.map(in_current_context(run), items))
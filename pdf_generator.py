@@ -1,184 +1,362 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import BinaryIO, Callable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
 from models import UserProfile, Opportunity, MatchResult
+from score_aggregates import ScoreAggregate, STRONG_MATCH, GOOD_MATCH
+from tracing import traced
 
-def generate_evaluation_pdf(profile: UserProfile, opportunity: Opportunity, result: MatchResult):
-    """Generate a professional PDF report of the evaluation"""
-    
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
-    
-    # Get styles
+# Portfolio reports larger than this are rendered in chunks across worker processes
+# when there is more than one CPU. Sections render in ~13 ms per evaluation
+# in-process, while starting spawn workers (interpreter + reportlab import)
+# and merging costs ~1.5 s, so two workers only pay off from ~250 evaluations
+# (bench_pdf_reports.py --evaluations 150: 2.04 s in-process, 3.71 s pooled).
+PARALLEL_REPORT_THRESHOLD = 300
+REPORT_CHUNK_SIZE = 50
+
+Evaluation = Tuple[Opportunity, MatchResult]
+
+
+@lru_cache(maxsize=None)
+def _styles():
+    """Sample stylesheet plus the report styles, built once per process"""
     styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
         fontSize=20,
         spaceAfter=30,
         textColor=colors.HexColor('#1f4e79'),
         alignment=1  # Center alignment
-    )
-    
-    header_style = ParagraphStyle(
+    ))
+    styles.add(ParagraphStyle(
+        'ProfileTitle',
+        parent=styles['CustomTitle'],
+        fontSize=18
+    ))
+    styles.add(ParagraphStyle(
         'CustomHeader',
         parent=styles['Heading2'],
         fontSize=14,
         spaceBefore=20,
         spaceAfter=10,
         textColor=colors.HexColor('#2c5aa0')
-    )
+    ))
+    styles.add(ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=1
+    ))
+    styles.add(ParagraphStyle(
+        'Cell',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=11
+    ))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def _table_style(font_size: int, header_row: bool = False) -> TableStyle:
+    """Grid table style with a shaded label column (or header row)"""
+    shaded_end = (-1, 0) if header_row else (0, -1)
+    return TableStyle([
+        ('BACKGROUND', (0, 0), shaded_end, colors.HexColor('#f0f0f0')),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ])
+
+
+def _text(value) -> str:
+    # Model output and scraped text may contain &, < or > which reportlab
+    # would otherwise parse as markup (and fail on)
+    return escape(str(value or ""))
+
+
+def _recommendation_label(score: float) -> str:
+    return "Highly Recommended" if score >= STRONG_MATCH else "Recommended" if score >= GOOD_MATCH else "Consider Gaps"
+
+
+def _generated_line() -> Paragraph:
+    report_date = datetime.now().strftime("%B %d, %Y at %I:%M %p")
+    return Paragraph(f"<b>Generated:</b> {report_date}", _styles()['Normal'])
+
+
+def _profile_table(profile: UserProfile, with_name: bool = False, font_size: int = 10) -> Table:
+    profile_data = [
+        ['Education', f"{profile.education_level} in {profile.field_of_study}"],
+        ['GPA', str(profile.gpa) if profile.gpa else "Not provided"],
+        ['Experience', f"{profile.experience_years} years"],
+        ['Languages', profile.languages],
+        ['Key Skills' if not with_name else 'Skills', profile.skills]
+    ]
+    if with_name:
+        profile_data.insert(0, ['Name', profile.name])
+
+    profile_table = Table(profile_data, colWidths=[1.5*inch, 4.5*inch])
+    profile_table.setStyle(_table_style(font_size))
+    return profile_table
+
+
+def _analysis_flowables(opportunity: Opportunity, result: MatchResult) -> List:
+    """Opportunity details and the strengths / gaps / recommendation text"""
+    styles = _styles()
+    content = [Paragraph("Opportunity Details", styles['CustomHeader'])]
+    content.append(Paragraph(f"<b>Title:</b> {_text(opportunity.title)}", styles['Normal']))
+    content.append(Paragraph(f"<b>Type:</b> {_text(opportunity.opp_type)}", styles['Normal']))
+    if opportunity.deadline:
+        content.append(Paragraph(f"<b>Deadline:</b> {_text(opportunity.deadline)}", styles['Normal']))
+    content.append(Spacer(1, 15))
+
+    content.append(Paragraph("Detailed Analysis", styles['CustomHeader']))
+
+    content.append(Paragraph("<b>Your Strengths:</b>", styles['Normal']))
+    content.append(Paragraph(_text(result.strengths), styles['Normal']))
+    content.append(Spacer(1, 10))
+
+    content.append(Paragraph("<b>Areas to Address:</b>", styles['Normal']))
+    content.append(Paragraph(_text(result.gaps), styles['Normal']))
+    content.append(Spacer(1, 10))
+
+    content.append(Paragraph("<b>Recommendation:</b>", styles['Normal']))
+    content.append(Paragraph(_text(result.recommendation), styles['Normal']))
+    content.append(Spacer(1, 20))
+    return content
+
+
+@traced(category="report")
+def generate_evaluation_pdf(profile: UserProfile, opportunity: Opportunity, result: MatchResult):
+    """Generate a professional PDF report of the evaluation"""
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
+    styles = _styles()
     
     content = []
     
     # Title
-    content.append(Paragraph("Opportunity Matching Report", title_style))
+    content.append(Paragraph("Opportunity Matching Report", styles['CustomTitle']))
     content.append(Spacer(1, 20))
     
     # Report metadata
-    report_date = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-    content.append(Paragraph(f"<b>Generated:</b> {report_date}", styles['Normal']))
+    content.append(_generated_line())
     content.append(Spacer(1, 20))
     
     # Executive Summary
-    content.append(Paragraph("Executive Summary", header_style))
-    
-    score_color = "green" if result.compatibility_score >= 0.7 else "orange" if result.compatibility_score >= 0.5 else "red"
-    recommendation = "Highly Recommended" if result.compatibility_score >= 0.7 else "Recommended" if result.compatibility_score >= 0.5 else "Consider Gaps"
+    content.append(Paragraph("Executive Summary", styles['CustomHeader']))
     
     summary_data = [
         ['Candidate', profile.name],
         ['Opportunity', opportunity.title],
         ['Compatibility Score', f"{result.compatibility_score:.1%}"],
-        ['Recommendation', recommendation]
+        ['Recommendation', _recommendation_label(result.compatibility_score)]
     ]
     
     summary_table = Table(summary_data, colWidths=[2*inch, 4*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP')
-    ]))
+    summary_table.setStyle(_table_style(11))
     
     content.append(summary_table)
     content.append(Spacer(1, 20))
     
     # Candidate Profile
-    content.append(Paragraph("Candidate Profile", header_style))
-    
-    profile_data = [
-        ['Education', f"{profile.education_level} in {profile.field_of_study}"],
-        ['GPA', str(profile.gpa) if profile.gpa else "Not provided"],
-        ['Experience', f"{profile.experience_years} years"],
-        ['Languages', profile.languages],
-        ['Key Skills', profile.skills]
-    ]
-    
-    profile_table = Table(profile_data, colWidths=[1.5*inch, 4.5*inch])
-    profile_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP')
-    ]))
-    
-    content.append(profile_table)
+    content.append(Paragraph("Candidate Profile", styles['CustomHeader']))
+    content.append(_profile_table(profile))
     content.append(Spacer(1, 20))
     
-    # Opportunity Details
-    content.append(Paragraph("Opportunity Details", header_style))
-    content.append(Paragraph(f"<b>Title:</b> {opportunity.title}", styles['Normal']))
-    content.append(Paragraph(f"<b>Type:</b> {opportunity.opp_type}", styles['Normal']))
-    if opportunity.deadline:
-        content.append(Paragraph(f"<b>Deadline:</b> {opportunity.deadline}", styles['Normal']))
-    content.append(Spacer(1, 15))
-    
-    # Analysis Results
-    content.append(Paragraph("Detailed Analysis", header_style))
-    
-    content.append(Paragraph("<b>Your Strengths:</b>", styles['Normal']))
-    content.append(Paragraph(result.strengths, styles['Normal']))
-    content.append(Spacer(1, 10))
-    
-    content.append(Paragraph("<b>Areas to Address:</b>", styles['Normal']))
-    content.append(Paragraph(result.gaps, styles['Normal']))
-    content.append(Spacer(1, 10))
-    
-    content.append(Paragraph("<b>Recommendation:</b>", styles['Normal']))
-    content.append(Paragraph(result.recommendation, styles['Normal']))
-    content.append(Spacer(1, 20))
+    # Opportunity Details and Analysis Results
+    content.extend(_analysis_flowables(opportunity, result))
     
     # Footer
-    content.append(Paragraph("This report was generated by the Opportunity Matching Assistant", 
-                            ParagraphStyle('Footer', parent=styles['Normal'], 
-                                         fontSize=8, textColor=colors.grey, alignment=1)))
+    content.append(Paragraph("This report was generated by the Opportunity Matching Assistant", styles['Footer']))
     
     # Build PDF
     doc.build(content)
     buffer.seek(0)
     return buffer
 
+def _portfolio_cover(profile: UserProfile, evaluations: Sequence[Evaluation]) -> List:
+    """Title, candidate profile, batch totals and the ranked list of every evaluation"""
+    styles = _styles()
+    totals = ScoreAggregate.from_scores(
+        (result.compatibility_score, opportunity.opp_type) for opportunity, result in evaluations
+    )
+
+    content = [Paragraph("Opportunity Portfolio Report", styles['CustomTitle'])]
+    content.append(_generated_line())
+    content.append(Spacer(1, 20))
+
+    content.append(Paragraph("Candidate Profile", styles['CustomHeader']))
+    content.append(_profile_table(profile, with_name=True))
+    content.append(Spacer(1, 20))
+
+    content.append(Paragraph("Summary", styles['CustomHeader']))
+    summary_table = Table([
+        ['Opportunities Evaluated', str(totals.count)],
+        ['Average Score', f"{totals.avg_score:.1%}"],
+        ['Strong Matches (≥70%)', str(totals.count_at_least(STRONG_MATCH))],
+        ['Good Matches (50-69%)', str(totals.count_between(GOOD_MATCH, STRONG_MATCH))]
+    ], colWidths=[2.5*inch, 3.5*inch])
+    summary_table.setStyle(_table_style(11))
+    content.append(summary_table)
+    content.append(Spacer(1, 20))
+
+    content.append(Paragraph("All Matches, Best First", styles['CustomHeader']))
+    rows = [['#', 'Opportunity', 'Type', 'Score', 'Recommendation']]
+    for rank, (opportunity, result) in enumerate(evaluations, 1):
+        rows.append([
+            str(rank),
+            Paragraph(_text(opportunity.title), styles['Cell']),
+            Paragraph(_text(opportunity.opp_type), styles['Cell']),
+            f"{result.compatibility_score:.0%}",
+            _recommendation_label(result.compatibility_score)
+        ])
+    ranking = Table(rows, colWidths=[0.4*inch, 2.8*inch, 1.1*inch, 0.6*inch, 1.4*inch], repeatRows=1)
+    ranking.setStyle(_table_style(9, header_row=True))
+    content.append(ranking)
+    return content
+
+
+def _portfolio_sections(evaluations: Sequence[Evaluation], first_rank: int) -> List:
+    """One page per evaluation, numbered from first_rank"""
+    styles = _styles()
+    content = []
+    for rank, (opportunity, result) in enumerate(evaluations, first_rank):
+        content.append(PageBreak())
+        content.append(Paragraph(
+            f"#{rank} {_text(opportunity.title)} - {result.compatibility_score:.1%} "
+            f"({_recommendation_label(result.compatibility_score)})",
+            styles['Heading1']
+        ))
+        content.extend(_analysis_flowables(opportunity, result))
+    return content
+
+
+def _render(content: List, out: BinaryIO):
+    SimpleDocTemplate(out, pagesize=A4, topMargin=0.5*inch).build(content)
+
+
+def _footer() -> Paragraph:
+    return Paragraph("This report was generated by the Opportunity Matching Assistant", _styles()['Footer'])
+
+
+def _render_sections(evaluations: Sequence[Evaluation], first_rank: int, footer: bool = False) -> bytes:
+    # Runs in a worker process; styles are built once per worker and reused
+    buffer = BytesIO()
+    content = _portfolio_sections(evaluations, first_rank)
+    if footer:
+        content.append(_footer())
+    _render(content, buffer)
+    return buffer.getvalue()
+
+
+@traced(category="report")
+def write_portfolio_pdf(
+    profile: UserProfile,
+    evaluations: Sequence[Evaluation],
+    out: BinaryIO,
+    max_workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None
+):
+    """
+    Write one combined report for a set of evaluations (e.g. a batch match)
+    to a binary stream: a cover page ranking every match, then a page each
+
+    Evaluations are reported in the order given, so sort them first. Reports
+    above PARALLEL_REPORT_THRESHOLD evaluations on a machine with more than
+    one CPU are rendered in chunks of REPORT_CHUNK_SIZE across a process
+    pool and merged in order as they are written out. on_progress(done, total) is called from the calling thread
+    after each chunk.
+    """
+    evaluations = list(evaluations)
+    total = len(evaluations)
+
+    workers = max_workers or os.cpu_count() or 1
+    if total <= PARALLEL_REPORT_THRESHOLD or workers < 2:
+        content = _portfolio_cover(profile, evaluations) + _portfolio_sections(evaluations, 1)
+        content.append(_footer())
+        _render(content, out)
+        if on_progress:
+            on_progress(total, total)
+        return
+
+    from PyPDF2 import PdfReader, PdfWriter
+
+    starts = range(0, total, REPORT_CHUNK_SIZE)
+    chunks = [None] * len(starts)
+    done = 0
+
+    # spawn: forking a process that runs server threads (Streamlit) is unsafe
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {
+            pool.submit(_render_sections, evaluations[start:start + REPORT_CHUNK_SIZE], start + 1, i == len(starts) - 1): i
+            for i, start in enumerate(starts)
+        }
+
+        # The cover is rendered here while the workers render the sections
+        cover = BytesIO()
+        _render(_portfolio_cover(profile, evaluations), cover)
+
+        for future in as_completed(futures):
+            chunks[futures[future]] = future.result()
+            done = min(done + REPORT_CHUNK_SIZE, total)
+            if on_progress:
+                on_progress(done, total)
+
+    writer = PdfWriter()
+    for part in [cover.getvalue()] + chunks:
+        for page in PdfReader(BytesIO(part)).pages:
+            writer.add_page(page)
+    writer.write(out)
+
+
+def generate_portfolio_pdf(profile: UserProfile, evaluations: Sequence[Evaluation], max_workers: Optional[int] = None):
+    """Combined report for a set of evaluations, as a buffer like the other reports"""
+    buffer = BytesIO()
+    write_portfolio_pdf(profile, evaluations, buffer, max_workers=max_workers)
+    buffer.seek(0)
+    return buffer
+
+@traced(category="report")
 def generate_profile_summary_pdf(profile: UserProfile):
     """Generate a PDF summary of user profile"""
     
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
     
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        textColor=colors.HexColor('#1f4e79'),
-        alignment=1
-    )
+    styles = _styles()
     
     content = []
     
     # Title
-    content.append(Paragraph(f"Profile Summary - {profile.name}", title_style))
+    content.append(Paragraph(f"Profile Summary - {_text(profile.name)}", styles['ProfileTitle']))
     content.append(Spacer(1, 20))
     
     # Profile details in table format
-    profile_data = [
-        ['Name', profile.name],
-        ['Education', f"{profile.education_level} in {profile.field_of_study}"],
-        ['GPA', str(profile.gpa) if profile.gpa else "Not provided"],
-        ['Experience', f"{profile.experience_years} years"],
-        ['Languages', profile.languages],
-        ['Skills', profile.skills],
-    ]
-    
-    profile_table = Table(profile_data, colWidths=[1.5*inch, 4.5*inch])
-    profile_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP')
-    ]))
-    
-    content.append(profile_table)
+    content.append(_profile_table(profile, with_name=True, font_size=11))
     content.append(Spacer(1, 20))
     
     # Achievements
     content.append(Paragraph("Key Achievements", styles['Heading2']))
-    content.append(Paragraph(profile.achievements, styles['Normal']))
+    content.append(Paragraph(_text(profile.achievements), styles['Normal']))
     content.append(Spacer(1, 15))
     
     # Goals
     content.append(Paragraph("Goals & Aspirations", styles['Heading2']))
-    content.append(Paragraph(profile.goals, styles['Normal']))
+    content.append(Paragraph(_text(profile.goals), styles['Normal']))
     
     doc.build(content)
     buffer.seek(0)
@@ -0,0 +1,165 @@
+"""
+Token budgets for the opportunity text sent in prompts
+
+Prompts used to cut long fields at a fixed number of characters, or not
+at all. fit_fields counts tokens instead and splits a prompt's budget
+across its fields. Short fields are kept whole, and whatever they leave
+unused goes to the longer ones. A field that still doesn't fit is
+replaced by its digest. Only when even the digest is too long is it
+truncated, at a sentence boundary where possible.
+
+Digests are extractive, so no model call is needed. They keep the
+sentences of the description and requirements most likely to matter
+for matching: eligibility, requirements, amounts and dates. They are
+made once, when an opportunity is saved (opportunities_storage), and
+stored on the record under "digest". Opportunities that were never saved
+get a digest computed on the spot.
+
+Tokens are counted with tiktoken when its vocabulary can be loaded. It
+comes with langchain-openai but downloads the vocabulary on first use.
+Otherwise they are estimated from text length.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from content_extractor import estimate_tokens
+
+TOKEN_ENCODING = "o200k_base"  # gpt-4o family
+
+DIGEST_VERSION = 1
+DIGEST_TOKENS = {"description": 90, "requirements": 110}
+
+# Opportunity text (description + requirements) per prompt
+EVALUATION_TOKENS = 1500
+MATERIAL_TOKENS = 1200
+STRATEGIST_TOKENS = 110  # Per opportunity, up to 10 in one prompt
+SCOUT_TOKENS = 80  # Per top match, up to 3
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\s*\n+\s*|\s+(?=[-•*]\s)")
+_KEY_TERMS = re.compile(
+    r"eligib|requir|must|minimum|at least|open to|citizen|resident|nationalit|age|gpa|grade|degree|bachelor|"
+    r"master|phd|doctor|graduat|undergrad|experience|years?|language|english|ielts|toefl|deadline|apply|"
+    r"fund|stipend|tuition|salary|award|cover|grant|duration|month|remote|location|visa",
+    re.IGNORECASE
+)
+_FIGURES = re.compile(r"[$€£]\s?\d|\d")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """`text` cut to at most `max_tokens`, at the last sentence end in the final third when there is one"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is None:
+        cut = text[:max_tokens * 4 - 1]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens - 1])
+    boundary = max(cut.rfind(". "), cut.rfind(".\n"), cut.rfind("\n"))
+    if boundary > len(cut) * 2 // 3:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + "…"
+
+
+def _sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text or "") if sentence and sentence.strip()]
+
+
+def _sentence_score(sentence: str, position: int) -> float:
+    score = len(_KEY_TERMS.findall(sentence)) + 0.5 * min(len(_FIGURES.findall(sentence)), 3)
+    return score + (1.5 if position == 0 else 0.5 if position < 3 else 0.0)
+
+
+def digest_text(text: str, max_tokens: int) -> str:
+    """The highest scoring sentences of `text` that fit in `max_tokens`, in their original order"""
+    if count_tokens(text) <= max_tokens:
+        return text or ""
+    sentences = list(dict.fromkeys(_sentences(text)))  # Boilerplate often repeats
+    ranked = sorted(range(len(sentences)), key=lambda i: _sentence_score(sentences[i], i), reverse=True)
+
+    chosen, used = [], 0
+    for i in ranked:
+        tokens = count_tokens(sentences[i]) + 1
+        if used + tokens <= max_tokens:
+            chosen.append(i)
+            used += tokens
+    if not chosen:
+        return truncate_to_tokens(sentences[ranked[0]] if ranked else text, max_tokens)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def make_digest(description: str, requirements: str) -> Dict:
+    """Compact version of an opportunity's long fields, stored on its record at ingest"""
+    return {
+        "version": DIGEST_VERSION,
+        "description": digest_text(description, DIGEST_TOKENS["description"]),
+        "requirements": digest_text(requirements, DIGEST_TOKENS["requirements"])
+    }
+
+
+@lru_cache(maxsize=512)
+def _computed_digest(description: str, requirements: str) -> Dict:
+    return make_digest(description, requirements)
+
+
+def opportunity_digest(opportunity) -> Dict:
+    """The stored digest of an Opportunity (or record dict), or one computed now"""
+    if isinstance(opportunity, dict):
+        digest = opportunity.get("digest")
+        description, requirements = opportunity.get("description") or "", opportunity.get("requirements") or ""
+    else:
+        digest = opportunity.digest
+        description, requirements = opportunity.description or "", opportunity.requirements or ""
+    if digest and digest.get("version") == DIGEST_VERSION:
+        return digest
+    return _computed_digest(description, requirements)
+
+
+def fit_fields(fields: Dict[str, str], budget: int, digests: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Fit `fields` into `budget` tokens in total
+
+    Fields are shared out smallest first, so a short field is always
+    kept whole and leaves its unused share to the rest. A field over its
+    share uses its entry in `digests` instead, truncated if need be.
+    """
+    fitted = {}
+    remaining = budget
+    pending = sorted(fields, key=lambda name: count_tokens(fields[name] or ""))
+    for n, name in enumerate(pending):
+        share = remaining // (len(pending) - n)
+        text = fields[name] or ""
+        if count_tokens(text) > share:
+            digest = (digests or {}).get(name)
+            if digest and count_tokens(digest) < count_tokens(text):
+                text = digest
+            text = truncate_to_tokens(text, share)
+        fitted[name] = text
+        remaining -= count_tokens(text)
+    return fitted
+
+
+def opportunity_fields(opportunity, budget: int, fields=("description", "requirements")) -> Dict[str, str]:
+    """An Opportunity's description and requirements, fitted into `budget` tokens"""
+    texts = {name: getattr(opportunity, name) or "" for name in fields}
+    return fit_fields(texts, budget, opportunity_digest(opportunity))
@@ -0,0 +1,233 @@
+"""
+Opt-in profiler for Streamlit reruns
+
+Enable it with PROFILE_RERUNS=1 (every session) or `?profile=1` in the
+URL (that session). A profiled rerun is collected as a trace
+(tracing.trace with collect=True), so every span opened during it is
+timed: the page, each tab block, and the @traced storage, parsing, LLM
+and report helpers. Spans are grouped by name with their total time and
+self time. Self time leaves out child spans on the same thread.
+
+Memory allocated during the rerun is measured with tracemalloc, which
+runs only while at least one profiled rerun is in progress: the first
+one starts it and the last one to finish stops it. Two numbers are kept:
+the peak above the level at the start, and the net change.
+
+The last SESSION_PROFILES profiles of a session are shown in a debug
+panel below the page. Every profile is also appended to PROFILE_LOG as a
+JSON line; the log is rotated at PROFILE_LOG_BYTES.
+
+While tracemalloc runs it slows every allocation in the process. Other
+sessions rerunning at the same time are counted as well. Use the numbers
+to find hot spots, not as benchmarks.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Iterator, List, Tuple
+
+import streamlit as st
+
+from enhanced_ui import create_metric_card
+from tracing import trace
+
+PROFILE_RERUNS = os.environ.get("PROFILE_RERUNS") == "1"
+PROFILE_LOG = "rerun_profiles.log"
+PROFILE_LOG_BYTES = 1_000_000
+PROFILE_LOG_BACKUPS = 3
+SESSION_PROFILES = 20  # Profiles kept per session for the panel
+
+
+@dataclass
+class SpanTiming:
+    """All spans of one name within a rerun"""
+    name: str
+    category: str
+    calls: int = 0
+    total: float = 0.0  # Seconds
+    self_time: float = 0.0
+    slowest: float = 0.0
+
+
+@dataclass
+class RerunProfile:
+    page: str
+    started_at: float
+    seconds: float
+    peak_memory: int  # Bytes allocated above the level at the start of the rerun
+    net_memory: int  # Bytes still allocated at the end, relative to the start
+    completed: bool  # False when st.rerun, st.stop or an error ended the rerun early
+    timings: List[SpanTiming] = field(default_factory=list)
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_RERUNS or st.query_params.get("profile") == "1"
+
+
+def breakdown(root) -> List[SpanTiming]:
+    """Timings of every span collected under `root`, slowest total first"""
+    spans = list(root.trace.spans)
+    children: Dict[int, float] = {}
+    for span in spans:
+        parent = span.parent
+        if parent is not None and parent.thread_id == span.thread_id:
+            children[id(parent)] = children.get(id(parent), 0.0) + span.duration
+
+    timings: Dict[Tuple[str, str], SpanTiming] = {}
+    for span in spans:
+        timing = timings.setdefault((span.name, span.category), SpanTiming(span.name, span.category))
+        timing.calls += 1
+        timing.total += span.duration
+        timing.self_time += max(span.duration - children.get(id(span), 0.0), 0.0)
+        timing.slowest = max(timing.slowest, span.duration)
+    return sorted(timings.values(), key=lambda timing: timing.total, reverse=True)
+
+
+_log = logging.getLogger("rerun_profiler")
+_log_lock = threading.Lock()
+
+
+def _profile_log() -> logging.Logger:
+    with _log_lock:
+        if not _log.handlers:
+            handler = RotatingFileHandler(
+                PROFILE_LOG, maxBytes=PROFILE_LOG_BYTES, backupCount=PROFILE_LOG_BACKUPS, encoding="utf-8", delay=True
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _log.addHandler(handler)
+            _log.setLevel(logging.INFO)
+            _log.propagate = False
+    return _log
+
+
+_memory_lock = threading.Lock()
+_memory_users = 0  # Profiled reruns in progress
+_started_tracing = False  # tracemalloc was started here, not by PYTHONTRACEMALLOC
+
+
+def _start_memory_tracing():
+    global _memory_users, _started_tracing
+    with _memory_lock:
+        if not _memory_users and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _memory_users += 1
+
+
+def _stop_memory_tracing():
+    global _memory_users, _started_tracing
+    with _memory_lock:
+        _memory_users -= 1
+        if not _memory_users and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def record(profile: RerunProfile):
+    profiles = st.session_state.setdefault("rerun_profiles", [])
+    profiles.append(profile)
+    del profiles[:-SESSION_PROFILES]
+    try:
+        _profile_log().info(json.dumps(asdict(profile)))
+    except (OSError, ValueError):
+        pass
+
+
+@contextmanager
+def profiled_rerun(page: str, force_trace: bool = False) -> Iterator[None]:
+    """Root span of a rerun; when profiling, also records a RerunProfile of it"""
+    if not profiling_enabled():
+        with trace(f"rerun {page}", category="streamlit", force=force_trace):
+            yield
+        return
+
+    _start_memory_tracing()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    started_at = time.time()
+    completed = False
+    root = trace(f"rerun {page}", category="streamlit", force=force_trace, collect=True)
+    try:
+        with root:
+            yield
+        completed = True
+    finally:
+        current_memory, peak_memory = tracemalloc.get_traced_memory()
+        _stop_memory_tracing()
+        record(RerunProfile(
+            page=page,
+            started_at=started_at,
+            seconds=root.duration,
+            peak_memory=max(peak_memory - start_memory, 0),
+            net_memory=current_memory - start_memory,
+            completed=completed,
+            timings=breakdown(root)
+        ))
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def render_profile_panel():
+    """Debug panel with the latest rerun's breakdown and this session's recent reruns"""
+    profiles = st.session_state.get("rerun_profiles")
+    if not profiles:
+        return
+    latest = profiles[-1]
+
+    st.markdown("---")
+    with st.expander(f"⏱️ Rerun profile: {latest.seconds * 1000:.0f} ms on {latest.page}", expanded=False):
+        col_p1, col_p2, col_p3, col_p4 = st.columns(4)
+        with col_p1:
+            create_metric_card("Rerun Time", f"{latest.seconds * 1000:.0f} ms")
+        with col_p2:
+            create_metric_card("Peak Memory", _megabytes(latest.peak_memory), help_text="Allocated above the level at the start")
+        with col_p3:
+            create_metric_card("Net Memory", _megabytes(latest.net_memory), help_text="Still allocated at the end")
+        with col_p4:
+            create_metric_card("Spans", f"{sum(timing.calls for timing in latest.timings):,}")
+
+        if not latest.completed:
+            st.caption("⚠️ This rerun was cut short (st.rerun, st.stop or an error).")
+
+        st.markdown("**Where the time went (slowest first):**")
+        st.dataframe(
+            [
+                {
+                    "Span": timing.name,
+                    "Category": timing.category,
+                    "Calls": timing.calls,
+                    "Total (ms)": round(timing.total * 1000, 1),
+                    "Self (ms)": round(timing.self_time * 1000, 1),
+                    "Slowest (ms)": round(timing.slowest * 1000, 1),
+                    "Share": f"{timing.total / latest.seconds:.0%}" if latest.seconds else "-"
+                }
+                for timing in latest.timings
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.markdown("**Recent reruns in this session:**")
+        st.dataframe(
+            [
+                {
+                    "Time": time.strftime("%H:%M:%S", time.localtime(profile.started_at)),
+                    "Page": profile.page,
+                    "Rerun (ms)": round(profile.seconds * 1000),
+                    "Peak memory (MB)": round(profile.peak_memory / 1024 / 1024, 1),
+                    "Slowest span": next((timing.name for timing in profile.timings if timing.category != "streamlit"), "-")
+                }
+                for profile in reversed(profiles)
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(f"Every profiled rerun is appended to `{PROFILE_LOG}`.")
@@ -0,0 +1,123 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+HISTOGRAM_BINS = 10  # 0-10%, 10-20%, ... 90-100%
+STRONG_MATCH = 0.7
+GOOD_MATCH = 0.5
+MODERATE_MATCH = 0.4  # Lower bound of "moderate" in the batch evaluation summary
+
+
+def score_bin(score: float) -> int:
+    """Histogram bin of a 0-1 score; the small epsilon keeps 0.7 in the 70% bin despite float error"""
+    return min(max(int(score * HISTOGRAM_BINS + 1e-9), 0), HISTOGRAM_BINS - 1)
+
+
+@dataclass
+class TypeTotals:
+    count: int = 0
+    score_sum: float = 0.0
+
+    @property
+    def avg_score(self) -> float:
+        return self.score_sum / self.count if self.count else 0.0
+
+
+@dataclass
+class ScoreAggregate:
+    """
+    Running totals over a set of match scores
+
+    Every statistic the dashboards show (count, average, min/max, strong /
+    moderate / weak counts for any 10% threshold, per-type breakdown) is
+    derived from a fixed-size histogram and a few sums, so adding an
+    evaluation is O(1) and reading the numbers never rescans the history.
+    """
+    count: int = 0
+    score_sum: float = 0.0
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    histogram: List[int] = field(default_factory=lambda: [0] * HISTOGRAM_BINS)
+    by_type: Dict[str, TypeTotals] = field(default_factory=dict)
+
+    def add(self, score: float, opp_type: Optional[str] = None) -> "ScoreAggregate":
+        score = float(score or 0.0)
+        self.count += 1
+        self.score_sum += score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.histogram[score_bin(score)] += 1
+        totals = self.by_type.setdefault(opp_type or "Other", TypeTotals())
+        totals.count += 1
+        totals.score_sum += score
+        return self
+
+    @classmethod
+    def from_scores(cls, items: Iterable) -> "ScoreAggregate":
+        """Build from scores or (score, type) pairs, e.g. to backfill from stored history"""
+        aggregate = cls()
+        for item in items:
+            if isinstance(item, tuple):
+                aggregate.add(*item)
+            else:
+                aggregate.add(item)
+        return aggregate
+
+    @property
+    def avg_score(self) -> float:
+        return self.score_sum / self.count if self.count else 0.0
+
+    def count_at_least(self, threshold: float) -> int:
+        return sum(self.histogram[score_bin(threshold):]) if threshold > 0 else self.count
+
+    def count_between(self, low: float, high: float) -> int:
+        """Scores with low <= score < high"""
+        return self.count_at_least(low) - self.count_at_least(high)
+
+    @property
+    def strong(self) -> int:
+        return self.count_at_least(STRONG_MATCH)
+
+    @property
+    def good(self) -> int:
+        return self.count_between(GOOD_MATCH, STRONG_MATCH)
+
+    @property
+    def weak(self) -> int:
+        return self.count - self.count_at_least(GOOD_MATCH)
+
+    def summary(self) -> Dict:
+        """Plain dict for the UI: total, avg_score, strong/good/weak and counts per type"""
+        return {
+            "total": self.count,
+            "avg_score": self.avg_score,
+            "strong": self.strong,
+            "good": self.good,
+            "weak": self.weak,
+            "by_type": {opp_type: totals.count for opp_type, totals in self.by_type.items()}
+        }
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "count": self.count,
+            "score_sum": self.score_sum,
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "histogram": self.histogram,
+            "by_type": {t: [v.count, v.score_sum] for t, v in self.by_type.items()}
+        })
+
+    @classmethod
+    def from_json(cls, text: str) -> "ScoreAggregate":
+        data = json.loads(text)
+        histogram = list(data.get("histogram") or [])
+        if len(histogram) != HISTOGRAM_BINS:
+            raise ValueError("Stored histogram has a different number of bins")
+        return cls(
+            count=data.get("count", 0),
+            score_sum=data.get("score_sum", 0.0),
+            min_score=data.get("min_score"),
+            max_score=data.get("max_score"),
+            histogram=histogram,
+            by_type={t: TypeTotals(count, score_sum) for t, (count, score_sum) in (data.get("by_type") or {}).items()}
+        )
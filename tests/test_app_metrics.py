@@ -0,0 +1,20 @@
+import pytest
+
+import app_metrics
+
+
+def test_metric_subclasses_must_implement_children_and_samples():
+    class Incomplete(app_metrics._Metric):
+        kind = "counter"
+
+        def _new_child(self):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete_total", "Missing samples()")
+
+
+def test_counter_renders_labelled_samples():
+    counter = app_metrics.Counter("test_total", "Test counter", ["page"])
+    counter.labels("home").inc(2)
+    assert 'opportunity_matcher_test_total{page="home"} 2' in counter.render()
@@ -0,0 +1,51 @@
+import pytest
+
+from content_extractor import extract_main_content, extract_main_content_streaming
+from html_parsing import available_backends
+
+MIXED_PAGE = """
+<html><head><title>Gates Scholarship</title></head><body>
+<p>Short intro.</p>
+<div class="content">Full funding for postgraduate study, covering tuition and a stipend.
+Applicants must be citizens of any country outside the UK.</div>
+<div>Deadline: <b>1 March</b> 2026.</div>
+</body></html>
+"""
+
+SHORT_DIV_PAGE = "<html><body><div>Open call for researchers</div><div>Contact the office</div></body></html>"
+
+
+def test_div_text_is_kept_next_to_block_tags():
+    text = extract_main_content(MIXED_PAGE)
+    assert "covering tuition and a stipend" in text
+    assert "Deadline: 1 March 2026." in text
+
+
+def test_short_div_only_page_is_not_empty():
+    text = extract_main_content(SHORT_DIV_PAGE)
+    assert "Open call for researchers" in text
+    assert "Contact the office" in text
+
+
+DIV_ONLY_PAGE = """
+<html><head><title>Research Fellowship</title></head><body>
+<nav><a href="/">Home</a></nav>
+<div class="content">Full funding for two years of postdoctoral research, covering salary and travel.
+<div>Deadline: <b>1 March</b> 2026.</div>
+Applicants must hold a PhD degree in a relevant field, awarded within the last five years.</div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_streaming_keeps_div_text(backend):
+    text = extract_main_content_streaming(DIV_ONLY_PAGE, parser=backend)
+    assert "covering salary and travel" in text
+    assert "Deadline: 1 March 2026." in text
+    assert "awarded within the last five years" in text
+    assert "Home" not in text
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_streaming_falls_back_to_full_parse_for_little_text(backend):
+    assert extract_main_content_streaming(SHORT_DIV_PAGE, parser=backend) == extract_main_content(SHORT_DIV_PAGE)
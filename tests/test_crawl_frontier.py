@@ -0,0 +1,123 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crawl_frontier import USER_AGENT, CrawlFrontier, domain_of, seeds_from_scout
+
+PAGES = {
+    "/": """<html><head><title>Scholarships</title></head><body>
+        <p>Funding for graduate study. Read about each scholarship and its eligibility.</p>
+        <a href="/fellowship">Research fellowship with stipend</a>
+        <a href="/private/admin">Admin</a>
+        </body></html>""",
+    "/fellowship": """<html><head><title>Research Fellowship</title></head><body>
+        <div>Two-year fellowship covering tuition and a stipend. Applicants must hold a degree.</div>
+        </body></html>""",
+    "/private/admin": "<html><body><p>Should never be fetched.</p></body></html>",
+}
+ROBOTS = "User-agent: *\nDisallow: /private/\n"
+
+
+class FixtureSite:
+    """Local HTTP server recording every request it gets"""
+
+    def __init__(self, robots_status=200):
+        self.robots_status = robots_status
+        self.requests = []  # (path, User-Agent)
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests.append((self.path, self.headers.get("User-Agent")))
+                if self.path == "/robots.txt":
+                    self._reply(site.robots_status, ROBOTS, "text/plain")
+                elif self.path in PAGES:
+                    self._reply(200, PAGES[self.path], "text/html")
+                else:
+                    self._reply(404, "not found", "text/plain")
+
+            def _reply(self, status, body, content_type):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def paths(self):
+        return [path for path, _ in self.requests]
+
+
+@pytest.fixture
+def make_site():
+    sites = []
+
+    def make(**kwargs):
+        sites.append(FixtureSite(**kwargs))
+        return sites[-1]
+
+    yield make
+    for site in sites:
+        site.server.shutdown()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_frontier(tmp_path, clock):
+    return CrawlFrontier(state_file=tmp_path / "frontier.json", delay_seconds=1.0, clock=clock, sleep=clock.sleep)
+
+
+def test_crawl_follows_links_and_honours_robots(tmp_path, make_site):
+    site = make_site()
+    clock = FakeClock()
+    frontier = make_frontier(tmp_path, clock)
+    frontier.add_seeds([site.url + "/"])
+
+    pages = frontier.crawl(max_pages=10)
+
+    assert [page.url for page in pages] == [site.url + "/", site.url + "/fellowship"]
+    assert "covering tuition and a stipend" in pages[1].text
+    assert "/private/admin" not in site.paths()
+    assert {agent for _, agent in site.requests} == {USER_AGENT}
+    assert clock.now >= 1001.0  # Waited out the per-domain delay between the two pages
+
+
+def test_robots_server_error_holds_the_domain(tmp_path, make_site):
+    site = make_site(robots_status=503)
+    clock = FakeClock()
+    frontier = make_frontier(tmp_path, clock)
+    frontier.add_seeds([site.url + "/"])
+
+    assert frontier.crawl(max_pages=10) == []
+    assert site.paths() == ["/robots.txt"]
+    assert len(frontier) == 1  # Kept for a later run instead of crawled or dropped
+
+    site.robots_status = 200
+    clock.now = frontier.next_allowed[domain_of(site.url)]
+    assert [page.url for page in frontier.crawl(max_pages=1)] == [site.url + "/"]
+
+
+def test_seeds_from_scout_collects_urls_and_queries():
+    result = {
+        "search_queries": [{"query": "data science scholarships", "reasoning": "", "priority": "high"}],
+        "hidden_opportunities": ["Check https://example.org/funding for departmental awards"],
+    }
+    seeds = seeds_from_scout(result, search_url_template="https://search.example/?q={query}")
+    assert seeds == ["https://example.org/funding", "https://search.example/?q=data+science+scholarships"]
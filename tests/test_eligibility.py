@@ -0,0 +1,71 @@
+import pytest
+
+from eligibility import EligibilityIndex, check_eligibility, extract_constraints
+from models import UserProfile
+
+
+def make_profile(**overrides) -> UserProfile:
+    fields = dict(
+        name="Test", education_level="Bachelor's", field_of_study="Computer Science", gpa=3.3,
+        skills="", experience_years=1, languages="English", achievements="", goals=""
+    )
+    fields.update(overrides)
+    return UserProfile(**fields)
+
+
+@pytest.mark.parametrize("text", [
+    "Applicants who already hold a PhD degree are not eligible.",
+    "Applicants must not have completed a master's degree.",
+    "Knowledge of German is not required.",
+    "No German language skills required.",
+    "A GPA of 3.5 or higher is not required.",
+    "Candidates without a bachelor's degree may apply.",
+    "Fluency in German is preferred.",
+])
+def test_negated_and_soft_sentences_set_no_rule(text):
+    constraints = extract_constraints(text)
+    assert constraints["min_degree"] is None
+    assert constraints["min_gpa"] is None
+    assert constraints["languages"] == []
+
+
+def test_tests_in_one_sentence_are_alternatives():
+    constraints = extract_constraints("IELTS or TOEFL or DELF accepted.")
+    assert constraints["languages"] == [["English", "French"]]
+    assert check_eligibility(make_profile(languages="English"), constraints) == []
+
+
+def test_hard_rules_are_extracted():
+    constraints = extract_constraints(
+        "Applicants must hold a master's degree. Minimum GPA of 3.5. Fluency in German or English."
+    )
+    assert constraints["min_degree"] == "Master's"
+    assert constraints["min_gpa"] == 3.5
+    assert constraints["languages"] == [["English", "German"]]
+
+
+def test_programme_description_is_not_a_degree_rule():
+    constraints = extract_constraints("Applicants must have a bachelor's degree.", "Master's degree in Data Science.")
+    assert constraints["min_degree"] == "Bachelor's"
+
+
+def test_gpa_on_other_scales_is_ignored():
+    assert extract_constraints("GPA of 8/10 minimum.")["min_gpa"] is None
+
+
+def test_index_skips_only_clear_failures():
+    records = [
+        {"id": 1, "requirements": "Applicants must hold a master's degree. Minimum GPA of 3.5."},
+        {"id": 2, "requirements": "Fluency in German is required."},
+        {"id": 3, "requirements": "A bachelor's degree is required."},
+        {"id": 4, "requirements": "Applicants who already hold a PhD degree are not eligible."},
+    ]
+    skipped = EligibilityIndex(records).screen(make_profile())
+    assert set(skipped) == {1, 2}
+    assert len(skipped[1]) == 2
+
+
+def test_unknown_profile_values_never_skip():
+    records = [{"id": 1, "requirements": "Applicants must hold a master's degree. Minimum GPA of 3.5."}]
+    profile = make_profile(education_level="Other", gpa=None)
+    assert EligibilityIndex(records).screen(profile) == {}
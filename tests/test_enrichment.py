@@ -0,0 +1,22 @@
+import logging
+
+import enrichment
+
+
+def test_parse_funding_amount_skips_durations():
+    assert enrichment.parse_funding_amount("3 years, $20,000 per year") == (20000.0, "USD")
+    assert enrichment.parse_funding_amount("12 months, full tuition") == (None, None)
+
+
+def test_drain_logs_failures(monkeypatch, caplog):
+    def fail(opp_ids, force=False):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(enrichment, "enrich_records", fail)
+    enrichment._pending.update({1, 2})
+    enrichment._draining = True
+    with caplog.at_level(logging.ERROR, logger="enrichment"):
+        enrichment._drain()
+
+    assert "Enriching 2 opportunities failed" in caplog.text
+    assert not enrichment._pending and not enrichment._draining
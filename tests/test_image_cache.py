@@ -0,0 +1,20 @@
+from io import BytesIO
+
+from PIL import Image
+
+import image_cache
+
+
+def png(width: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, 20), (width % 256, 0, 0)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_fingerprint_memo_is_bounded():
+    cache = image_cache.ImageAnalysisCache(cache_file=None)
+    for width in range(20, 20 + image_cache.FINGERPRINT_MEMO_SIZE * 2):
+        cache.put("opportunity", png(width), {"width": width}, scope="user")
+
+    assert len(cache._fingerprints) == image_cache.FINGERPRINT_MEMO_SIZE
+    assert cache.get("opportunity", png(20), scope="user") == {"width": 20}
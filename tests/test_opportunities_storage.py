@@ -0,0 +1,34 @@
+import pytest
+
+import dedup_index
+import opportunities_storage
+
+DESCRIPTION = (
+    "Fully funded master's scholarship for international students in engineering, "
+    "covering tuition, a monthly stipend and travel costs for two years of study."
+)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(opportunities_storage, "OPPORTUNITIES_FILE", tmp_path / "opportunities.json")
+    monkeypatch.setattr(dedup_index, "DEDUP_INDEX_FILE", tmp_path / "dedup_index.json")
+    monkeypatch.setattr(opportunities_storage, "_enrich_later", lambda opp_id: None)
+    opportunities_storage.initialize_database()
+
+
+def test_merge_reports_the_existing_record(storage):
+    first = {"title": "Global Engineering Scholarship", "description": DESCRIPTION, "link": "https://a.example"}
+    assert opportunities_storage.save_opportunity(first)
+    assert "duplicate_of" not in first
+
+    second = {"title": "Global Engineering Scholarship", "description": DESCRIPTION, "link": "https://b.example"}
+    assert opportunities_storage.save_opportunity(second)
+    assert second["duplicate_of"] == first["id"]
+
+    saved = opportunities_storage.load_all_opportunities()
+    assert len(saved) == 1
+    assert saved[0]["alternate_links"] == ["https://b.example"]
+    assert "duplicate_of" not in saved[0]
+    assert "duplicate_similarity" not in saved[0]
@@ -0,0 +1,36 @@
+from intelligence.portfolio import PortfolioArrays, parse_money, portfolio_metrics, top_by_value_per_hour
+
+
+def test_parse_money_prefers_amount_next_to_currency():
+    assert parse_money("3 years, $20,000 per year") == (20000.0, "USD")
+    assert parse_money("2 awards of 5,000 EUR") == (5000.0, "EUR")
+    assert parse_money("€5k") == (5000.0, "EUR")
+
+
+def test_parse_money_tells_dollar_currencies_apart():
+    assert parse_money("C$50,000") == (50000.0, "CAD")
+    assert parse_money("A$30,000") == (30000.0, "AUD")
+    assert parse_money("US$5,000") == (5000.0, "USD")
+    assert parse_money("50,000 Canadian dollars") == (50000.0, "CAD")
+
+
+def test_parse_money_skips_years_and_durations():
+    assert parse_money("Funding: 2026") == (0.0, None)
+    assert parse_money("12 months stipend") == (0.0, None)
+
+
+def test_metrics_are_grouped_by_currency():
+    portfolio = PortfolioArrays.from_rows([
+        {"title": "A", "type": "Scholarship", "score": 0.5, "funding": "$10,000"},
+        {"title": "B", "type": "Scholarship", "score": 0.5, "funding": "€4,000"},
+        {"title": "C", "type": "Scholarship", "score": 1.0, "funding_value": 2000, "funding_currency": "USD"},
+    ])
+    stats = portfolio_metrics(portfolio)
+
+    assert list(stats["by_currency"]) == ["USD", "EUR"]
+    assert stats["by_currency"]["USD"]["expected_value"] == 7000
+    assert stats["by_currency"]["EUR"]["expected_value"] == 2000
+    assert "expected_value" not in stats
+
+    ranked = top_by_value_per_hour(portfolio, currency="EUR")
+    assert [item["title"] for item in ranked] == ["B"]
@@ -0,0 +1,17 @@
+import tracemalloc
+
+import rerun_profiler
+
+
+def test_memory_tracing_stops_after_last_profiled_rerun(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(rerun_profiler, "profiling_enabled", lambda: True)
+    monkeypatch.setattr(rerun_profiler, "record", recorded.append)
+
+    with rerun_profiler.profiled_rerun("outer"):
+        with rerun_profiler.profiled_rerun("inner"):
+            assert tracemalloc.is_tracing()
+        assert tracemalloc.is_tracing()
+
+    assert not tracemalloc.is_tracing()
+    assert [profile.page for profile in recorded] == ["inner", "outer"]
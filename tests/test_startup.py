@@ -0,0 +1,47 @@
+"""
+Heavy libraries must stay out of the startup path
+
+Each check runs in a fresh interpreter, since this process has already
+imported whatever other tests needed. Timings are left to
+benchmarks/bench_startup.py; this only fails when a heavy import creeps in.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app_pages import PAGES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that must only load when a handler needs them
+HEAVY_MODULES = ["langchain", "langchain_core", "langchain_openai", "openai", "fitz", "bs4", "google.generativeai", "reportlab", "PyPDF2"]
+
+PROBE = """
+import json, sys
+sys.path.insert(0, {root!r})
+import {module}
+print(json.dumps([name for name in {heavy!r} if name in sys.modules]))
+"""
+
+
+def loaded_heavy_modules(module: str, tmp_path) -> list:
+    env = dict(os.environ, USER_DB_FILE=str(tmp_path / "user_data.db"), OPENAI_API_KEY="test", GEMINI_API_KEY="test")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=str(ROOT), module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_app_startup_loads_no_heavy_modules(tmp_path):
+    # Importing main runs the script once in bare mode, rendering the default page
+    assert loaded_heavy_modules("main", tmp_path) == []
+
+
+@pytest.mark.parametrize("module", ["enhanced_ui", "user_store"] + [f"app_pages.{name}" for name in PAGES.values()])
+def test_page_modules_load_no_heavy_modules(module, tmp_path):
+    assert loaded_heavy_modules(module, tmp_path) == []
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import user_store
+from models import MatchResult, Opportunity
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_record(title: str) -> dict:
+    return {
+        "opportunity": Opportunity(title=title, opp_type="Job", description="d", requirements="r"),
+        "score": 0.5,
+        "result": MatchResult(compatibility_score=0.5, strengths="", gaps="", recommendation="")
+    }
+
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    db_file = tmp_path / "users.db"
+    monkeypatch.setattr(user_store, "USER_DB_FILE", db_file)
+    return db_file
+
+
+def test_history_version_changes_on_every_write(db_file):
+    assert user_store.history_version("u") == 0
+    assert user_store.add_evaluation("u", make_record("A"))
+    first = user_store.history_version("u")
+    assert first > 0
+
+    assert not user_store.add_evaluation("u", make_record("A"))  # Duplicate title: nothing written
+    assert user_store.history_version("u") == first
+
+    user_store.clear_evaluations("u")
+    assert user_store.history_version("u") > first
+    assert user_store.history_version("other") == 0
+
+
+def test_history_version_sees_writes_from_other_processes(db_file):
+    before = user_store.history_version("u")
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import user_store; from pathlib import Path; "
+        "from tests.test_user_store import make_record; "
+        "user_store.USER_DB_FILE = Path(sys.argv[2]); "
+        "assert user_store.add_evaluation('u', make_record('B'))"
+    )
+    subprocess.run([sys.executable, "-c", script, str(ROOT), str(db_file)], check=True, cwd=ROOT)
+    assert user_store.history_version("u") > before
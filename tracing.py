@@ -0,0 +1,299 @@
+"""
+Nested tracing spans, written out as Chrome trace files
+
+A trace covers one Streamlit rerun (or any block wrapped in `trace()`):
+every `span()` / `@traced` call made while it is active becomes a child
+of the current span, across worker threads (wrap the callable with
+`in_current_context`) and asyncio tasks (which inherit the context by
+themselves). Finished traces are written to TRACE_DIR in the Trace Event
+format; open them in https://ui.perfetto.dev or chrome://tracing.
+
+Traces are sampled: TRACE_SAMPLE_RATE (env, 0.0 to 1.0, default off) of
+reruns are traced, and `?trace=1` in the URL forces one. When no trace
+is active a span is a context variable lookup and a shared no-op object.
+"""
+import contextvars
+import inspect
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+TRACE_DIR = Path("traces")
+MAX_TRACE_FILES = 50  # Oldest trace files are deleted beyond this
+
+
+def _env_sample_rate() -> float:
+    try:
+        return min(max(float(os.environ.get("TRACE_SAMPLE_RATE", "0")), 0.0), 1.0)
+    except ValueError:
+        return 0.0
+
+
+TRACE_SAMPLE_RATE = _env_sample_rate()
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Trace:
+    """Finished spans of one traced operation"""
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:8]
+        self.name = name
+        self.started_at = datetime.now()
+        self.spans: List["Span"] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: "Span"):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """Trace Event format: one complete ("X") event per span"""
+        with self._lock:
+            spans = list(self.spans)
+        origin = min((span.start_ns for span in spans), default=0)
+        pid = os.getpid()
+
+        events, threads = [], {}
+        for span in spans:
+            threads[span.thread_id] = span.thread_name
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace": self.name, "trace_id": self.id, "started_at": self.started_at.isoformat()}
+        }
+
+    def save(self, directory: Path = TRACE_DIR) -> Optional[Path]:
+        """Write the trace file and prune old ones; tracing never breaks the app"""
+        safe_name = re.sub(r"\W+", "_", self.name).strip("_")[:40]
+        path = Path(directory) / f"{self.started_at:%Y%m%d-%H%M%S}_{safe_name}_{self.id}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(self.to_chrome(), f, default=str)
+            for old in sorted(path.parent.glob("*.json"))[:-MAX_TRACE_FILES]:
+                old.unlink()
+        except OSError:
+            return None
+        return path
+
+
+class Span:
+    """A timed, named operation; use as a context manager or call finish()"""
+
+    __slots__ = ("trace", "parent", "name", "category", "args", "start_ns", "end_ns", "thread_id", "thread_name", "_token")
+
+    def __init__(self, trace: Trace, name: str, category: str, args: Dict[str, Any], parent: Optional["Span"] = None):
+        self.trace = trace
+        self.parent = parent
+        self.name = name
+        self.category = category
+        self.args = args
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.end_ns = 0
+        self._token = None
+        self.start_ns = time.perf_counter_ns()
+
+    def set(self, **args):
+        """Attach details learned while the span runs (token counts, sizes)"""
+        self.args.update(args)
+
+    def finish(self):
+        self.end_ns = time.perf_counter_ns()
+        self.trace.add(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        self.finish()
+        _current_span.reset(self._token)
+        return False
+
+    @property
+    def duration(self) -> float:
+        """Seconds, once finished"""
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class _RootSpan(Span):
+    __slots__ = ("save",)
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        if self.save:
+            self.trace.save()
+        return False
+
+
+class _NoopSpan:
+    """Stands in for a span when nothing is being traced"""
+
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def finish(self):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def tracing_active() -> bool:
+    return _current_span.get() is not None
+
+
+def span(name: str, category: str = "app", **args):
+    """
+    Child span of the current one; a no-op when not tracing
+
+    Use it with `with`, which also makes it the parent of spans opened
+    inside, or call finish() on it for operations that begin and end in
+    separate callbacks.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, category, args, parent)
+
+
+def trace(
+    name: str,
+    category: str = "app",
+    sample_rate: Optional[float] = None,
+    force: bool = False,
+    collect: bool = False,
+    **args
+):
+    """
+    Root span of a new trace, written to TRACE_DIR when it ends
+
+    Sampled at `sample_rate` (default TRACE_SAMPLE_RATE) unless forced.
+    With `collect` the spans are always recorded, for reading from the
+    root's `trace` afterwards, but the file is still only written when
+    sampled. Inside an active trace this is just a nested span.
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        return Span(parent.trace, name, category, args, parent)
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    sampled = force or (rate > 0 and random.random() < rate)
+    if not sampled and not collect:
+        return NOOP_SPAN
+    root = _RootSpan(Trace(name), name, category, args)
+    root.save = sampled
+    return root
+
+
+# Called as observer(category, name, seconds, failed) after every @traced
+# call, traced or not; app_metrics installs one when metrics are enabled
+_observer: Optional[Callable[[str, str, float, bool], None]] = None
+
+
+def set_observer(observer: Optional[Callable[[str, str, float, bool], None]]):
+    global _observer
+    _observer = observer
+
+
+def _observed(label: str, category: str, start: float, failed: bool):
+    try:
+        _observer(category, label, time.perf_counter() - start, failed)
+    except Exception:
+        pass
+
+
+def traced(name: Optional[str] = None, category: str = "app"):
+    """Decorator: run the function (sync or async) inside a span named after it"""
+    def decorate(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _observer is None:
+                    if _current_span.get() is None:
+                        return await fn(*args, **kwargs)
+                    with span(label, category):
+                        return await fn(*args, **kwargs)
+                start, failed = time.perf_counter(), True
+                try:
+                    with span(label, category):
+                        result = await fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    _observed(label, category, start, failed)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _observer is None:
+                if _current_span.get() is None:
+                    return fn(*args, **kwargs)
+                with span(label, category):
+                    return fn(*args, **kwargs)
+            start, failed = time.perf_counter(), True
+            try:
+                with span(label, category):
+                    result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _observed(label, category, start, failed)
+        return wrapper
+    return decorate
+
+
+def in_current_context(fn: Callable) -> Callable:
+    """
+    Bind `fn` to the current span, for running it on another thread
+    (ThreadPoolExecutor.map/submit, loop.run_in_executor), where context
+    variables are not inherited. Returns `fn` itself when not tracing.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return fn
+
+    @wraps(fn)
+    def run(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return run
@@ -0,0 +1,466 @@
+import json
+import os
+import pickle
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import streamlit as st
+
+from models import MatchResult, Opportunity, UserProfile
+from score_aggregates import GOOD_MATCH, STRONG_MATCH, ScoreAggregate
+from tracing import traced
+
+USER_DB_FILE = Path(os.environ.get("USER_DB_FILE", "user_data.db"))
+DEFAULT_USER_ID = "local"
+
+# Files written by older versions; imported once into the default user
+LEGACY_PROFILE_FILE = Path("user_profile.pkl")
+LEGACY_HISTORY_FILE = Path("matched_opportunities.pkl")
+
+# Stored records are plain JSON with their own field lists, so renaming or
+# adding fields on the Pydantic models never breaks reading old rows.
+PROFILE_FIELDS = [
+    "name", "education_level", "field_of_study", "gpa", "skills",
+    "experience_years", "languages", "achievements", "goals"
+]
+OPPORTUNITY_FIELDS = ["title", "opp_type", "description", "requirements", "deadline"]
+RESULT_FIELDS = ["compatibility_score", "strengths", "gaps", "recommendation"]
+
+# Schema migrations, applied in order; PRAGMA user_version records the last one
+MIGRATIONS = [
+    # 1: profiles and append-only evaluation history
+    """
+    CREATE TABLE IF NOT EXISTS profiles (
+        user_id TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS evaluations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        opportunity_title TEXT NOT NULL,
+        opportunity_type TEXT,
+        score REAL NOT NULL,
+        opportunity TEXT NOT NULL,
+        opportunity_data TEXT,
+        result TEXT NOT NULL
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_evaluations_user_title ON evaluations (user_id, opportunity_title);
+    CREATE INDEX IF NOT EXISTS idx_evaluations_user_date ON evaluations (user_id, created_at);
+    CREATE INDEX IF NOT EXISTS idx_evaluations_user_score ON evaluations (user_id, score);
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    """,
+    # 2: browse history filtered by opportunity type
+    """
+    CREATE INDEX IF NOT EXISTS idx_evaluations_user_type_date ON evaluations (user_id, opportunity_type, created_at);
+    """,
+    # 3: running dashboard totals, updated in the same transaction as each insert
+    """
+    CREATE TABLE IF NOT EXISTS aggregates (
+        user_id TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    );
+    """,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+ORDER_BY = {
+    "date": "created_at ASC, id ASC",
+    "date_desc": "created_at DESC, id DESC",
+    "score": "score ASC, id ASC",
+    "score_desc": "score DESC, id DESC"
+}
+
+_initialized = set()
+
+
+@contextmanager
+def _connect(db_file: Optional[Path] = None):
+    """One short-lived connection per operation; commits on success, rolls back on error"""
+    db_file = Path(db_file or USER_DB_FILE)
+    conn = sqlite3.connect(db_file, timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        if db_file not in _initialized:
+            _migrate(conn)
+            _initialized.add(db_file)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _migrate(conn: sqlite3.Connection):
+    # WAL lets readers (other users' sessions) proceed while one session writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+        with conn:
+            conn.executescript(script)
+            conn.execute(f"PRAGMA user_version = {number}")
+
+
+def current_user_id() -> str:
+    """
+    Id the current browser session stores its data under
+
+    A `?user=` query parameter selects a user explicitly. When the
+    MULTI_USER environment variable is set, sessions without one get a
+    fresh id added to the URL (bookmark it to come back to your data);
+    otherwise everyone shares the single local user, as before.
+    """
+    if "user_id" in st.session_state:
+        return st.session_state.user_id
+
+    user_id = st.query_params.get("user")
+    if not user_id:
+        if os.environ.get("MULTI_USER"):
+            user_id = uuid.uuid4().hex[:12]
+            st.query_params["user"] = user_id
+        else:
+            user_id = DEFAULT_USER_ID
+
+    st.session_state.user_id = user_id
+    return user_id
+
+
+def _pick(data: Dict, fields: List[str]) -> Dict:
+    return {key: data.get(key) for key in fields if key in data}
+
+
+def _model_dict(obj) -> Dict:
+    if obj is None:
+        return {}
+    if isinstance(obj, dict):
+        return obj
+    return obj.model_dump()
+
+
+# Profiles
+
+@traced(category="storage")
+def save_profile(user_id: str, profile: UserProfile) -> bool:
+    try:
+        data = json.dumps(_pick(_model_dict(profile), PROFILE_FIELDS))
+        with _connect() as conn:
+            conn.execute(
+                "INSERT INTO profiles (user_id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (user_id, data, datetime.now().isoformat())
+            )
+        return True
+    except sqlite3.Error as e:
+        st.error(f"Error saving profile: {str(e)}")
+        return False
+
+
+@traced(category="storage")
+def load_profile(user_id: str) -> Optional[UserProfile]:
+    try:
+        with _connect() as conn:
+            row = conn.execute("SELECT data FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        return UserProfile(**_pick(json.loads(row["data"]), PROFILE_FIELDS))
+    except (sqlite3.Error, ValueError) as e:
+        st.error(f"Error loading profile: {str(e)}")
+        return None
+
+
+# Evaluation history
+
+@traced(category="storage")
+def add_evaluation(user_id: str, record: Dict) -> bool:
+    """
+    Append one evaluation record (single-row insert, history is never rewritten)
+
+    Returns False if this user already has an evaluation for the same
+    opportunity title. On success the new row id is stored in record["id"].
+    """
+    opportunity = _model_dict(record.get("opportunity"))
+    result = _model_dict(record.get("result"))
+    score = record.get("score", result.get("compatibility_score", 0.0))
+
+    try:
+        with _connect() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO evaluations "
+                "(user_id, created_at, opportunity_title, opportunity_type, score, opportunity, opportunity_data, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    record.get("timestamp") or datetime.now().isoformat(),
+                    record.get("opportunity_title") or opportunity.get("title", ""),
+                    record.get("opportunity_type") or opportunity.get("opp_type"),
+                    float(score),
+                    json.dumps(_pick(opportunity, OPPORTUNITY_FIELDS)),
+                    json.dumps(record.get("opportunity_data")) if record.get("opportunity_data") is not None else None,
+                    json.dumps(_pick(result, RESULT_FIELDS))
+                )
+            )
+            added = cursor.rowcount == 1
+            if added:
+                record["id"] = cursor.lastrowid
+                _bump_history_version(conn, user_id)
+                aggregate = _stored_aggregate(conn, user_id)
+                if aggregate is None:
+                    # The rebuild already includes the row just inserted
+                    _rebuild_aggregate(conn, user_id)
+                else:
+                    aggregate.add(float(score), record.get("opportunity_type") or opportunity.get("opp_type"))
+                    _store_aggregate(conn, user_id, aggregate)
+        return added
+    except sqlite3.Error as e:
+        st.error(f"Error saving evaluation: {str(e)}")
+        return False
+
+
+def _record_from_row(row: sqlite3.Row) -> Dict:
+    """Rebuild the in-memory record shape the UI works with"""
+    return {
+        "id": row["id"],
+        "timestamp": row["created_at"],
+        "opportunity": Opportunity(**_pick(json.loads(row["opportunity"]), OPPORTUNITY_FIELDS)),
+        "opportunity_title": row["opportunity_title"],
+        "opportunity_type": row["opportunity_type"],
+        "opportunity_data": json.loads(row["opportunity_data"]) if row["opportunity_data"] else None,
+        "score": row["score"],
+        "result": MatchResult(**_pick(json.loads(row["result"]), RESULT_FIELDS))
+    }
+
+
+def _where(user_id: str, min_score: Optional[float], max_score: Optional[float], opp_type: Optional[str]):
+    clauses, params = ["user_id = ?"], [user_id]
+    if min_score is not None:
+        clauses.append("score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append("score < ?")
+        params.append(max_score)
+    if opp_type:
+        clauses.append("opportunity_type = ?")
+        params.append(opp_type)
+    return " AND ".join(clauses), params
+
+
+@traced(category="storage")
+def load_evaluations(
+    user_id: str,
+    order: str = "date",
+    limit: Optional[int] = None,
+    offset: int = 0,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    opp_type: Optional[str] = None
+) -> List[Dict]:
+    """Evaluation records for a user, using the (user, date) or (user, score) index"""
+    where, params = _where(user_id, min_score, max_score, opp_type)
+    sql = f"SELECT * FROM evaluations WHERE {where} ORDER BY {ORDER_BY.get(order, ORDER_BY['date'])}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+    try:
+        with _connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [_record_from_row(row) for row in rows]
+    except (sqlite3.Error, ValueError) as e:
+        st.error(f"Error loading evaluation history: {str(e)}")
+        return []
+
+
+@traced(category="storage")
+def load_evaluations_by_id(user_id: str, evaluation_ids: Sequence[int]) -> List[Dict]:
+    """Full records for the given evaluation ids, in the order given (unknown ids are skipped)"""
+    evaluation_ids = list(evaluation_ids)
+    if not evaluation_ids:
+        return []
+    placeholders = ", ".join("?" * len(evaluation_ids))
+    try:
+        with _connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM evaluations WHERE user_id = ? AND id IN ({placeholders})",
+                [user_id] + evaluation_ids
+            ).fetchall()
+        records = {row["id"]: _record_from_row(row) for row in rows}
+        return [records[i] for i in evaluation_ids if i in records]
+    except (sqlite3.Error, ValueError) as e:
+        st.error(f"Error loading evaluation history: {str(e)}")
+        return []
+
+
+@traced(category="storage")
+def count_evaluations(
+    user_id: str,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    opp_type: Optional[str] = None
+) -> int:
+    where, params = _where(user_id, min_score, max_score, opp_type)
+    try:
+        with _connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM evaluations WHERE {where}", params).fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+def _history_version_key(user_id: str) -> str:
+    return f"history_version:{user_id}"
+
+
+def _bump_history_version(conn: sqlite3.Connection, user_id: str):
+    # Same transaction as the write, so every process sees the new version with the new rows
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, '1') "
+        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+        (_history_version_key(user_id),)
+    )
+
+
+def history_version(user_id: str) -> int:
+    """Changes whenever any process writes the user's history; use it as a cache key"""
+    try:
+        with _connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (_history_version_key(user_id),)).fetchone()
+        return int(row["value"]) if row else 0
+    except sqlite3.Error:
+        return 0
+
+
+@traced(category="storage")
+def evaluation_rows(user_id: str) -> List[Dict]:
+    """
+    Lightweight columns of a user's history (id, title, type, score,
+    deadline, funding) for portfolio analytics and pickers, without
+    rebuilding the Pydantic models.
+    Evaluations of saved opportunities also carry the deadline_date,
+    funding_value and funding_currency computed at ingest.
+    """
+    try:
+        with _connect() as conn:
+            rows = conn.execute(
+                "SELECT id, opportunity_title AS title, opportunity_type AS type, score, "
+                "json_extract(opportunity, '$.deadline') AS deadline, "
+                "json_extract(opportunity_data, '$.funding') AS funding, "
+                "json_extract(opportunity_data, '$.features.deadline_date') AS deadline_date, "
+                "json_extract(opportunity_data, '$.features.funding_value') AS funding_value, "
+                "json_extract(opportunity_data, '$.features.funding_currency') AS funding_currency "
+                "FROM evaluations WHERE user_id = ? ORDER BY id",
+                (user_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    except sqlite3.Error:
+        return []
+
+
+def _stored_aggregate(conn: sqlite3.Connection, user_id: str) -> Optional[ScoreAggregate]:
+    row = conn.execute("SELECT data FROM aggregates WHERE user_id = ?", (user_id,)).fetchone()
+    if row:
+        try:
+            return ScoreAggregate.from_json(row["data"])
+        except (ValueError, TypeError, KeyError):
+            pass
+    return None
+
+
+def _rebuild_aggregate(conn: sqlite3.Connection, user_id: str) -> ScoreAggregate:
+    # Histories written before the aggregates table existed: one full pass, then stored
+    rows = conn.execute(
+        "SELECT score, opportunity_type FROM evaluations WHERE user_id = ? ORDER BY id", (user_id,)
+    ).fetchall()
+    aggregate = ScoreAggregate.from_scores((row["score"], row["opportunity_type"]) for row in rows)
+    _store_aggregate(conn, user_id, aggregate)
+    return aggregate
+
+
+def _store_aggregate(conn: sqlite3.Connection, user_id: str, aggregate: ScoreAggregate):
+    conn.execute(
+        "INSERT INTO aggregates (user_id, data) VALUES (?, ?) "
+        "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data",
+        (user_id, aggregate.to_json())
+    )
+
+
+def evaluation_aggregate(user_id: str) -> ScoreAggregate:
+    """
+    Precomputed totals for a user's history (count, average, histogram,
+    per-type breakdown), maintained incrementally by add_evaluation
+    """
+    try:
+        with _connect() as conn:
+            return _stored_aggregate(conn, user_id) or _rebuild_aggregate(conn, user_id)
+    except sqlite3.Error:
+        return ScoreAggregate()
+
+
+@traced(category="storage")
+def evaluation_summary(user_id: str) -> Dict:
+    """
+    Aggregate counts for a user's history: total, average score, strong /
+    good / weak matches and counts per opportunity type
+
+    Read from the stored running totals, so no rerun rescans the history.
+    """
+    return evaluation_aggregate(user_id).summary()
+
+
+@traced(category="storage")
+def clear_evaluations(user_id: str) -> bool:
+    try:
+        with _connect() as conn:
+            conn.execute("DELETE FROM evaluations WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM aggregates WHERE user_id = ?", (user_id,))
+            _bump_history_version(conn, user_id)
+        return True
+    except sqlite3.Error as e:
+        st.error(f"Error clearing history: {str(e)}")
+        return False
+
+
+# Migration from pickle files
+
+def migrate_legacy_pickles(user_id: str = DEFAULT_USER_ID) -> int:
+    """
+    Import user_profile.pkl / matched_opportunities.pkl once into `user_id`
+
+    Returns the number of history records imported. The pickle files are
+    left in place; a marker in the meta table prevents a second import.
+    """
+    try:
+        with _connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_pickles_imported'").fetchone():
+                return 0
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('legacy_pickles_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+    except sqlite3.Error:
+        return 0
+
+    imported = 0
+    if LEGACY_PROFILE_FILE.exists() and load_profile(user_id) is None:
+        try:
+            with open(LEGACY_PROFILE_FILE, "rb") as f:
+                save_profile(user_id, pickle.load(f))
+        except Exception:
+            pass
+
+    if LEGACY_HISTORY_FILE.exists():
+        try:
+            with open(LEGACY_HISTORY_FILE, "rb") as f:
+                history = pickle.load(f)
+        except Exception:
+            history = []
+        for record in history:
+            if add_evaluation(user_id, record):
+                imported += 1
+
+    return imported